@@ -1 +0,0 @@
-import{i as n}from"./index-BBtsgw0t.js";import{d as y,r,o as h,i as m,a as v,b as g,e as a}from"./index-CIa03AWP.js";const _={class:"grid grid-2"},b={class:"card"},d={class:"card"},x={class:"card full"},k=y({__name:"AnalyticsPage",setup(F){const l=r(null),s=r(null),o=r(null);return h(()=>{m("analytics.json").then(t=>{var e,c,u,p;try{l.value&&n(l.value).setOption({grid:{left:40,right:20,top:20,bottom:24,containLabel:!0},tooltip:{trigger:"axis"},xAxis:{type:"category",data:((e=t==null?void 0:t.time)==null?void 0:e.labels)||[]},yAxis:{type:"value"},series:[{type:"line",smooth:!0,data:((c=t==null?void 0:t.time)==null?void 0:c.orders)||[],lineStyle:{width:3,color:"#1A5FFF"},areaStyle:{color:"#1A5FFF"}}]}),s.value&&n(s.value).setOption({grid:{left:40,right:20,top:20,bottom:24,containLabel:!0},xAxis:{type:"category",data:((u=t==null?void 0:t.category)==null?void 0:u.labels)||[]},yAxis:{type:"value"},series:[{type:"bar",data:((p=t==null?void 0:t.category)==null?void 0:p.counts)||[],itemStyle:{color:"#5B8CFF"}}]}),o.value&&n(o.value).setOption({tooltip:{},series:[{type:"funnel",left:"10%",width:"80%",top:10,bottom:10,label:{position:"inside"},data:((t==null?void 0:t.funnel)||[]).map(f=>({name:f.name,value:f.value}))}]})}catch{}}).catch(()=>{})}),(t,e)=>(g(),v("div",_,[a("div",b,[e[0]||(e[0]=a("h3",null,"时段分布",-1)),a("div",{ref_key:"timeEl",ref:l,class:"chart"},null,512)]),a("div",d,[e[1]||(e[1]=a("h3",null,"品类分析",-1)),a("div",{ref_key:"catEl",ref:s,class:"chart"},null,512)]),a("div",x,[e[2]||(e[2]=a("h3",null,"转化漏斗",-1)),a("div",{ref_key:"funnelEl",ref:o,class:"chart"},null,512)])]))}});export{k as default};
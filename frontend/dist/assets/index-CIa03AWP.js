@@ -1,18 +0,0 @@
-const __vite__mapDeps=(i,m=__vite__mapDeps,d=(m.f||(m.f=["assets/MileagePage-B2EG7Ts5.js","assets/index-BBtsgw0t.js","assets/AnalyticsPage-CbhpBs6V.js","assets/OverviewPage-BBseQwcF.js"])))=>i.map(i=>d[i]);
-(function(){const t=document.createElement("link").relList;if(t&&t.supports&&t.supports("modulepreload"))return;for(const r of document.querySelectorAll('link[rel="modulepreload"]'))n(r);new MutationObserver(r=>{for(const i of r)if(i.type==="childList")for(const o of i.addedNodes)o.tagName==="LINK"&&o.rel==="modulepreload"&&n(o)}).observe(document,{childList:!0,subtree:!0});function s(r){const i={};return r.integrity&&(i.integrity=r.integrity),r.referrerPolicy&&(i.referrerPolicy=r.referrerPolicy),r.crossOrigin==="use-credentials"?i.credentials="include":r.crossOrigin==="anonymous"?i.credentials="omit":i.credentials="same-origin",i}function n(r){if(r.ep)return;r.ep=!0;const i=s(r);fetch(r.href,i)}})();/**
-* @vue/shared v3.5.25
-* (c) 2018-present Yuxi (Evan) You and Vue contributors
-* @license MIT
-**/function $s(e){const t=Object.create(null);for(const s of e.split(","))t[s]=1;return s=>s in t}const B={},ft=[],Oe=()=>{},Wn=()=>!1,rs=e=>e.charCodeAt(0)===111&&e.charCodeAt(1)===110&&(e.charCodeAt(2)>122||e.charCodeAt(2)<97),Ns=e=>e.startsWith("onUpdate:"),te=Object.assign,Vs=(e,t)=>{const s=e.indexOf(t);s>-1&&e.splice(s,1)},zr=Object.prototype.hasOwnProperty,V=(e,t)=>zr.call(e,t),D=Array.isArray,ut=e=>is(e)==="[object Map]",qn=e=>is(e)==="[object Set]",F=e=>typeof e=="function",z=e=>typeof e=="string",Je=e=>typeof e=="symbol",Y=e=>e!==null&&typeof e=="object",Jn=e=>(Y(e)||F(e))&&F(e.then)&&F(e.catch),Gn=Object.prototype.toString,is=e=>Gn.call(e),Xr=e=>is(e).slice(8,-1),Yn=e=>is(e)==="[object Object]",Us=e=>z(e)&&e!=="NaN"&&e[0]!=="-"&&""+parseInt(e,10)===e,Pt=$s(",key,ref,ref_for,ref_key,onVnodeBeforeMount,onVnodeMounted,onVnodeBeforeUpdate,onVnodeUpdated,onVnodeBeforeUnmount,onVnodeUnmounted"),os=e=>{const t=Object.create(null);return s=>t[s]||(t[s]=e(s))},Zr=/-\w/g,qe=os(e=>e.replace(Zr,t=>t.slice(1).toUpperCase())),Qr=/\B([A-Z])/g,it=os(e=>e.replace(Qr,"-$1").toLowerCase()),kn=os(e=>e.charAt(0).toUpperCase()+e.slice(1)),gs=os(e=>e?`on${kn(e)}`:""),We=(e,t)=>!Object.is(e,t),Gt=(e,...t)=>{for(let s=0;s<e.length;s++)e[s](...t)},zn=(e,t,s,n=!1)=>{Object.defineProperty(e,t,{configurable:!0,enumerable:!1,writable:n,value:s})},Ks=e=>{const t=parseFloat(e);return isNaN(t)?e:t};let dn;const ls=()=>dn||(dn=typeof globalThis<"u"?globalThis:typeof self<"u"?self:typeof window<"u"?window:typeof global<"u"?global:{});function Bs(e){if(D(e)){const t={};for(let s=0;s<e.length;s++){const n=e[s],r=z(n)?ni(n):Bs(n);if(r)for(const i in r)t[i]=r[i]}return t}else if(z(e)||Y(e))return e}const ei=/;(?![^(]*\))/g,ti=/:([^]+)/,si=/\/\*[^]*?\*\//g;function ni(e){const t={};return e.replace(si,"").split(ei).forEach(s=>{if(s){const n=s.split(ti);n.length>1&&(t[n[0].trim()]=n[1].trim())}}),t}function _e(e){let t="";if(z(e))t=e;else if(D(e))for(let s=0;s<e.length;s++){const n=_e(e[s]);n&&(t+=n+" ")}else if(Y(e))for(const s in e)e[s]&&(t+=s+" ");return t.trim()}const ri="itemscope,allowfullscreen,formnovalidate,ismap,nomodule,novalidate,readonly",ii=$s(ri);function Xn(e){return!!e||e===""}const Zn=e=>!!(e&&e.__v_isRef===!0),wt=e=>z(e)?e:e==null?"":D(e)||Y(e)&&(e.toString===Gn||!F(e.toString))?Zn(e)?wt(e.value):JSON.stringify(e,Qn,2):String(e),Qn=(e,t)=>Zn(t)?Qn(e,t.value):ut(t)?{[`Map(${t.size})`]:[...t.entries()].reduce((s,[n,r],i)=>(s[_s(n,i)+" =>"]=r,s),{})}:qn(t)?{[`Set(${t.size})`]:[...t.values()].map(s=>_s(s))}:Je(t)?_s(t):Y(t)&&!D(t)&&!Yn(t)?String(t):t,_s=(e,t="")=>{var s;return Je(e)?`Symbol(${(s=e.description)!=null?s:t})`:e};/**
-* @vue/reactivity v3.5.25
-* (c) 2018-present Yuxi (Evan) You and Vue contributors
-* @license MIT
-**/let ce;class oi{constructor(t=!1){this.detached=t,this._active=!0,this._on=0,this.effects=[],this.cleanups=[],this._isPaused=!1,this.parent=ce,!t&&ce&&(this.index=(ce.scopes||(ce.scopes=[])).push(this)-1)}get active(){return this._active}pause(){if(this._active){this._isPaused=!0;let t,s;if(this.scopes)for(t=0,s=this.scopes.length;t<s;t++)this.scopes[t].pause();for(t=0,s=this.effects.length;t<s;t++)this.effects[t].pause()}}resume(){if(this._active&&this._isPaused){this._isPaused=!1;let t,s;if(this.scopes)for(t=0,s=this.scopes.length;t<s;t++)this.scopes[t].resume();for(t=0,s=this.effects.length;t<s;t++)this.effects[t].resume()}}run(t){if(this._active){const s=ce;try{return ce=this,t()}finally{ce=s}}}on(){++this._on===1&&(this.prevScope=ce,ce=this)}off(){this._on>0&&--this._on===0&&(ce=this.prevScope,this.prevScope=void 0)}stop(t){if(this._active){this._active=!1;let s,n;for(s=0,n=this.effects.length;s<n;s++)this.effects[s].stop();for(this.effects.length=0,s=0,n=this.cleanups.length;s<n;s++)this.cleanups[s]();if(this.cleanups.length=0,this.scopes){for(s=0,n=this.scopes.length;s<n;s++)this.scopes[s].stop(!0);this.scopes.length=0}if(!this.detached&&this.parent&&!t){const r=this.parent.scopes.pop();r&&r!==this&&(this.parent.scopes[this.index]=r,r.index=this.index)}this.parent=void 0}}}function li(){return ce}let J;const ms=new WeakSet;class er{constructor(t){this.fn=t,this.deps=void 0,this.depsTail=void 0,this.flags=5,this.next=void 0,this.cleanup=void 0,this.scheduler=void 0,ce&&ce.active&&ce.effects.push(this)}pause(){this.flags|=64}resume(){this.flags&64&&(this.flags&=-65,ms.has(this)&&(ms.delete(this),this.trigger()))}notify(){this.flags&2&&!(this.flags&32)||this.flags&8||sr(this)}run(){if(!(this.flags&1))return this.fn();this.flags|=2,hn(this),nr(this);const t=J,s=me;J=this,me=!0;try{return this.fn()}finally{rr(this),J=t,me=s,this.flags&=-3}}stop(){if(this.flags&1){for(let t=this.deps;t;t=t.nextDep)Js(t);this.deps=this.depsTail=void 0,hn(this),this.onStop&&this.onStop(),this.flags&=-2}}trigger(){this.flags&64?ms.add(this):this.scheduler?this.scheduler():this.runIfDirty()}runIfDirty(){As(this)&&this.run()}get dirty(){return As(this)}}let tr=0,At,Ct;function sr(e,t=!1){if(e.flags|=8,t){e.next=Ct,Ct=e;return}e.next=At,At=e}function Ws(){tr++}function qs(){if(--tr>0)return;if(Ct){let t=Ct;for(Ct=void 0;t;){const s=t.next;t.next=void 0,t.flags&=-9,t=s}}let e;for(;At;){let t=At;for(At=void 0;t;){const s=t.next;if(t.next=void 0,t.flags&=-9,t.flags&1)try{t.trigger()}catch(n){e||(e=n)}t=s}}if(e)throw e}function nr(e){for(let t=e.deps;t;t=t.nextDep)t.version=-1,t.prevActiveLink=t.dep.activeLink,t.dep.activeLink=t}function rr(e){let t,s=e.depsTail,n=s;for(;n;){const r=n.prevDep;n.version===-1?(n===s&&(s=r),Js(n),ci(n)):t=n,n.dep.activeLink=n.prevActiveLink,n.prevActiveLink=void 0,n=r}e.deps=t,e.depsTail=s}function As(e){for(let t=e.deps;t;t=t.nextDep)if(t.dep.version!==t.version||t.dep.computed&&(ir(t.dep.computed)||t.dep.version!==t.version))return!0;return!!e._dirty}function ir(e){if(e.flags&4&&!(e.flags&16)||(e.flags&=-17,e.globalVersion===Ft)||(e.globalVersion=Ft,!e.isSSR&&e.flags&128&&(!e.deps&&!e._dirty||!As(e))))return;e.flags|=2;const t=e.dep,s=J,n=me;J=e,me=!0;try{nr(e);const r=e.fn(e._value);(t.version===0||We(r,e._value))&&(e.flags|=128,e._value=r,t.version++)}catch(r){throw t.version++,r}finally{J=s,me=n,rr(e),e.flags&=-3}}function Js(e,t=!1){const{dep:s,prevSub:n,nextSub:r}=e;if(n&&(n.nextSub=r,e.prevSub=void 0),r&&(r.prevSub=n,e.nextSub=void 0),s.subs===e&&(s.subs=n,!n&&s.computed)){s.computed.flags&=-5;for(let i=s.computed.deps;i;i=i.nextDep)Js(i,!0)}!t&&!--s.sc&&s.map&&s.map.delete(s.key)}function ci(e){const{prevDep:t,nextDep:s}=e;t&&(t.nextDep=s,e.prevDep=void 0),s&&(s.prevDep=t,e.nextDep=void 0)}let me=!0;const or=[];function Le(){or.push(me),me=!1}function He(){const e=or.pop();me=e===void 0?!0:e}function hn(e){const{cleanup:t}=e;if(e.cleanup=void 0,t){const s=J;J=void 0;try{t()}finally{J=s}}}let Ft=0;class fi{constructor(t,s){this.sub=t,this.dep=s,this.version=s.version,this.nextDep=this.prevDep=this.nextSub=this.prevSub=this.prevActiveLink=void 0}}class Gs{constructor(t){this.computed=t,this.version=0,this.activeLink=void 0,this.subs=void 0,this.map=void 0,this.key=void 0,this.sc=0,this.__v_skip=!0}track(t){if(!J||!me||J===this.computed)return;let s=this.activeLink;if(s===void 0||s.sub!==J)s=this.activeLink=new fi(J,this),J.deps?(s.prevDep=J.depsTail,J.depsTail.nextDep=s,J.depsTail=s):J.deps=J.depsTail=s,lr(s);else if(s.version===-1&&(s.version=this.version,s.nextDep)){const n=s.nextDep;n.prevDep=s.prevDep,s.prevDep&&(s.prevDep.nextDep=n),s.prevDep=J.depsTail,s.nextDep=void 0,J.depsTail.nextDep=s,J.depsTail=s,J.deps===s&&(J.deps=n)}return s}trigger(t){this.version++,Ft++,this.notify(t)}notify(t){Ws();try{for(let s=this.subs;s;s=s.prevSub)s.sub.notify()&&s.sub.dep.notify()}finally{qs()}}}function lr(e){if(e.dep.sc++,e.sub.flags&4){const t=e.dep.computed;if(t&&!e.dep.subs){t.flags|=20;for(let n=t.deps;n;n=n.nextDep)lr(n)}const s=e.dep.subs;s!==e&&(e.prevSub=s,s&&(s.nextSub=e)),e.dep.subs=e}}const Cs=new WeakMap,nt=Symbol(""),Os=Symbol(""),Dt=Symbol("");function Z(e,t,s){if(me&&J){let n=Cs.get(e);n||Cs.set(e,n=new Map);let r=n.get(s);r||(n.set(s,r=new Gs),r.map=n,r.key=s),r.track()}}function Fe(e,t,s,n,r,i){const o=Cs.get(e);if(!o){Ft++;return}const l=c=>{c&&c.trigger()};if(Ws(),t==="clear")o.forEach(l);else{const c=D(e),d=c&&Us(s);if(c&&s==="length"){const a=Number(n);o.forEach((p,S)=>{(S==="length"||S===Dt||!Je(S)&&S>=a)&&l(p)})}else switch((s!==void 0||o.has(void 0))&&l(o.get(s)),d&&l(o.get(Dt)),t){case"add":c?d&&l(o.get("length")):(l(o.get(nt)),ut(e)&&l(o.get(Os)));break;case"delete":c||(l(o.get(nt)),ut(e)&&l(o.get(Os)));break;case"set":ut(e)&&l(o.get(nt));break}}qs()}function ot(e){const t=N(e);return t===e?t:(Z(t,"iterate",Dt),he(e)?t:t.map(ve))}function cs(e){return Z(e=N(e),"iterate",Dt),e}function Ue(e,t){return je(e)?rt(e)?ht(ve(t)):ht(t):ve(t)}const ui={__proto__:null,[Symbol.iterator](){return vs(this,Symbol.iterator,e=>Ue(this,e))},concat(...e){return ot(this).concat(...e.map(t=>D(t)?ot(t):t))},entries(){return vs(this,"entries",e=>(e[1]=Ue(this,e[1]),e))},every(e,t){return Me(this,"every",e,t,void 0,arguments)},filter(e,t){return Me(this,"filter",e,t,s=>s.map(n=>Ue(this,n)),arguments)},find(e,t){return Me(this,"find",e,t,s=>Ue(this,s),arguments)},findIndex(e,t){return Me(this,"findIndex",e,t,void 0,arguments)},findLast(e,t){return Me(this,"findLast",e,t,s=>Ue(this,s),arguments)},findLastIndex(e,t){return Me(this,"findLastIndex",e,t,void 0,arguments)},forEach(e,t){return Me(this,"forEach",e,t,void 0,arguments)},includes(...e){return bs(this,"includes",e)},indexOf(...e){return bs(this,"indexOf",e)},join(e){return ot(this).join(e)},lastIndexOf(...e){return bs(this,"lastIndexOf",e)},map(e,t){return Me(this,"map",e,t,void 0,arguments)},pop(){return yt(this,"pop")},push(...e){return yt(this,"push",e)},reduce(e,...t){return pn(this,"reduce",e,t)},reduceRight(e,...t){return pn(this,"reduceRight",e,t)},shift(){return yt(this,"shift")},some(e,t){return Me(this,"some",e,t,void 0,arguments)},splice(...e){return yt(this,"splice",e)},toReversed(){return ot(this).toReversed()},toSorted(e){return ot(this).toSorted(e)},toSpliced(...e){return ot(this).toSpliced(...e)},unshift(...e){return yt(this,"unshift",e)},values(){return vs(this,"values",e=>Ue(this,e))}};function vs(e,t,s){const n=cs(e),r=n[t]();return n!==e&&!he(e)&&(r._next=r.next,r.next=()=>{const i=r._next();return i.done||(i.value=s(i.value)),i}),r}const ai=Array.prototype;function Me(e,t,s,n,r,i){const o=cs(e),l=o!==e&&!he(e),c=o[t];if(c!==ai[t]){const p=c.apply(e,i);return l?ve(p):p}let d=s;o!==e&&(l?d=function(p,S){return s.call(this,Ue(e,p),S,e)}:s.length>2&&(d=function(p,S){return s.call(this,p,S,e)}));const a=c.call(o,d,n);return l&&r?r(a):a}function pn(e,t,s,n){const r=cs(e);let i=s;return r!==e&&(he(e)?s.length>3&&(i=function(o,l,c){return s.call(this,o,l,c,e)}):i=function(o,l,c){return s.call(this,o,Ue(e,l),c,e)}),r[t](i,...n)}function bs(e,t,s){const n=N(e);Z(n,"iterate",Dt);const r=n[t](...s);return(r===-1||r===!1)&&Xs(s[0])?(s[0]=N(s[0]),n[t](...s)):r}function yt(e,t,s=[]){Le(),Ws();const n=N(e)[t].apply(e,s);return qs(),He(),n}const di=$s("__proto__,__v_isRef,__isVue"),cr=new Set(Object.getOwnPropertyNames(Symbol).filter(e=>e!=="arguments"&&e!=="caller").map(e=>Symbol[e]).filter(Je));function hi(e){Je(e)||(e=String(e));const t=N(this);return Z(t,"has",e),t.hasOwnProperty(e)}class fr{constructor(t=!1,s=!1){this._isReadonly=t,this._isShallow=s}get(t,s,n){if(s==="__v_skip")return t.__v_skip;const r=this._isReadonly,i=this._isShallow;if(s==="__v_isReactive")return!r;if(s==="__v_isReadonly")return r;if(s==="__v_isShallow")return i;if(s==="__v_raw")return n===(r?i?Si:hr:i?dr:ar).get(t)||Object.getPrototypeOf(t)===Object.getPrototypeOf(n)?t:void 0;const o=D(t);if(!r){let c;if(o&&(c=ui[s]))return c;if(s==="hasOwnProperty")return hi}const l=Reflect.get(t,s,ee(t)?t:n);if((Je(s)?cr.has(s):di(s))||(r||Z(t,"get",s),i))return l;if(ee(l)){const c=o&&Us(s)?l:l.value;return r&&Y(c)?Ms(c):c}return Y(l)?r?Ms(l):ks(l):l}}class ur extends fr{constructor(t=!1){super(!1,t)}set(t,s,n,r){let i=t[s];const o=D(t)&&Us(s);if(!this._isShallow){const d=je(i);if(!he(n)&&!je(n)&&(i=N(i),n=N(n)),!o&&ee(i)&&!ee(n))return d||(i.value=n),!0}const l=o?Number(s)<t.length:V(t,s),c=Reflect.set(t,s,n,ee(t)?t:r);return t===N(r)&&(l?We(n,i)&&Fe(t,"set",s,n):Fe(t,"add",s,n)),c}deleteProperty(t,s){const n=V(t,s);t[s];const r=Reflect.deleteProperty(t,s);return r&&n&&Fe(t,"delete",s,void 0),r}has(t,s){const n=Reflect.has(t,s);return(!Je(s)||!cr.has(s))&&Z(t,"has",s),n}ownKeys(t){return Z(t,"iterate",D(t)?"length":nt),Reflect.ownKeys(t)}}class pi extends fr{constructor(t=!1){super(!0,t)}set(t,s){return!0}deleteProperty(t,s){return!0}}const gi=new ur,_i=new pi,mi=new ur(!0);const Is=e=>e,Bt=e=>Reflect.getPrototypeOf(e);function vi(e,t,s){return function(...n){const r=this.__v_raw,i=N(r),o=ut(i),l=e==="entries"||e===Symbol.iterator&&o,c=e==="keys"&&o,d=r[e](...n),a=s?Is:t?ht:ve;return!t&&Z(i,"iterate",c?Os:nt),{next(){const{value:p,done:S}=d.next();return S?{value:p,done:S}:{value:l?[a(p[0]),a(p[1])]:a(p),done:S}},[Symbol.iterator](){return this}}}}function Wt(e){return function(...t){return e==="delete"?!1:e==="clear"?void 0:this}}function bi(e,t){const s={get(r){const i=this.__v_raw,o=N(i),l=N(r);e||(We(r,l)&&Z(o,"get",r),Z(o,"get",l));const{has:c}=Bt(o),d=t?Is:e?ht:ve;if(c.call(o,r))return d(i.get(r));if(c.call(o,l))return d(i.get(l));i!==o&&i.get(r)},get size(){const r=this.__v_raw;return!e&&Z(N(r),"iterate",nt),r.size},has(r){const i=this.__v_raw,o=N(i),l=N(r);return e||(We(r,l)&&Z(o,"has",r),Z(o,"has",l)),r===l?i.has(r):i.has(r)||i.has(l)},forEach(r,i){const o=this,l=o.__v_raw,c=N(l),d=t?Is:e?ht:ve;return!e&&Z(c,"iterate",nt),l.forEach((a,p)=>r.call(i,d(a),d(p),o))}};return te(s,e?{add:Wt("add"),set:Wt("set"),delete:Wt("delete"),clear:Wt("clear")}:{add(r){!t&&!he(r)&&!je(r)&&(r=N(r));const i=N(this);return Bt(i).has.call(i,r)||(i.add(r),Fe(i,"add",r,r)),this},set(r,i){!t&&!he(i)&&!je(i)&&(i=N(i));const o=N(this),{has:l,get:c}=Bt(o);let d=l.call(o,r);d||(r=N(r),d=l.call(o,r));const a=c.call(o,r);return o.set(r,i),d?We(i,a)&&Fe(o,"set",r,i):Fe(o,"add",r,i),this},delete(r){const i=N(this),{has:o,get:l}=Bt(i);let c=o.call(i,r);c||(r=N(r),c=o.call(i,r)),l&&l.call(i,r);const d=i.delete(r);return c&&Fe(i,"delete",r,void 0),d},clear(){const r=N(this),i=r.size!==0,o=r.clear();return i&&Fe(r,"clear",void 0,void 0),o}}),["keys","values","entries",Symbol.iterator].forEach(r=>{s[r]=vi(r,e,t)}),s}function Ys(e,t){const s=bi(e,t);return(n,r,i)=>r==="__v_isReactive"?!e:r==="__v_isReadonly"?e:r==="__v_raw"?n:Reflect.get(V(s,r)&&r in n?s:n,r,i)}const yi={get:Ys(!1,!1)},xi={get:Ys(!1,!0)},Ei={get:Ys(!0,!1)};const ar=new WeakMap,dr=new WeakMap,hr=new WeakMap,Si=new WeakMap;function wi(e){switch(e){case"Object":case"Array":return 1;case"Map":case"Set":case"WeakMap":case"WeakSet":return 2;default:return 0}}function Ti(e){return e.__v_skip||!Object.isExtensible(e)?0:wi(Xr(e))}function ks(e){return je(e)?e:zs(e,!1,gi,yi,ar)}function Pi(e){return zs(e,!1,mi,xi,dr)}function Ms(e){return zs(e,!0,_i,Ei,hr)}function zs(e,t,s,n,r){if(!Y(e)||e.__v_raw&&!(t&&e.__v_isReactive))return e;const i=Ti(e);if(i===0)return e;const o=r.get(e);if(o)return o;const l=new Proxy(e,i===2?n:s);return r.set(e,l),l}function rt(e){return je(e)?rt(e.__v_raw):!!(e&&e.__v_isReactive)}function je(e){return!!(e&&e.__v_isReadonly)}function he(e){return!!(e&&e.__v_isShallow)}function Xs(e){return e?!!e.__v_raw:!1}function N(e){const t=e&&e.__v_raw;return t?N(t):e}function Ai(e){return!V(e,"__v_skip")&&Object.isExtensible(e)&&zn(e,"__v_skip",!0),e}const ve=e=>Y(e)?ks(e):e,ht=e=>Y(e)?Ms(e):e;function ee(e){return e?e.__v_isRef===!0:!1}function Pe(e){return Ci(e,!1)}function Ci(e,t){return ee(e)?e:new Oi(e,t)}class Oi{constructor(t,s){this.dep=new Gs,this.__v_isRef=!0,this.__v_isShallow=!1,this._rawValue=s?t:N(t),this._value=s?t:ve(t),this.__v_isShallow=s}get value(){return this.dep.track(),this._value}set value(t){const s=this._rawValue,n=this.__v_isShallow||he(t)||je(t);t=n?t:N(t),We(t,s)&&(this._rawValue=t,this._value=n?t:ve(t),this.dep.trigger())}}function Ve(e){return ee(e)?e.value:e}const Ii={get:(e,t,s)=>t==="__v_raw"?e:Ve(Reflect.get(e,t,s)),set:(e,t,s,n)=>{const r=e[t];return ee(r)&&!ee(s)?(r.value=s,!0):Reflect.set(e,t,s,n)}};function pr(e){return rt(e)?e:new Proxy(e,Ii)}class Mi{constructor(t,s,n){this.fn=t,this.setter=s,this._value=void 0,this.dep=new Gs(this),this.__v_isRef=!0,this.deps=void 0,this.depsTail=void 0,this.flags=16,this.globalVersion=Ft-1,this.next=void 0,this.effect=this,this.__v_isReadonly=!s,this.isSSR=n}notify(){if(this.flags|=16,!(this.flags&8)&&J!==this)return sr(this,!0),!0}get value(){const t=this.dep.track();return ir(this),t&&(t.version=this.dep.version),this._value}set value(t){this.setter&&this.setter(t)}}function Ri(e,t,s=!1){let n,r;return F(e)?n=e:(n=e.get,r=e.set),new Mi(n,r,s)}const qt={},Xt=new WeakMap;let st;function Fi(e,t=!1,s=st){if(s){let n=Xt.get(s);n||Xt.set(s,n=[]),n.push(e)}}function Di(e,t,s=B){const{immediate:n,deep:r,once:i,scheduler:o,augmentJob:l,call:c}=s,d=x=>r?x:he(x)||r===!1||r===0?De(x,1):De(x);let a,p,S,T,A=!1,P=!1;if(ee(e)?(p=()=>e.value,A=he(e)):rt(e)?(p=()=>d(e),A=!0):D(e)?(P=!0,A=e.some(x=>rt(x)||he(x)),p=()=>e.map(x=>{if(ee(x))return x.value;if(rt(x))return d(x);if(F(x))return c?c(x,2):x()})):F(e)?t?p=c?()=>c(e,2):e:p=()=>{if(S){Le();try{S()}finally{He()}}const x=st;st=a;try{return c?c(e,3,[T]):e(T)}finally{st=x}}:p=Oe,t&&r){const x=p,I=r===!0?1/0:r;p=()=>De(x(),I)}const G=li(),R=()=>{a.stop(),G&&G.active&&Vs(G.effects,a)};if(i&&t){const x=t;t=(...I)=>{x(...I),R()}}let H=P?new Array(e.length).fill(qt):qt;const L=x=>{if(!(!(a.flags&1)||!a.dirty&&!x))if(t){const I=a.run();if(r||A||(P?I.some(($,ie)=>We($,H[ie])):We(I,H))){S&&S();const $=st;st=a;try{const ie=[I,H===qt?void 0:P&&H[0]===qt?[]:H,T];H=I,c?c(t,3,ie):t(...ie)}finally{st=$}}}else a.run()};return l&&l(L),a=new er(p),a.scheduler=o?()=>o(L,!1):L,T=x=>Fi(x,!1,a),S=a.onStop=()=>{const x=Xt.get(a);if(x){if(c)c(x,4);else for(const I of x)I();Xt.delete(a)}},t?n?L(!0):H=a.run():o?o(L.bind(null,!0),!0):a.run(),R.pause=a.pause.bind(a),R.resume=a.resume.bind(a),R.stop=R,R}function De(e,t=1/0,s){if(t<=0||!Y(e)||e.__v_skip||(s=s||new Map,(s.get(e)||0)>=t))return e;if(s.set(e,t),t--,ee(e))De(e.value,t,s);else if(D(e))for(let n=0;n<e.length;n++)De(e[n],t,s);else if(qn(e)||ut(e))e.forEach(n=>{De(n,t,s)});else if(Yn(e)){for(const n in e)De(e[n],t,s);for(const n of Object.getOwnPropertySymbols(e))Object.prototype.propertyIsEnumerable.call(e,n)&&De(e[n],t,s)}return e}/**
-* @vue/runtime-core v3.5.25
-* (c) 2018-present Yuxi (Evan) You and Vue contributors
-* @license MIT
-**/function jt(e,t,s,n){try{return n?e(...n):e()}catch(r){$t(r,t,s)}}function Ie(e,t,s,n){if(F(e)){const r=jt(e,t,s,n);return r&&Jn(r)&&r.catch(i=>{$t(i,t,s)}),r}if(D(e)){const r=[];for(let i=0;i<e.length;i++)r.push(Ie(e[i],t,s,n));return r}}function $t(e,t,s,n=!0){const r=t?t.vnode:null,{errorHandler:i,throwUnhandledErrorInProduction:o}=t&&t.appContext.config||B;if(t){let l=t.parent;const c=t.proxy,d=`https://vuejs.org/error-reference/#runtime-${s}`;for(;l;){const a=l.ec;if(a){for(let p=0;p<a.length;p++)if(a[p](e,c,d)===!1)return}l=l.parent}if(i){Le(),jt(i,null,10,[e,c,d]),He();return}}Li(e,s,r,n,o)}function Li(e,t,s,n=!0,r=!1){if(r)throw e;console.error(e)}const re=[];let Te=-1;const at=[];let Ke=null,lt=0;const gr=Promise.resolve();let Zt=null;function Hi(e){const t=Zt||gr;return e?t.then(this?e.bind(this):e):t}function ji(e){let t=Te+1,s=re.length;for(;t<s;){const n=t+s>>>1,r=re[n],i=Lt(r);i<e||i===e&&r.flags&2?t=n+1:s=n}return t}function Zs(e){if(!(e.flags&1)){const t=Lt(e),s=re[re.length-1];!s||!(e.flags&2)&&t>=Lt(s)?re.push(e):re.splice(ji(t),0,e),e.flags|=1,_r()}}function _r(){Zt||(Zt=gr.then(vr))}function $i(e){D(e)?at.push(...e):Ke&&e.id===-1?Ke.splice(lt+1,0,e):e.flags&1||(at.push(e),e.flags|=1),_r()}function gn(e,t,s=Te+1){for(;s<re.length;s++){const n=re[s];if(n&&n.flags&2){if(e&&n.id!==e.uid)continue;re.splice(s,1),s--,n.flags&4&&(n.flags&=-2),n(),n.flags&4||(n.flags&=-2)}}}function mr(e){if(at.length){const t=[...new Set(at)].sort((s,n)=>Lt(s)-Lt(n));if(at.length=0,Ke){Ke.push(...t);return}for(Ke=t,lt=0;lt<Ke.length;lt++){const s=Ke[lt];s.flags&4&&(s.flags&=-2),s.flags&8||s(),s.flags&=-2}Ke=null,lt=0}}const Lt=e=>e.id==null?e.flags&2?-1:1/0:e.id;function vr(e){try{for(Te=0;Te<re.length;Te++){const t=re[Te];t&&!(t.flags&8)&&(t.flags&4&&(t.flags&=-2),jt(t,t.i,t.i?15:14),t.flags&4||(t.flags&=-2))}}finally{for(;Te<re.length;Te++){const t=re[Te];t&&(t.flags&=-2)}Te=-1,re.length=0,mr(),Zt=null,(re.length||at.length)&&vr()}}let de=null,br=null;function Qt(e){const t=de;return de=e,br=e&&e.type.__scopeId||null,t}function Ni(e,t=de,s){if(!t||e._n)return e;const n=(...r)=>{n._d&&Pn(-1);const i=Qt(t);let o;try{o=e(...r)}finally{Qt(i),n._d&&Pn(1)}return o};return n._n=!0,n._c=!0,n._d=!0,n}function ze(e,t){if(de===null)return e;const s=ds(de),n=e.dirs||(e.dirs=[]);for(let r=0;r<t.length;r++){let[i,o,l,c=B]=t[r];i&&(F(i)&&(i={mounted:i,updated:i}),i.deep&&De(o),n.push({dir:i,instance:s,value:o,oldValue:void 0,arg:l,modifiers:c}))}return e}function Xe(e,t,s,n){const r=e.dirs,i=t&&t.dirs;for(let o=0;o<r.length;o++){const l=r[o];i&&(l.oldValue=i[o].value);let c=l.dir[n];c&&(Le(),Ie(c,s,8,[e.el,l,e,t]),He())}}const Vi=Symbol("_vte"),Ui=e=>e.__isTeleport,Ki=Symbol("_leaveCb");function Qs(e,t){e.shapeFlag&6&&e.component?(e.transition=t,Qs(e.component.subTree,t)):e.shapeFlag&128?(e.ssContent.transition=t.clone(e.ssContent),e.ssFallback.transition=t.clone(e.ssFallback)):e.transition=t}function yr(e,t){return F(e)?te({name:e.name},t,{setup:e}):e}function en(e){e.ids=[e.ids[0]+e.ids[2]+++"-",0,0]}const es=new WeakMap;function Ot(e,t,s,n,r=!1){if(D(e)){e.forEach((A,P)=>Ot(A,t&&(D(t)?t[P]:t),s,n,r));return}if(It(n)&&!r){n.shapeFlag&512&&n.type.__asyncResolved&&n.component.subTree.component&&Ot(e,t,s,n.component.subTree);return}const i=n.shapeFlag&4?ds(n.component):n.el,o=r?null:i,{i:l,r:c}=e,d=t&&t.r,a=l.refs===B?l.refs={}:l.refs,p=l.setupState,S=N(p),T=p===B?Wn:A=>V(S,A);if(d!=null&&d!==c){if(_n(t),z(d))a[d]=null,T(d)&&(p[d]=null);else if(ee(d)){d.value=null;const A=t;A.k&&(a[A.k]=null)}}if(F(c))jt(c,l,12,[o,a]);else{const A=z(c),P=ee(c);if(A||P){const G=()=>{if(e.f){const R=A?T(c)?p[c]:a[c]:c.value;if(r)D(R)&&Vs(R,i);else if(D(R))R.includes(i)||R.push(i);else if(A)a[c]=[i],T(c)&&(p[c]=a[c]);else{const H=[i];c.value=H,e.k&&(a[e.k]=H)}}else A?(a[c]=o,T(c)&&(p[c]=o)):P&&(c.value=o,e.k&&(a[e.k]=o))};if(o){const R=()=>{G(),es.delete(e)};R.id=-1,es.set(e,R),ue(R,s)}else _n(e),G()}}}function _n(e){const t=es.get(e);t&&(t.flags|=8,es.delete(e))}const mn=e=>e.nodeType===8;ls().requestIdleCallback;ls().cancelIdleCallback;function Bi(e,t){if(mn(e)&&e.data==="["){let s=1,n=e.nextSibling;for(;n;){if(n.nodeType===1){if(t(n)===!1)break}else if(mn(n))if(n.data==="]"){if(--s===0)break}else n.data==="["&&s++;n=n.nextSibling}}else t(e)}const It=e=>!!e.type.__asyncLoader;function Ze(e){F(e)&&(e={loader:e});const{loader:t,loadingComponent:s,errorComponent:n,delay:r=200,hydrate:i,timeout:o,suspensible:l=!0,onError:c}=e;let d=null,a,p=0;const S=()=>(p++,d=null,T()),T=()=>{let A;return d||(A=d=t().catch(P=>{if(P=P instanceof Error?P:new Error(String(P)),c)return new Promise((G,R)=>{c(P,()=>G(S()),()=>R(P),p+1)});throw P}).then(P=>A!==d&&d?d:(P&&(P.__esModule||P[Symbol.toStringTag]==="Module")&&(P=P.default),a=P,P)))};return yr({name:"AsyncComponentWrapper",__asyncLoader:T,__asyncHydrate(A,P,G){let R=!1;(P.bu||(P.bu=[])).push(()=>R=!0);const H=()=>{R||G()},L=i?()=>{const x=i(H,I=>Bi(A,I));x&&(P.bum||(P.bum=[])).push(x)}:H;a?L():T().then(()=>!P.isUnmounted&&L())},get __asyncResolved(){return a},setup(){const A=Q;if(en(A),a)return()=>Jt(a,A);const P=L=>{d=null,$t(L,A,13,!n)};if(l&&A.suspense||_t)return T().then(L=>()=>Jt(L,A)).catch(L=>(P(L),()=>n?X(n,{error:L}):null));const G=Pe(!1),R=Pe(),H=Pe(!!r);return r&&setTimeout(()=>{H.value=!1},r),o!=null&&setTimeout(()=>{if(!G.value&&!R.value){const L=new Error(`Async component timed out after ${o}ms.`);P(L),R.value=L}},o),T().then(()=>{G.value=!0,A.parent&&tn(A.parent.vnode)&&A.parent.update()}).catch(L=>{P(L),R.value=L}),()=>{if(G.value&&a)return Jt(a,A);if(R.value&&n)return X(n,{error:R.value});if(s&&!H.value)return Jt(s,A)}}})}function Jt(e,t){const{ref:s,props:n,children:r,ce:i}=t.vnode,o=X(e,n,r);return o.ref=s,o.ce=i,delete t.vnode.ce,o}const tn=e=>e.type.__isKeepAlive;function Wi(e,t){xr(e,"a",t)}function qi(e,t){xr(e,"da",t)}function xr(e,t,s=Q){const n=e.__wdc||(e.__wdc=()=>{let r=s;for(;r;){if(r.isDeactivated)return;r=r.parent}return e()});if(fs(t,n,s),s){let r=s.parent;for(;r&&r.parent;)tn(r.parent.vnode)&&Ji(n,t,s,r),r=r.parent}}function Ji(e,t,s,n){const r=fs(t,e,n,!0);Sr(()=>{Vs(n[t],r)},s)}function fs(e,t,s=Q,n=!1){if(s){const r=s[e]||(s[e]=[]),i=t.__weh||(t.__weh=(...o)=>{Le();const l=Nt(s),c=Ie(t,s,e,o);return l(),He(),c});return n?r.unshift(i):r.push(i),i}}const $e=e=>(t,s=Q)=>{(!_t||e==="sp")&&fs(e,(...n)=>t(...n),s)},Gi=$e("bm"),Er=$e("m"),Yi=$e("bu"),ki=$e("u"),zi=$e("bum"),Sr=$e("um"),Xi=$e("sp"),Zi=$e("rtg"),Qi=$e("rtc");function eo(e,t=Q){fs("ec",e,t)}const to=Symbol.for("v-ndc");function ql(e,t,s,n){let r;const i=s,o=D(e);if(o||z(e)){const l=o&&rt(e);let c=!1,d=!1;l&&(c=!he(e),d=je(e),e=cs(e)),r=new Array(e.length);for(let a=0,p=e.length;a<p;a++)r[a]=t(c?d?ht(ve(e[a])):ve(e[a]):e[a],a,void 0,i)}else if(typeof e=="number"){r=new Array(e);for(let l=0;l<e;l++)r[l]=t(l+1,l,void 0,i)}else if(Y(e))if(e[Symbol.iterator])r=Array.from(e,(l,c)=>t(l,c,void 0,i));else{const l=Object.keys(e);r=new Array(l.length);for(let c=0,d=l.length;c<d;c++){const a=l[c];r[c]=t(e[a],a,c,i)}}else r=[];return r}const Rs=e=>e?Br(e)?ds(e):Rs(e.parent):null,Mt=te(Object.create(null),{$:e=>e,$el:e=>e.vnode.el,$data:e=>e.data,$props:e=>e.props,$attrs:e=>e.attrs,$slots:e=>e.slots,$refs:e=>e.refs,$parent:e=>Rs(e.parent),$root:e=>Rs(e.root),$host:e=>e.ce,$emit:e=>e.emit,$options:e=>Tr(e),$forceUpdate:e=>e.f||(e.f=()=>{Zs(e.update)}),$nextTick:e=>e.n||(e.n=Hi.bind(e.proxy)),$watch:e=>po.bind(e)}),ys=(e,t)=>e!==B&&!e.__isScriptSetup&&V(e,t),so={get({_:e},t){if(t==="__v_skip")return!0;const{ctx:s,setupState:n,data:r,props:i,accessCache:o,type:l,appContext:c}=e;if(t[0]!=="$"){const S=o[t];if(S!==void 0)switch(S){case 1:return n[t];case 2:return r[t];case 4:return s[t];case 3:return i[t]}else{if(ys(n,t))return o[t]=1,n[t];if(r!==B&&V(r,t))return o[t]=2,r[t];if(V(i,t))return o[t]=3,i[t];if(s!==B&&V(s,t))return o[t]=4,s[t];Fs&&(o[t]=0)}}const d=Mt[t];let a,p;if(d)return t==="$attrs"&&Z(e.attrs,"get",""),d(e);if((a=l.__cssModules)&&(a=a[t]))return a;if(s!==B&&V(s,t))return o[t]=4,s[t];if(p=c.config.globalProperties,V(p,t))return p[t]},set({_:e},t,s){const{data:n,setupState:r,ctx:i}=e;return ys(r,t)?(r[t]=s,!0):n!==B&&V(n,t)?(n[t]=s,!0):V(e.props,t)||t[0]==="$"&&t.slice(1)in e?!1:(i[t]=s,!0)},has({_:{data:e,setupState:t,accessCache:s,ctx:n,appContext:r,props:i,type:o}},l){let c;return!!(s[l]||e!==B&&l[0]!=="$"&&V(e,l)||ys(t,l)||V(i,l)||V(n,l)||V(Mt,l)||V(r.config.globalProperties,l)||(c=o.__cssModules)&&c[l])},defineProperty(e,t,s){return s.get!=null?e._.accessCache[t]=0:V(s,"value")&&this.set(e,t,s.value,null),Reflect.defineProperty(e,t,s)}};function vn(e){return D(e)?e.reduce((t,s)=>(t[s]=null,t),{}):e}let Fs=!0;function no(e){const t=Tr(e),s=e.proxy,n=e.ctx;Fs=!1,t.beforeCreate&&bn(t.beforeCreate,e,"bc");const{data:r,computed:i,methods:o,watch:l,provide:c,inject:d,created:a,beforeMount:p,mounted:S,beforeUpdate:T,updated:A,activated:P,deactivated:G,beforeDestroy:R,beforeUnmount:H,destroyed:L,unmounted:x,render:I,renderTracked:$,renderTriggered:ie,errorCaptured:pe,serverPrefetch:Ge,expose:be,inheritAttrs:Ne,components:ge,directives:Vt,filters:hs}=t;if(d&&ro(d,n,null),o)for(const k in o){const W=o[k];F(W)&&(n[k]=W.bind(s))}if(r){const k=r.call(s,s);Y(k)&&(e.data=ks(k))}if(Fs=!0,i)for(const k in i){const W=i[k],Ye=F(W)?W.bind(s,s):F(W.get)?W.get.bind(s,s):Oe,Ut=!F(W)&&F(W.set)?W.set.bind(s):Oe,ke=zo({get:Ye,set:Ut});Object.defineProperty(n,k,{enumerable:!0,configurable:!0,get:()=>ke.value,set:ye=>ke.value=ye})}if(l)for(const k in l)wr(l[k],n,s,k);if(c){const k=F(c)?c.call(s):c;Reflect.ownKeys(k).forEach(W=>{uo(W,k[W])})}a&&bn(a,e,"c");function se(k,W){D(W)?W.forEach(Ye=>k(Ye.bind(s))):W&&k(W.bind(s))}if(se(Gi,p),se(Er,S),se(Yi,T),se(ki,A),se(Wi,P),se(qi,G),se(eo,pe),se(Qi,$),se(Zi,ie),se(zi,H),se(Sr,x),se(Xi,Ge),D(be))if(be.length){const k=e.exposed||(e.exposed={});be.forEach(W=>{Object.defineProperty(k,W,{get:()=>s[W],set:Ye=>s[W]=Ye,enumerable:!0})})}else e.exposed||(e.exposed={});I&&e.render===Oe&&(e.render=I),Ne!=null&&(e.inheritAttrs=Ne),ge&&(e.components=ge),Vt&&(e.directives=Vt),Ge&&en(e)}function ro(e,t,s=Oe){D(e)&&(e=Ds(e));for(const n in e){const r=e[n];let i;Y(r)?"default"in r?i=Yt(r.from||n,r.default,!0):i=Yt(r.from||n):i=Yt(r),ee(i)?Object.defineProperty(t,n,{enumerable:!0,configurable:!0,get:()=>i.value,set:o=>i.value=o}):t[n]=i}}function bn(e,t,s){Ie(D(e)?e.map(n=>n.bind(t.proxy)):e.bind(t.proxy),t,s)}function wr(e,t,s,n){let r=n.includes(".")?Cr(s,n):()=>s[n];if(z(e)){const i=t[e];F(i)&&xs(r,i)}else if(F(e))xs(r,e.bind(s));else if(Y(e))if(D(e))e.forEach(i=>wr(i,t,s,n));else{const i=F(e.handler)?e.handler.bind(s):t[e.handler];F(i)&&xs(r,i,e)}}function Tr(e){const t=e.type,{mixins:s,extends:n}=t,{mixins:r,optionsCache:i,config:{optionMergeStrategies:o}}=e.appContext,l=i.get(t);let c;return l?c=l:!r.length&&!s&&!n?c=t:(c={},r.length&&r.forEach(d=>ts(c,d,o,!0)),ts(c,t,o)),Y(t)&&i.set(t,c),c}function ts(e,t,s,n=!1){const{mixins:r,extends:i}=t;i&&ts(e,i,s,!0),r&&r.forEach(o=>ts(e,o,s,!0));for(const o in t)if(!(n&&o==="expose")){const l=io[o]||s&&s[o];e[o]=l?l(e[o],t[o]):t[o]}return e}const io={data:yn,props:xn,emits:xn,methods:Tt,computed:Tt,beforeCreate:ne,created:ne,beforeMount:ne,mounted:ne,beforeUpdate:ne,updated:ne,beforeDestroy:ne,beforeUnmount:ne,destroyed:ne,unmounted:ne,activated:ne,deactivated:ne,errorCaptured:ne,serverPrefetch:ne,components:Tt,directives:Tt,watch:lo,provide:yn,inject:oo};function yn(e,t){return t?e?function(){return te(F(e)?e.call(this,this):e,F(t)?t.call(this,this):t)}:t:e}function oo(e,t){return Tt(Ds(e),Ds(t))}function Ds(e){if(D(e)){const t={};for(let s=0;s<e.length;s++)t[e[s]]=e[s];return t}return e}function ne(e,t){return e?[...new Set([].concat(e,t))]:t}function Tt(e,t){return e?te(Object.create(null),e,t):t}function xn(e,t){return e?D(e)&&D(t)?[...new Set([...e,...t])]:te(Object.create(null),vn(e),vn(t??{})):t}function lo(e,t){if(!e)return t;if(!t)return e;const s=te(Object.create(null),e);for(const n in t)s[n]=ne(e[n],t[n]);return s}function Pr(){return{app:null,config:{isNativeTag:Wn,performance:!1,globalProperties:{},optionMergeStrategies:{},errorHandler:void 0,warnHandler:void 0,compilerOptions:{}},mixins:[],components:{},directives:{},provides:Object.create(null),optionsCache:new WeakMap,propsCache:new WeakMap,emitsCache:new WeakMap}}let co=0;function fo(e,t){return function(n,r=null){F(n)||(n=te({},n)),r!=null&&!Y(r)&&(r=null);const i=Pr(),o=new WeakSet,l=[];let c=!1;const d=i.app={_uid:co++,_component:n,_props:r,_container:null,_context:i,_instance:null,version:Xo,get config(){return i.config},set config(a){},use(a,...p){return o.has(a)||(a&&F(a.install)?(o.add(a),a.install(d,...p)):F(a)&&(o.add(a),a(d,...p))),d},mixin(a){return i.mixins.includes(a)||i.mixins.push(a),d},component(a,p){return p?(i.components[a]=p,d):i.components[a]},directive(a,p){return p?(i.directives[a]=p,d):i.directives[a]},mount(a,p,S){if(!c){const T=d._ceVNode||X(n,r);return T.appContext=i,S===!0?S="svg":S===!1&&(S=void 0),e(T,a,S),c=!0,d._container=a,a.__vue_app__=d,ds(T.component)}},onUnmount(a){l.push(a)},unmount(){c&&(Ie(l,d._instance,16),e(null,d._container),delete d._container.__vue_app__)},provide(a,p){return i.provides[a]=p,d},runWithContext(a){const p=dt;dt=d;try{return a()}finally{dt=p}}};return d}}let dt=null;function uo(e,t){if(Q){let s=Q.provides;const n=Q.parent&&Q.parent.provides;n===s&&(s=Q.provides=Object.create(n)),s[e]=t}}function Yt(e,t,s=!1){const n=Wo();if(n||dt){let r=dt?dt._context.provides:n?n.parent==null||n.ce?n.vnode.appContext&&n.vnode.appContext.provides:n.parent.provides:void 0;if(r&&e in r)return r[e];if(arguments.length>1)return s&&F(t)?t.call(n&&n.proxy):t}}const ao=Symbol.for("v-scx"),ho=()=>Yt(ao);function xs(e,t,s){return Ar(e,t,s)}function Ar(e,t,s=B){const{immediate:n,deep:r,flush:i,once:o}=s,l=te({},s),c=t&&n||!t&&i!=="post";let d;if(_t){if(i==="sync"){const T=ho();d=T.__watcherHandles||(T.__watcherHandles=[])}else if(!c){const T=()=>{};return T.stop=Oe,T.resume=Oe,T.pause=Oe,T}}const a=Q;l.call=(T,A,P)=>Ie(T,a,A,P);let p=!1;i==="post"?l.scheduler=T=>{ue(T,a&&a.suspense)}:i!=="sync"&&(p=!0,l.scheduler=(T,A)=>{A?T():Zs(T)}),l.augmentJob=T=>{t&&(T.flags|=4),p&&(T.flags|=2,a&&(T.id=a.uid,T.i=a))};const S=Di(e,t,l);return _t&&(d?d.push(S):c&&S()),S}function po(e,t,s){const n=this.proxy,r=z(e)?e.includes(".")?Cr(n,e):()=>n[e]:e.bind(n,n);let i;F(t)?i=t:(i=t.handler,s=t);const o=Nt(this),l=Ar(r,i.bind(n),s);return o(),l}function Cr(e,t){const s=t.split(".");return()=>{let n=e;for(let r=0;r<s.length&&n;r++)n=n[s[r]];return n}}const go=(e,t)=>t==="modelValue"||t==="model-value"?e.modelModifiers:e[`${t}Modifiers`]||e[`${qe(t)}Modifiers`]||e[`${it(t)}Modifiers`];function _o(e,t,...s){if(e.isUnmounted)return;const n=e.vnode.props||B;let r=s;const i=t.startsWith("update:"),o=i&&go(n,t.slice(7));o&&(o.trim&&(r=s.map(a=>z(a)?a.trim():a)),o.number&&(r=s.map(Ks)));let l,c=n[l=gs(t)]||n[l=gs(qe(t))];!c&&i&&(c=n[l=gs(it(t))]),c&&Ie(c,e,6,r);const d=n[l+"Once"];if(d){if(!e.emitted)e.emitted={};else if(e.emitted[l])return;e.emitted[l]=!0,Ie(d,e,6,r)}}const mo=new WeakMap;function Or(e,t,s=!1){const n=s?mo:t.emitsCache,r=n.get(e);if(r!==void 0)return r;const i=e.emits;let o={},l=!1;if(!F(e)){const c=d=>{const a=Or(d,t,!0);a&&(l=!0,te(o,a))};!s&&t.mixins.length&&t.mixins.forEach(c),e.extends&&c(e.extends),e.mixins&&e.mixins.forEach(c)}return!i&&!l?(Y(e)&&n.set(e,null),null):(D(i)?i.forEach(c=>o[c]=null):te(o,i),Y(e)&&n.set(e,o),o)}function us(e,t){return!e||!rs(t)?!1:(t=t.slice(2).replace(/Once$/,""),V(e,t[0].toLowerCase()+t.slice(1))||V(e,it(t))||V(e,t))}function En(e){const{type:t,vnode:s,proxy:n,withProxy:r,propsOptions:[i],slots:o,attrs:l,emit:c,render:d,renderCache:a,props:p,data:S,setupState:T,ctx:A,inheritAttrs:P}=e,G=Qt(e);let R,H;try{if(s.shapeFlag&4){const x=r||n,I=x;R=Ce(d.call(I,x,a,p,T,S,A)),H=l}else{const x=t;R=Ce(x.length>1?x(p,{attrs:l,slots:o,emit:c}):x(p,null)),H=t.props?l:vo(l)}}catch(x){Rt.length=0,$t(x,e,1),R=X(pt)}let L=R;if(H&&P!==!1){const x=Object.keys(H),{shapeFlag:I}=L;x.length&&I&7&&(i&&x.some(Ns)&&(H=bo(H,i)),L=gt(L,H,!1,!0))}return s.dirs&&(L=gt(L,null,!1,!0),L.dirs=L.dirs?L.dirs.concat(s.dirs):s.dirs),s.transition&&Qs(L,s.transition),R=L,Qt(G),R}const vo=e=>{let t;for(const s in e)(s==="class"||s==="style"||rs(s))&&((t||(t={}))[s]=e[s]);return t},bo=(e,t)=>{const s={};for(const n in e)(!Ns(n)||!(n.slice(9)in t))&&(s[n]=e[n]);return s};function yo(e,t,s){const{props:n,children:r,component:i}=e,{props:o,children:l,patchFlag:c}=t,d=i.emitsOptions;if(t.dirs||t.transition)return!0;if(s&&c>=0){if(c&1024)return!0;if(c&16)return n?Sn(n,o,d):!!o;if(c&8){const a=t.dynamicProps;for(let p=0;p<a.length;p++){const S=a[p];if(o[S]!==n[S]&&!us(d,S))return!0}}}else return(r||l)&&(!l||!l.$stable)?!0:n===o?!1:n?o?Sn(n,o,d):!0:!!o;return!1}function Sn(e,t,s){const n=Object.keys(t);if(n.length!==Object.keys(e).length)return!0;for(let r=0;r<n.length;r++){const i=n[r];if(t[i]!==e[i]&&!us(s,i))return!0}return!1}function xo({vnode:e,parent:t},s){for(;t;){const n=t.subTree;if(n.suspense&&n.suspense.activeBranch===e&&(n.el=e.el),n===e)(e=t.vnode).el=s,t=t.parent;else break}}const Ir={},Mr=()=>Object.create(Ir),Rr=e=>Object.getPrototypeOf(e)===Ir;function Eo(e,t,s,n=!1){const r={},i=Mr();e.propsDefaults=Object.create(null),Fr(e,t,r,i);for(const o in e.propsOptions[0])o in r||(r[o]=void 0);s?e.props=n?r:Pi(r):e.type.props?e.props=r:e.props=i,e.attrs=i}function So(e,t,s,n){const{props:r,attrs:i,vnode:{patchFlag:o}}=e,l=N(r),[c]=e.propsOptions;let d=!1;if((n||o>0)&&!(o&16)){if(o&8){const a=e.vnode.dynamicProps;for(let p=0;p<a.length;p++){let S=a[p];if(us(e.emitsOptions,S))continue;const T=t[S];if(c)if(V(i,S))T!==i[S]&&(i[S]=T,d=!0);else{const A=qe(S);r[A]=Ls(c,l,A,T,e,!1)}else T!==i[S]&&(i[S]=T,d=!0)}}}else{Fr(e,t,r,i)&&(d=!0);let a;for(const p in l)(!t||!V(t,p)&&((a=it(p))===p||!V(t,a)))&&(c?s&&(s[p]!==void 0||s[a]!==void 0)&&(r[p]=Ls(c,l,p,void 0,e,!0)):delete r[p]);if(i!==l)for(const p in i)(!t||!V(t,p))&&(delete i[p],d=!0)}d&&Fe(e.attrs,"set","")}function Fr(e,t,s,n){const[r,i]=e.propsOptions;let o=!1,l;if(t)for(let c in t){if(Pt(c))continue;const d=t[c];let a;r&&V(r,a=qe(c))?!i||!i.includes(a)?s[a]=d:(l||(l={}))[a]=d:us(e.emitsOptions,c)||(!(c in n)||d!==n[c])&&(n[c]=d,o=!0)}if(i){const c=N(s),d=l||B;for(let a=0;a<i.length;a++){const p=i[a];s[p]=Ls(r,c,p,d[p],e,!V(d,p))}}return o}function Ls(e,t,s,n,r,i){const o=e[s];if(o!=null){const l=V(o,"default");if(l&&n===void 0){const c=o.default;if(o.type!==Function&&!o.skipFactory&&F(c)){const{propsDefaults:d}=r;if(s in d)n=d[s];else{const a=Nt(r);n=d[s]=c.call(null,t),a()}}else n=c;r.ce&&r.ce._setProp(s,n)}o[0]&&(i&&!l?n=!1:o[1]&&(n===""||n===it(s))&&(n=!0))}return n}const wo=new WeakMap;function Dr(e,t,s=!1){const n=s?wo:t.propsCache,r=n.get(e);if(r)return r;const i=e.props,o={},l=[];let c=!1;if(!F(e)){const a=p=>{c=!0;const[S,T]=Dr(p,t,!0);te(o,S),T&&l.push(...T)};!s&&t.mixins.length&&t.mixins.forEach(a),e.extends&&a(e.extends),e.mixins&&e.mixins.forEach(a)}if(!i&&!c)return Y(e)&&n.set(e,ft),ft;if(D(i))for(let a=0;a<i.length;a++){const p=qe(i[a]);wn(p)&&(o[p]=B)}else if(i)for(const a in i){const p=qe(a);if(wn(p)){const S=i[a],T=o[p]=D(S)||F(S)?{type:S}:te({},S),A=T.type;let P=!1,G=!0;if(D(A))for(let R=0;R<A.length;++R){const H=A[R],L=F(H)&&H.name;if(L==="Boolean"){P=!0;break}else L==="String"&&(G=!1)}else P=F(A)&&A.name==="Boolean";T[0]=P,T[1]=G,(P||V(T,"default"))&&l.push(p)}}const d=[o,l];return Y(e)&&n.set(e,d),d}function wn(e){return e[0]!=="$"&&!Pt(e)}const sn=e=>e==="_"||e==="_ctx"||e==="$stable",nn=e=>D(e)?e.map(Ce):[Ce(e)],To=(e,t,s)=>{if(t._n)return t;const n=Ni((...r)=>nn(t(...r)),s);return n._c=!1,n},Lr=(e,t,s)=>{const n=e._ctx;for(const r in e){if(sn(r))continue;const i=e[r];if(F(i))t[r]=To(r,i,n);else if(i!=null){const o=nn(i);t[r]=()=>o}}},Hr=(e,t)=>{const s=nn(t);e.slots.default=()=>s},jr=(e,t,s)=>{for(const n in t)(s||!sn(n))&&(e[n]=t[n])},Po=(e,t,s)=>{const n=e.slots=Mr();if(e.vnode.shapeFlag&32){const r=t._;r?(jr(n,t,s),s&&zn(n,"_",r,!0)):Lr(t,n)}else t&&Hr(e,t)},Ao=(e,t,s)=>{const{vnode:n,slots:r}=e;let i=!0,o=B;if(n.shapeFlag&32){const l=t._;l?s&&l===1?i=!1:jr(r,t,s):(i=!t.$stable,Lr(t,r)),o=t}else t&&(Hr(e,t),o={default:1});if(i)for(const l in r)!sn(l)&&o[l]==null&&delete r[l]},ue=Ro;function Co(e){return Oo(e)}function Oo(e,t){const s=ls();s.__VUE__=!0;const{insert:n,remove:r,patchProp:i,createElement:o,createText:l,createComment:c,setText:d,setElementText:a,parentNode:p,nextSibling:S,setScopeId:T=Oe,insertStaticContent:A}=e,P=(f,u,h,v=null,g=null,_=null,E=void 0,y=null,b=!!u.dynamicChildren)=>{if(f===u)return;f&&!xt(f,u)&&(v=Kt(f),ye(f,g,_,!0),f=null),u.patchFlag===-2&&(b=!1,u.dynamicChildren=null);const{type:m,ref:O,shapeFlag:w}=u;switch(m){case as:G(f,u,h,v);break;case pt:R(f,u,h,v);break;case Ss:f==null&&H(u,h,v,E);break;case Ae:ge(f,u,h,v,g,_,E,y,b);break;default:w&1?I(f,u,h,v,g,_,E,y,b):w&6?Vt(f,u,h,v,g,_,E,y,b):(w&64||w&128)&&m.process(f,u,h,v,g,_,E,y,b,vt)}O!=null&&g?Ot(O,f&&f.ref,_,u||f,!u):O==null&&f&&f.ref!=null&&Ot(f.ref,null,_,f,!0)},G=(f,u,h,v)=>{if(f==null)n(u.el=l(u.children),h,v);else{const g=u.el=f.el;u.children!==f.children&&d(g,u.children)}},R=(f,u,h,v)=>{f==null?n(u.el=c(u.children||""),h,v):u.el=f.el},H=(f,u,h,v)=>{[f.el,f.anchor]=A(f.children,u,h,v,f.el,f.anchor)},L=({el:f,anchor:u},h,v)=>{let g;for(;f&&f!==u;)g=S(f),n(f,h,v),f=g;n(u,h,v)},x=({el:f,anchor:u})=>{let h;for(;f&&f!==u;)h=S(f),r(f),f=h;r(u)},I=(f,u,h,v,g,_,E,y,b)=>{if(u.type==="svg"?E="svg":u.type==="math"&&(E="mathml"),f==null)$(u,h,v,g,_,E,y,b);else{const m=f.el&&f.el._isVueCE?f.el:null;try{m&&m._beginPatch(),Ge(f,u,g,_,E,y,b)}finally{m&&m._endPatch()}}},$=(f,u,h,v,g,_,E,y)=>{let b,m;const{props:O,shapeFlag:w,transition:C,dirs:M}=f;if(b=f.el=o(f.type,_,O&&O.is,O),w&8?a(b,f.children):w&16&&pe(f.children,b,null,v,g,Es(f,_),E,y),M&&Xe(f,null,v,"created"),ie(b,f,f.scopeId,E,v),O){for(const q in O)q!=="value"&&!Pt(q)&&i(b,q,null,O[q],_,v);"value"in O&&i(b,"value",null,O.value,_),(m=O.onVnodeBeforeMount)&&we(m,v,f)}M&&Xe(f,null,v,"beforeMount");const j=Io(g,C);j&&C.beforeEnter(b),n(b,u,h),((m=O&&O.onVnodeMounted)||j||M)&&ue(()=>{m&&we(m,v,f),j&&C.enter(b),M&&Xe(f,null,v,"mounted")},g)},ie=(f,u,h,v,g)=>{if(h&&T(f,h),v)for(let _=0;_<v.length;_++)T(f,v[_]);if(g){let _=g.subTree;if(u===_||Vr(_.type)&&(_.ssContent===u||_.ssFallback===u)){const E=g.vnode;ie(f,E,E.scopeId,E.slotScopeIds,g.parent)}}},pe=(f,u,h,v,g,_,E,y,b=0)=>{for(let m=b;m<f.length;m++){const O=f[m]=y?Be(f[m]):Ce(f[m]);P(null,O,u,h,v,g,_,E,y)}},Ge=(f,u,h,v,g,_,E)=>{const y=u.el=f.el;let{patchFlag:b,dynamicChildren:m,dirs:O}=u;b|=f.patchFlag&16;const w=f.props||B,C=u.props||B;let M;if(h&&Qe(h,!1),(M=C.onVnodeBeforeUpdate)&&we(M,h,u,f),O&&Xe(u,f,h,"beforeUpdate"),h&&Qe(h,!0),(w.innerHTML&&C.innerHTML==null||w.textContent&&C.textContent==null)&&a(y,""),m?be(f.dynamicChildren,m,y,h,v,Es(u,g),_):E||W(f,u,y,null,h,v,Es(u,g),_,!1),b>0){if(b&16)Ne(y,w,C,h,g);else if(b&2&&w.class!==C.class&&i(y,"class",null,C.class,g),b&4&&i(y,"style",w.style,C.style,g),b&8){const j=u.dynamicProps;for(let q=0;q<j.length;q++){const U=j[q],oe=w[U],le=C[U];(le!==oe||U==="value")&&i(y,U,oe,le,g,h)}}b&1&&f.children!==u.children&&a(y,u.children)}else!E&&m==null&&Ne(y,w,C,h,g);((M=C.onVnodeUpdated)||O)&&ue(()=>{M&&we(M,h,u,f),O&&Xe(u,f,h,"updated")},v)},be=(f,u,h,v,g,_,E)=>{for(let y=0;y<u.length;y++){const b=f[y],m=u[y],O=b.el&&(b.type===Ae||!xt(b,m)||b.shapeFlag&198)?p(b.el):h;P(b,m,O,null,v,g,_,E,!0)}},Ne=(f,u,h,v,g)=>{if(u!==h){if(u!==B)for(const _ in u)!Pt(_)&&!(_ in h)&&i(f,_,u[_],null,g,v);for(const _ in h){if(Pt(_))continue;const E=h[_],y=u[_];E!==y&&_!=="value"&&i(f,_,y,E,g,v)}"value"in h&&i(f,"value",u.value,h.value,g)}},ge=(f,u,h,v,g,_,E,y,b)=>{const m=u.el=f?f.el:l(""),O=u.anchor=f?f.anchor:l("");let{patchFlag:w,dynamicChildren:C,slotScopeIds:M}=u;M&&(y=y?y.concat(M):M),f==null?(n(m,h,v),n(O,h,v),pe(u.children||[],h,O,g,_,E,y,b)):w>0&&w&64&&C&&f.dynamicChildren?(be(f.dynamicChildren,C,h,g,_,E,y),(u.key!=null||g&&u===g.subTree)&&$r(f,u,!0)):W(f,u,h,O,g,_,E,y,b)},Vt=(f,u,h,v,g,_,E,y,b)=>{u.slotScopeIds=y,f==null?u.shapeFlag&512?g.ctx.activate(u,h,v,E,b):hs(u,h,v,g,_,E,b):on(f,u,b)},hs=(f,u,h,v,g,_,E)=>{const y=f.component=Bo(f,v,g);if(tn(f)&&(y.ctx.renderer=vt),qo(y,!1,E),y.asyncDep){if(g&&g.registerDep(y,se,E),!f.el){const b=y.subTree=X(pt);R(null,b,u,h),f.placeholder=b.el}}else se(y,f,u,h,g,_,E)},on=(f,u,h)=>{const v=u.component=f.component;if(yo(f,u,h))if(v.asyncDep&&!v.asyncResolved){k(v,u,h);return}else v.next=u,v.update();else u.el=f.el,v.vnode=u},se=(f,u,h,v,g,_,E)=>{const y=()=>{if(f.isMounted){let{next:w,bu:C,u:M,parent:j,vnode:q}=f;{const Ee=Nr(f);if(Ee){w&&(w.el=q.el,k(f,w,E)),Ee.asyncDep.then(()=>{f.isUnmounted||y()});return}}let U=w,oe;Qe(f,!1),w?(w.el=q.el,k(f,w,E)):w=q,C&&Gt(C),(oe=w.props&&w.props.onVnodeBeforeUpdate)&&we(oe,j,w,q),Qe(f,!0);const le=En(f),xe=f.subTree;f.subTree=le,P(xe,le,p(xe.el),Kt(xe),f,g,_),w.el=le.el,U===null&&xo(f,le.el),M&&ue(M,g),(oe=w.props&&w.props.onVnodeUpdated)&&ue(()=>we(oe,j,w,q),g)}else{let w;const{el:C,props:M}=u,{bm:j,m:q,parent:U,root:oe,type:le}=f,xe=It(u);Qe(f,!1),j&&Gt(j),!xe&&(w=M&&M.onVnodeBeforeMount)&&we(w,U,u),Qe(f,!0);{oe.ce&&oe.ce._def.shadowRoot!==!1&&oe.ce._injectChildStyle(le);const Ee=f.subTree=En(f);P(null,Ee,h,v,f,g,_),u.el=Ee.el}if(q&&ue(q,g),!xe&&(w=M&&M.onVnodeMounted)){const Ee=u;ue(()=>we(w,U,Ee),g)}(u.shapeFlag&256||U&&It(U.vnode)&&U.vnode.shapeFlag&256)&&f.a&&ue(f.a,g),f.isMounted=!0,u=h=v=null}};f.scope.on();const b=f.effect=new er(y);f.scope.off();const m=f.update=b.run.bind(b),O=f.job=b.runIfDirty.bind(b);O.i=f,O.id=f.uid,b.scheduler=()=>Zs(O),Qe(f,!0),m()},k=(f,u,h)=>{u.component=f;const v=f.vnode.props;f.vnode=u,f.next=null,So(f,u.props,v,h),Ao(f,u.children,h),Le(),gn(f),He()},W=(f,u,h,v,g,_,E,y,b=!1)=>{const m=f&&f.children,O=f?f.shapeFlag:0,w=u.children,{patchFlag:C,shapeFlag:M}=u;if(C>0){if(C&128){Ut(m,w,h,v,g,_,E,y,b);return}else if(C&256){Ye(m,w,h,v,g,_,E,y,b);return}}M&8?(O&16&&mt(m,g,_),w!==m&&a(h,w)):O&16?M&16?Ut(m,w,h,v,g,_,E,y,b):mt(m,g,_,!0):(O&8&&a(h,""),M&16&&pe(w,h,v,g,_,E,y,b))},Ye=(f,u,h,v,g,_,E,y,b)=>{f=f||ft,u=u||ft;const m=f.length,O=u.length,w=Math.min(m,O);let C;for(C=0;C<w;C++){const M=u[C]=b?Be(u[C]):Ce(u[C]);P(f[C],M,h,null,g,_,E,y,b)}m>O?mt(f,g,_,!0,!1,w):pe(u,h,v,g,_,E,y,b,w)},Ut=(f,u,h,v,g,_,E,y,b)=>{let m=0;const O=u.length;let w=f.length-1,C=O-1;for(;m<=w&&m<=C;){const M=f[m],j=u[m]=b?Be(u[m]):Ce(u[m]);if(xt(M,j))P(M,j,h,null,g,_,E,y,b);else break;m++}for(;m<=w&&m<=C;){const M=f[w],j=u[C]=b?Be(u[C]):Ce(u[C]);if(xt(M,j))P(M,j,h,null,g,_,E,y,b);else break;w--,C--}if(m>w){if(m<=C){const M=C+1,j=M<O?u[M].el:v;for(;m<=C;)P(null,u[m]=b?Be(u[m]):Ce(u[m]),h,j,g,_,E,y,b),m++}}else if(m>C)for(;m<=w;)ye(f[m],g,_,!0),m++;else{const M=m,j=m,q=new Map;for(m=j;m<=C;m++){const fe=u[m]=b?Be(u[m]):Ce(u[m]);fe.key!=null&&q.set(fe.key,m)}let U,oe=0;const le=C-j+1;let xe=!1,Ee=0;const bt=new Array(le);for(m=0;m<le;m++)bt[m]=0;for(m=M;m<=w;m++){const fe=f[m];if(oe>=le){ye(fe,g,_,!0);continue}let Se;if(fe.key!=null)Se=q.get(fe.key);else for(U=j;U<=C;U++)if(bt[U-j]===0&&xt(fe,u[U])){Se=U;break}Se===void 0?ye(fe,g,_,!0):(bt[Se-j]=m+1,Se>=Ee?Ee=Se:xe=!0,P(fe,u[Se],h,null,g,_,E,y,b),oe++)}const fn=xe?Mo(bt):ft;for(U=fn.length-1,m=le-1;m>=0;m--){const fe=j+m,Se=u[fe],un=u[fe+1],an=fe+1<O?un.el||un.placeholder:v;bt[m]===0?P(null,Se,h,an,g,_,E,y,b):xe&&(U<0||m!==fn[U]?ke(Se,h,an,2):U--)}}},ke=(f,u,h,v,g=null)=>{const{el:_,type:E,transition:y,children:b,shapeFlag:m}=f;if(m&6){ke(f.component.subTree,u,h,v);return}if(m&128){f.suspense.move(u,h,v);return}if(m&64){E.move(f,u,h,vt);return}if(E===Ae){n(_,u,h);for(let w=0;w<b.length;w++)ke(b[w],u,h,v);n(f.anchor,u,h);return}if(E===Ss){L(f,u,h);return}if(v!==2&&m&1&&y)if(v===0)y.beforeEnter(_),n(_,u,h),ue(()=>y.enter(_),g);else{const{leave:w,delayLeave:C,afterLeave:M}=y,j=()=>{f.ctx.isUnmounted?r(_):n(_,u,h)},q=()=>{_._isLeaving&&_[Ki](!0),w(_,()=>{j(),M&&M()})};C?C(_,j,q):q()}else n(_,u,h)},ye=(f,u,h,v=!1,g=!1)=>{const{type:_,props:E,ref:y,children:b,dynamicChildren:m,shapeFlag:O,patchFlag:w,dirs:C,cacheIndex:M}=f;if(w===-2&&(g=!1),y!=null&&(Le(),Ot(y,null,h,f,!0),He()),M!=null&&(u.renderCache[M]=void 0),O&256){u.ctx.deactivate(f);return}const j=O&1&&C,q=!It(f);let U;if(q&&(U=E&&E.onVnodeBeforeUnmount)&&we(U,u,f),O&6)kr(f.component,h,v);else{if(O&128){f.suspense.unmount(h,v);return}j&&Xe(f,null,u,"beforeUnmount"),O&64?f.type.remove(f,u,h,vt,v):m&&!m.hasOnce&&(_!==Ae||w>0&&w&64)?mt(m,u,h,!1,!0):(_===Ae&&w&384||!g&&O&16)&&mt(b,u,h),v&&ln(f)}(q&&(U=E&&E.onVnodeUnmounted)||j)&&ue(()=>{U&&we(U,u,f),j&&Xe(f,null,u,"unmounted")},h)},ln=f=>{const{type:u,el:h,anchor:v,transition:g}=f;if(u===Ae){Yr(h,v);return}if(u===Ss){x(f);return}const _=()=>{r(h),g&&!g.persisted&&g.afterLeave&&g.afterLeave()};if(f.shapeFlag&1&&g&&!g.persisted){const{leave:E,delayLeave:y}=g,b=()=>E(h,_);y?y(f.el,_,b):b()}else _()},Yr=(f,u)=>{let h;for(;f!==u;)h=S(f),r(f),f=h;r(u)},kr=(f,u,h)=>{const{bum:v,scope:g,job:_,subTree:E,um:y,m:b,a:m}=f;Tn(b),Tn(m),v&&Gt(v),g.stop(),_&&(_.flags|=8,ye(E,f,u,h)),y&&ue(y,u),ue(()=>{f.isUnmounted=!0},u)},mt=(f,u,h,v=!1,g=!1,_=0)=>{for(let E=_;E<f.length;E++)ye(f[E],u,h,v,g)},Kt=f=>{if(f.shapeFlag&6)return Kt(f.component.subTree);if(f.shapeFlag&128)return f.suspense.next();const u=S(f.anchor||f.el),h=u&&u[Vi];return h?S(h):u};let ps=!1;const cn=(f,u,h)=>{f==null?u._vnode&&ye(u._vnode,null,null,!0):P(u._vnode||null,f,u,null,null,null,h),u._vnode=f,ps||(ps=!0,gn(),mr(),ps=!1)},vt={p:P,um:ye,m:ke,r:ln,mt:hs,mc:pe,pc:W,pbc:be,n:Kt,o:e};return{render:cn,hydrate:void 0,createApp:fo(cn)}}function Es({type:e,props:t},s){return s==="svg"&&e==="foreignObject"||s==="mathml"&&e==="annotation-xml"&&t&&t.encoding&&t.encoding.includes("html")?void 0:s}function Qe({effect:e,job:t},s){s?(e.flags|=32,t.flags|=4):(e.flags&=-33,t.flags&=-5)}function Io(e,t){return(!e||e&&!e.pendingBranch)&&t&&!t.persisted}function $r(e,t,s=!1){const n=e.children,r=t.children;if(D(n)&&D(r))for(let i=0;i<n.length;i++){const o=n[i];let l=r[i];l.shapeFlag&1&&!l.dynamicChildren&&((l.patchFlag<=0||l.patchFlag===32)&&(l=r[i]=Be(r[i]),l.el=o.el),!s&&l.patchFlag!==-2&&$r(o,l)),l.type===as&&l.patchFlag!==-1&&(l.el=o.el),l.type===pt&&!l.el&&(l.el=o.el)}}function Mo(e){const t=e.slice(),s=[0];let n,r,i,o,l;const c=e.length;for(n=0;n<c;n++){const d=e[n];if(d!==0){if(r=s[s.length-1],e[r]<d){t[n]=r,s.push(n);continue}for(i=0,o=s.length-1;i<o;)l=i+o>>1,e[s[l]]<d?i=l+1:o=l;d<e[s[i]]&&(i>0&&(t[n]=s[i-1]),s[i]=n)}}for(i=s.length,o=s[i-1];i-- >0;)s[i]=o,o=t[o];return s}function Nr(e){const t=e.subTree.component;if(t)return t.asyncDep&&!t.asyncResolved?t:Nr(t)}function Tn(e){if(e)for(let t=0;t<e.length;t++)e[t].flags|=8}const Vr=e=>e.__isSuspense;function Ro(e,t){t&&t.pendingBranch?D(e)?t.effects.push(...e):t.effects.push(e):$i(e)}const Ae=Symbol.for("v-fgt"),as=Symbol.for("v-txt"),pt=Symbol.for("v-cmt"),Ss=Symbol.for("v-stc"),Rt=[];let ae=null;function Fo(e=!1){Rt.push(ae=e?null:[])}function Do(){Rt.pop(),ae=Rt[Rt.length-1]||null}let Ht=1;function Pn(e,t=!1){Ht+=e,e<0&&ae&&t&&(ae.hasOnce=!0)}function Lo(e){return e.dynamicChildren=Ht>0?ae||ft:null,Do(),Ht>0&&ae&&ae.push(e),e}function Ho(e,t,s,n,r,i){return Lo(K(e,t,s,n,r,i,!0))}function Ur(e){return e?e.__v_isVNode===!0:!1}function xt(e,t){return e.type===t.type&&e.key===t.key}const Kr=({key:e})=>e??null,kt=({ref:e,ref_key:t,ref_for:s})=>(typeof e=="number"&&(e=""+e),e!=null?z(e)||ee(e)||F(e)?{i:de,r:e,k:t,f:!!s}:e:null);function K(e,t=null,s=null,n=0,r=null,i=e===Ae?0:1,o=!1,l=!1){const c={__v_isVNode:!0,__v_skip:!0,type:e,props:t,key:t&&Kr(t),ref:t&&kt(t),scopeId:br,slotScopeIds:null,children:s,component:null,suspense:null,ssContent:null,ssFallback:null,dirs:null,transition:null,el:null,anchor:null,target:null,targetStart:null,targetAnchor:null,staticCount:0,shapeFlag:i,patchFlag:n,dynamicProps:r,dynamicChildren:null,appContext:null,ctx:de};return l?(rn(c,s),i&128&&e.normalize(c)):s&&(c.shapeFlag|=z(s)?8:16),Ht>0&&!o&&ae&&(c.patchFlag>0||i&6)&&c.patchFlag!==32&&ae.push(c),c}const X=jo;function jo(e,t=null,s=null,n=0,r=null,i=!1){if((!e||e===to)&&(e=pt),Ur(e)){const l=gt(e,t,!0);return s&&rn(l,s),Ht>0&&!i&&ae&&(l.shapeFlag&6?ae[ae.indexOf(e)]=l:ae.push(l)),l.patchFlag=-2,l}if(ko(e)&&(e=e.__vccOpts),t){t=$o(t);let{class:l,style:c}=t;l&&!z(l)&&(t.class=_e(l)),Y(c)&&(Xs(c)&&!D(c)&&(c=te({},c)),t.style=Bs(c))}const o=z(e)?1:Vr(e)?128:Ui(e)?64:Y(e)?4:F(e)?2:0;return K(e,t,s,n,r,o,i,!0)}function $o(e){return e?Xs(e)||Rr(e)?te({},e):e:null}function gt(e,t,s=!1,n=!1){const{props:r,ref:i,patchFlag:o,children:l,transition:c}=e,d=t?Vo(r||{},t):r,a={__v_isVNode:!0,__v_skip:!0,type:e.type,props:d,key:d&&Kr(d),ref:t&&t.ref?s&&i?D(i)?i.concat(kt(t)):[i,kt(t)]:kt(t):i,scopeId:e.scopeId,slotScopeIds:e.slotScopeIds,children:l,target:e.target,targetStart:e.targetStart,targetAnchor:e.targetAnchor,staticCount:e.staticCount,shapeFlag:e.shapeFlag,patchFlag:t&&e.type!==Ae?o===-1?16:o|16:o,dynamicProps:e.dynamicProps,dynamicChildren:e.dynamicChildren,appContext:e.appContext,dirs:e.dirs,transition:c,component:e.component,suspense:e.suspense,ssContent:e.ssContent&&gt(e.ssContent),ssFallback:e.ssFallback&&gt(e.ssFallback),placeholder:e.placeholder,el:e.el,anchor:e.anchor,ctx:e.ctx,ce:e.ce};return c&&n&&Qs(a,c.clone(a)),a}function No(e=" ",t=0){return X(as,null,e,t)}function Ce(e){return e==null||typeof e=="boolean"?X(pt):D(e)?X(Ae,null,e.slice()):Ur(e)?Be(e):X(as,null,String(e))}function Be(e){return e.el===null&&e.patchFlag!==-1||e.memo?e:gt(e)}function rn(e,t){let s=0;const{shapeFlag:n}=e;if(t==null)t=null;else if(D(t))s=16;else if(typeof t=="object")if(n&65){const r=t.default;r&&(r._c&&(r._d=!1),rn(e,r()),r._c&&(r._d=!0));return}else{s=32;const r=t._;!r&&!Rr(t)?t._ctx=de:r===3&&de&&(de.slots._===1?t._=1:(t._=2,e.patchFlag|=1024))}else F(t)?(t={default:t,_ctx:de},s=32):(t=String(t),n&64?(s=16,t=[No(t)]):s=8);e.children=t,e.shapeFlag|=s}function Vo(...e){const t={};for(let s=0;s<e.length;s++){const n=e[s];for(const r in n)if(r==="class")t.class!==n.class&&(t.class=_e([t.class,n.class]));else if(r==="style")t.style=Bs([t.style,n.style]);else if(rs(r)){const i=t[r],o=n[r];o&&i!==o&&!(D(i)&&i.includes(o))&&(t[r]=i?[].concat(i,o):o)}else r!==""&&(t[r]=n[r])}return t}function we(e,t,s,n=null){Ie(e,t,7,[s,n])}const Uo=Pr();let Ko=0;function Bo(e,t,s){const n=e.type,r=(t?t.appContext:e.appContext)||Uo,i={uid:Ko++,vnode:e,type:n,parent:t,appContext:r,root:null,next:null,subTree:null,effect:null,update:null,job:null,scope:new oi(!0),render:null,proxy:null,exposed:null,exposeProxy:null,withProxy:null,provides:t?t.provides:Object.create(r.provides),ids:t?t.ids:["",0,0],accessCache:null,renderCache:[],components:null,directives:null,propsOptions:Dr(n,r),emitsOptions:Or(n,r),emit:null,emitted:null,propsDefaults:B,inheritAttrs:n.inheritAttrs,ctx:B,data:B,props:B,attrs:B,slots:B,refs:B,setupState:B,setupContext:null,suspense:s,suspenseId:s?s.pendingId:0,asyncDep:null,asyncResolved:!1,isMounted:!1,isUnmounted:!1,isDeactivated:!1,bc:null,c:null,bm:null,m:null,bu:null,u:null,um:null,bum:null,da:null,a:null,rtg:null,rtc:null,ec:null,sp:null};return i.ctx={_:i},i.root=t?t.root:i,i.emit=_o.bind(null,i),e.ce&&e.ce(i),i}let Q=null;const Wo=()=>Q||de;let ss,Hs;{const e=ls(),t=(s,n)=>{let r;return(r=e[s])||(r=e[s]=[]),r.push(n),i=>{r.length>1?r.forEach(o=>o(i)):r[0](i)}};ss=t("__VUE_INSTANCE_SETTERS__",s=>Q=s),Hs=t("__VUE_SSR_SETTERS__",s=>_t=s)}const Nt=e=>{const t=Q;return ss(e),e.scope.on(),()=>{e.scope.off(),ss(t)}},An=()=>{Q&&Q.scope.off(),ss(null)};function Br(e){return e.vnode.shapeFlag&4}let _t=!1;function qo(e,t=!1,s=!1){t&&Hs(t);const{props:n,children:r}=e.vnode,i=Br(e);Eo(e,n,i,t),Po(e,r,s||t);const o=i?Jo(e,t):void 0;return t&&Hs(!1),o}function Jo(e,t){const s=e.type;e.accessCache=Object.create(null),e.proxy=new Proxy(e.ctx,so);const{setup:n}=s;if(n){Le();const r=e.setupContext=n.length>1?Yo(e):null,i=Nt(e),o=jt(n,e,0,[e.props,r]),l=Jn(o);if(He(),i(),(l||e.sp)&&!It(e)&&en(e),l){if(o.then(An,An),t)return o.then(c=>{Cn(e,c)}).catch(c=>{$t(c,e,0)});e.asyncDep=o}else Cn(e,o)}else Wr(e)}function Cn(e,t,s){F(t)?e.type.__ssrInlineRender?e.ssrRender=t:e.render=t:Y(t)&&(e.setupState=pr(t)),Wr(e)}function Wr(e,t,s){const n=e.type;e.render||(e.render=n.render||Oe);{const r=Nt(e);Le();try{no(e)}finally{He(),r()}}}const Go={get(e,t){return Z(e,"get",""),e[t]}};function Yo(e){const t=s=>{e.exposed=s||{}};return{attrs:new Proxy(e.attrs,Go),slots:e.slots,emit:e.emit,expose:t}}function ds(e){return e.exposed?e.exposeProxy||(e.exposeProxy=new Proxy(pr(Ai(e.exposed)),{get(t,s){if(s in t)return t[s];if(s in Mt)return Mt[s](e)},has(t,s){return s in t||s in Mt}})):e.proxy}function ko(e){return F(e)&&"__vccOpts"in e}const zo=(e,t)=>Ri(e,t,_t),Xo="3.5.25";/**
-* @vue/runtime-dom v3.5.25
-* (c) 2018-present Yuxi (Evan) You and Vue contributors
-* @license MIT
-**/let js;const On=typeof window<"u"&&window.trustedTypes;if(On)try{js=On.createPolicy("vue",{createHTML:e=>e})}catch{}const qr=js?e=>js.createHTML(e):e=>e,Zo="http://www.w3.org/2000/svg",Qo="http://www.w3.org/1998/Math/MathML",Re=typeof document<"u"?document:null,In=Re&&Re.createElement("template"),el={insert:(e,t,s)=>{t.insertBefore(e,s||null)},remove:e=>{const t=e.parentNode;t&&t.removeChild(e)},createElement:(e,t,s,n)=>{const r=t==="svg"?Re.createElementNS(Zo,e):t==="mathml"?Re.createElementNS(Qo,e):s?Re.createElement(e,{is:s}):Re.createElement(e);return e==="select"&&n&&n.multiple!=null&&r.setAttribute("multiple",n.multiple),r},createText:e=>Re.createTextNode(e),createComment:e=>Re.createComment(e),setText:(e,t)=>{e.nodeValue=t},setElementText:(e,t)=>{e.textContent=t},parentNode:e=>e.parentNode,nextSibling:e=>e.nextSibling,querySelector:e=>Re.querySelector(e),setScopeId(e,t){e.setAttribute(t,"")},insertStaticContent(e,t,s,n,r,i){const o=s?s.previousSibling:t.lastChild;if(r&&(r===i||r.nextSibling))for(;t.insertBefore(r.cloneNode(!0),s),!(r===i||!(r=r.nextSibling)););else{In.innerHTML=qr(n==="svg"?`<svg>${e}</svg>`:n==="mathml"?`<math>${e}</math>`:e);const l=In.content;if(n==="svg"||n==="mathml"){const c=l.firstChild;for(;c.firstChild;)l.appendChild(c.firstChild);l.removeChild(c)}t.insertBefore(l,s)}return[o?o.nextSibling:t.firstChild,s?s.previousSibling:t.lastChild]}},tl=Symbol("_vtc");function sl(e,t,s){const n=e[tl];n&&(t=(t?[t,...n]:[...n]).join(" ")),t==null?e.removeAttribute("class"):s?e.setAttribute("class",t):e.className=t}const ns=Symbol("_vod"),Jr=Symbol("_vsh"),et={name:"show",beforeMount(e,{value:t},{transition:s}){e[ns]=e.style.display==="none"?"":e.style.display,s&&t?s.beforeEnter(e):Et(e,t)},mounted(e,{value:t},{transition:s}){s&&t&&s.enter(e)},updated(e,{value:t,oldValue:s},{transition:n}){!t!=!s&&(n?t?(n.beforeEnter(e),Et(e,!0),n.enter(e)):n.leave(e,()=>{Et(e,!1)}):Et(e,t))},beforeUnmount(e,{value:t}){Et(e,t)}};function Et(e,t){e.style.display=t?e[ns]:"none",e[Jr]=!t}const nl=Symbol(""),rl=/(?:^|;)\s*display\s*:/;function il(e,t,s){const n=e.style,r=z(s);let i=!1;if(s&&!r){if(t)if(z(t))for(const o of t.split(";")){const l=o.slice(0,o.indexOf(":")).trim();s[l]==null&&zt(n,l,"")}else for(const o in t)s[o]==null&&zt(n,o,"");for(const o in s)o==="display"&&(i=!0),zt(n,o,s[o])}else if(r){if(t!==s){const o=n[nl];o&&(s+=";"+o),n.cssText=s,i=rl.test(s)}}else t&&e.removeAttribute("style");ns in e&&(e[ns]=i?n.display:"",e[Jr]&&(n.display="none"))}const Mn=/\s*!important$/;function zt(e,t,s){if(D(s))s.forEach(n=>zt(e,t,n));else if(s==null&&(s=""),t.startsWith("--"))e.setProperty(t,s);else{const n=ol(e,t);Mn.test(s)?e.setProperty(it(n),s.replace(Mn,""),"important"):e[n]=s}}const Rn=["Webkit","Moz","ms"],ws={};function ol(e,t){const s=ws[t];if(s)return s;let n=qe(t);if(n!=="filter"&&n in e)return ws[t]=n;n=kn(n);for(let r=0;r<Rn.length;r++){const i=Rn[r]+n;if(i in e)return ws[t]=i}return t}const Fn="http://www.w3.org/1999/xlink";function Dn(e,t,s,n,r,i=ii(t)){n&&t.startsWith("xlink:")?s==null?e.removeAttributeNS(Fn,t.slice(6,t.length)):e.setAttributeNS(Fn,t,s):s==null||i&&!Xn(s)?e.removeAttribute(t):e.setAttribute(t,i?"":Je(s)?String(s):s)}function Ln(e,t,s,n,r){if(t==="innerHTML"||t==="textContent"){s!=null&&(e[t]=t==="innerHTML"?qr(s):s);return}const i=e.tagName;if(t==="value"&&i!=="PROGRESS"&&!i.includes("-")){const l=i==="OPTION"?e.getAttribute("value")||"":e.value,c=s==null?e.type==="checkbox"?"on":"":String(s);(l!==c||!("_value"in e))&&(e.value=c),s==null&&e.removeAttribute(t),e._value=s;return}let o=!1;if(s===""||s==null){const l=typeof e[t];l==="boolean"?s=Xn(s):s==null&&l==="string"?(s="",o=!0):l==="number"&&(s=0,o=!0)}try{e[t]=s}catch{}o&&e.removeAttribute(r||t)}function ct(e,t,s,n){e.addEventListener(t,s,n)}function ll(e,t,s,n){e.removeEventListener(t,s,n)}const Hn=Symbol("_vei");function cl(e,t,s,n,r=null){const i=e[Hn]||(e[Hn]={}),o=i[t];if(n&&o)o.value=n;else{const[l,c]=fl(t);if(n){const d=i[t]=dl(n,r);ct(e,l,d,c)}else o&&(ll(e,l,o,c),i[t]=void 0)}}const jn=/(?:Once|Passive|Capture)$/;function fl(e){let t;if(jn.test(e)){t={};let n;for(;n=e.match(jn);)e=e.slice(0,e.length-n[0].length),t[n[0].toLowerCase()]=!0}return[e[2]===":"?e.slice(3):it(e.slice(2)),t]}let Ts=0;const ul=Promise.resolve(),al=()=>Ts||(ul.then(()=>Ts=0),Ts=Date.now());function dl(e,t){const s=n=>{if(!n._vts)n._vts=Date.now();else if(n._vts<=s.attached)return;Ie(hl(n,s.value),t,5,[n])};return s.value=e,s.attached=al(),s}function hl(e,t){if(D(t)){const s=e.stopImmediatePropagation;return e.stopImmediatePropagation=()=>{s.call(e),e._stopped=!0},t.map(n=>r=>!r._stopped&&n&&n(r))}else return t}const $n=e=>e.charCodeAt(0)===111&&e.charCodeAt(1)===110&&e.charCodeAt(2)>96&&e.charCodeAt(2)<123,pl=(e,t,s,n,r,i)=>{const o=r==="svg";t==="class"?sl(e,n,o):t==="style"?il(e,s,n):rs(t)?Ns(t)||cl(e,t,s,n,i):(t[0]==="."?(t=t.slice(1),!0):t[0]==="^"?(t=t.slice(1),!1):gl(e,t,n,o))?(Ln(e,t,n),!e.tagName.includes("-")&&(t==="value"||t==="checked"||t==="selected")&&Dn(e,t,n,o,i,t!=="value")):e._isVueCE&&(/[A-Z]/.test(t)||!z(n))?Ln(e,qe(t),n,i,t):(t==="true-value"?e._trueValue=n:t==="false-value"&&(e._falseValue=n),Dn(e,t,n,o))};function gl(e,t,s,n){if(n)return!!(t==="innerHTML"||t==="textContent"||t in e&&$n(t)&&F(s));if(t==="spellcheck"||t==="draggable"||t==="translate"||t==="autocorrect"||t==="sandbox"&&e.tagName==="IFRAME"||t==="form"||t==="list"&&e.tagName==="INPUT"||t==="type"&&e.tagName==="TEXTAREA")return!1;if(t==="width"||t==="height"){const r=e.tagName;if(r==="IMG"||r==="VIDEO"||r==="CANVAS"||r==="SOURCE")return!1}return $n(t)&&z(s)?!1:t in e}const Nn=e=>{const t=e.props["onUpdate:modelValue"]||!1;return D(t)?s=>Gt(t,s):t};function _l(e){e.target.composing=!0}function Vn(e){const t=e.target;t.composing&&(t.composing=!1,t.dispatchEvent(new Event("input")))}const Ps=Symbol("_assign");function Un(e,t,s){return t&&(e=e.trim()),s&&(e=Ks(e)),e}const Jl={created(e,{modifiers:{lazy:t,trim:s,number:n}},r){e[Ps]=Nn(r);const i=n||r.props&&r.props.type==="number";ct(e,t?"change":"input",o=>{o.target.composing||e[Ps](Un(e.value,s,i))}),(s||i)&&ct(e,"change",()=>{e.value=Un(e.value,s,i)}),t||(ct(e,"compositionstart",_l),ct(e,"compositionend",Vn),ct(e,"change",Vn))},mounted(e,{value:t}){e.value=t??""},beforeUpdate(e,{value:t,oldValue:s,modifiers:{lazy:n,trim:r,number:i}},o){if(e[Ps]=Nn(o),e.composing)return;const l=(i||e.type==="number")&&!/^0\d/.test(e.value)?Ks(e.value):e.value,c=t??"";l!==c&&(document.activeElement===e&&e.type!=="range"&&(n&&t===s||r&&e.value.trim()===c)||(e.value=c))}},ml=["ctrl","shift","alt","meta"],vl={stop:e=>e.stopPropagation(),prevent:e=>e.preventDefault(),self:e=>e.target!==e.currentTarget,ctrl:e=>!e.ctrlKey,shift:e=>!e.shiftKey,alt:e=>!e.altKey,meta:e=>!e.metaKey,left:e=>"button"in e&&e.button!==0,middle:e=>"button"in e&&e.button!==1,right:e=>"button"in e&&e.button!==2,exact:(e,t)=>ml.some(s=>e[`${s}Key`]&&!t.includes(s))},Gl=(e,t)=>{const s=e._withMods||(e._withMods={}),n=t.join(".");return s[n]||(s[n]=(r,...i)=>{for(let o=0;o<t.length;o++){const l=vl[t[o]];if(l&&l(r,t))return}return e(r,...i)})},bl=te({patchProp:pl},el);let Kn;function yl(){return Kn||(Kn=Co(bl))}const xl=(...e)=>{const t=yl().createApp(...e),{mount:s}=t;return t.mount=n=>{const r=Sl(n);if(!r)return;const i=t._component;!F(i)&&!i.render&&!i.template&&(i.template=r.innerHTML),r.nodeType===1&&(r.textContent="");const o=s(r,!1,El(r));return r instanceof Element&&(r.removeAttribute("v-cloak"),r.setAttribute("data-v-app","")),o},t};function El(e){if(e instanceof SVGElement)return"svg";if(typeof MathMLElement=="function"&&e instanceof MathMLElement)return"mathml"}function Sl(e){return z(e)?document.querySelector(e):e}const wl="modulepreload",Tl=function(e){return"/"+e},Bn={},tt=function(t,s,n){let r=Promise.resolve();if(s&&s.length>0){document.getElementsByTagName("link");const o=document.querySelector("meta[property=csp-nonce]"),l=(o==null?void 0:o.nonce)||(o==null?void 0:o.getAttribute("nonce"));r=Promise.allSettled(s.map(c=>{if(c=Tl(c),c in Bn)return;Bn[c]=!0;const d=c.endsWith(".css"),a=d?'[rel="stylesheet"]':"";if(document.querySelector(`link[href="${c}"]${a}`))return;const p=document.createElement("link");if(p.rel=d?"stylesheet":wl,d||(p.as="script"),p.crossOrigin="",p.href=c,l&&p.setAttribute("nonce",l),document.head.appendChild(p),d)return new Promise((S,T)=>{p.addEventListener("load",S),p.addEventListener("error",()=>T(new Error(`Unable to preload CSS for ${c}`)))})}))}function i(o){const l=new Event("vite:preloadError",{cancelable:!0});if(l.payload=o,window.dispatchEvent(l),!l.defaultPrevented)throw o}return r.then(o=>{for(const l of o||[])l.status==="rejected"&&i(l.reason);return t().catch(i)})};function Gr(){const e=window.APP_CONFIG||{};return e.API_BASE&&String(e.API_BASE).trim()||"/api"}async function Pl(e){const t=await fetch(Gr()+"/"+e,{cache:"no-store",mode:"cors"});if(!t.ok)throw new Error("HTTP "+t.status);return t.json()}async function St(e,t=3,s=500){async function n(r){try{return await Pl(e)}catch(i){const o=String((i==null?void 0:i.message)||"");if(/Abort|ERR_ABORTED/i.test(o))return Promise.resolve(null);if(r<=1)throw i;const l=s*Math.pow(2,t-r)*(.7+Math.random()*.6);return await new Promise(c=>setTimeout(c,l)),n(r-1)}}return n(t)}async function Yl(e,t){const s=await fetch(Gr()+"/"+e,{method:"POST",headers:{"Content-Type":"application/json"},body:JSON.stringify(t)});if(!s.ok)throw new Error("HTTP "+s.status);return s.json()}const Al={class:"app-header"},Cl={style:{"margin-left":"auto",display:"flex",gap:"12px","align-items":"center","font-size":"12px"}},Ol={class:"subtext"},Il={class:"subtext"},Ml={class:"subtext"},Rl={class:"app-shell"},Fl={class:"app-sidebar"},Dl={class:"app-main"},Ll={class:"page visible"},Hl={class:"page visible"},jl={class:"page visible"},$l={class:"page visible"},Nl={class:"page visible"},Vl={class:"page visible"},Ul={class:"page visible"},Kl=yr({__name:"App",setup(e){const t=Ze(()=>tt(()=>import("./OrdersPage-DWInrPzI.js"),[])),s=Ze(()=>tt(()=>import("./RidersPage-SBblKv3_.js"),[])),n=Ze(()=>tt(()=>import("./MileagePage-B2EG7Ts5.js"),__vite__mapDeps([0,1]))),r=Ze(()=>tt(()=>import("./AnalyticsPage-CbhpBs6V.js"),__vite__mapDeps([2,1]))),i=Ze(()=>tt(()=>import("./SettlementPage-1yWHZC6E.js"),[])),o=Ze(()=>tt(()=>import("./RankingPage-DOfsnY5d.js"),[])),l=Ze(()=>tt(()=>import("./OverviewPage-BBseQwcF.js"),__vite__mapDeps([3,1]))),c=Pe("overview"),d=Pe([116.397428,39.90923]),a=Pe([]),p=Pe([]),S=Pe(null),T=Pe([]),A=Pe(null);function P(){navigator.onLine!==!1&&Promise.all([St("riders.json",2,300).catch(()=>null),St("alerts.json",2,300).catch(()=>null)]).then(([x,I])=>{Array.isArray(x)&&(a.value=x.filter($=>$.lng!=null&&$.lat!=null).map($=>({name:$.name,pos:[$.lng,$.lat]}))),Array.isArray(I)&&(p.value=I.filter($=>$.lng!=null&&$.lat!=null).map($=>({key:$.orderId+"-"+$.rider,pos:[$.lng,$.lat]})))})}function G(x){d.value=x}function R(x){d.value=x,c.value="overview"}function H(){navigator.onLine!==!1&&Promise.all([St("overview.json",3,400).catch(()=>null),St("orders.json",3,400).catch(()=>null)]).then(([x,I])=>{x&&(S.value=x),Array.isArray(I)&&(T.value=I)})}function L(){navigator.onLine!==!1&&St("healthz",2,300).then(x=>{A.value=x}).catch(()=>{})}return Er(()=>{P();const x=window;x.__APP_FAST_TIMER__&&clearInterval(x.__APP_FAST_TIMER__),x.__APP_MED_TIMER__&&clearInterval(x.__APP_MED_TIMER__),x.__APP_HEALTH_TIMER__&&clearInterval(x.__APP_HEALTH_TIMER__);let I=5e3,$=8e3;x.__APP_FAST_TIMER__=setInterval(P,I),H(),x.__APP_MED_TIMER__=setInterval(H,$),L(),x.__APP_HEALTH_TIMER__=setInterval(()=>{L();try{A.value&&A.value.ok===!1?(x.__APP_MED_TIMER__&&clearInterval(x.__APP_MED_TIMER__),$=15e3,x.__APP_MED_TIMER__=setInterval(H,$)):(x.__APP_MED_TIMER__&&clearInterval(x.__APP_MED_TIMER__),$=8e3,x.__APP_MED_TIMER__=setInterval(H,$))}catch{}},1e4)}),(x,I)=>{var $,ie,pe,Ge,be,Ne;return Fo(),Ho(Ae,null,[K("header",Al,[I[7]||(I[7]=K("div",{class:"brand"},"外卖数智平台",-1)),K("div",Cl,[K("span",{class:_e({tag:!0,"tag-success":($=A.value)==null?void 0:$.ok,"tag-danger":!((ie=A.value)!=null&&ie.ok)})},wt((pe=A.value)!=null&&pe.ok?"API 正常":"API 异常"),3),K("span",Ol,"订单 "+wt(((Ge=A.value)==null?void 0:Ge.orders)||0),1),K("span",Il,"在线骑手 "+wt(((be=A.value)==null?void 0:be.onlineRiders)||0),1),K("span",Ml,"告警 "+wt(((Ne=A.value)==null?void 0:Ne.alerts)||0),1)])]),K("div",Rl,[K("aside",Fl,[K("nav",null,[K("button",{class:_e(["nav-item",{active:c.value==="overview"}]),onClick:I[0]||(I[0]=ge=>c.value="overview")},"概览",2),K("button",{class:_e(["nav-item",{active:c.value==="orders"}]),onClick:I[1]||(I[1]=ge=>c.value="orders")},"订单监控",2),K("button",{class:_e(["nav-item",{active:c.value==="riders"}]),onClick:I[2]||(I[2]=ge=>c.value="riders")},"骑手管理",2),K("button",{class:_e(["nav-item",{active:c.value==="mileage"}]),onClick:I[3]||(I[3]=ge=>c.value="mileage")},"里程管理",2),K("button",{class:_e(["nav-item",{active:c.value==="analytics"}]),onClick:I[4]||(I[4]=ge=>c.value="analytics")},"订单分析",2),K("button",{class:_e(["nav-item",{active:c.value==="settlement"}]),onClick:I[5]||(I[5]=ge=>c.value="settlement")},"收入结算",2),K("button",{class:_e(["nav-item",{active:c.value==="ranking"}]),onClick:I[6]||(I[6]=ge=>c.value="ranking")},"绩效排行",2)])]),K("main",Dl,[ze(K("section",Ll,[X(Ve(l),{center:d.value,riders:a.value,alerts:p.value,overview:S.value,onCenterChanged:G},null,8,["center","riders","alerts","overview"])],512),[[et,c.value==="overview"]]),ze(K("section",Hl,[X(Ve(t),{riders:a.value,alerts:p.value,orders:T.value,onFocus:R},null,8,["riders","alerts","orders"])],512),[[et,c.value==="orders"]]),ze(K("section",jl,[X(Ve(s))],512),[[et,c.value==="riders"]]),ze(K("section",$l,[X(Ve(n))],512),[[et,c.value==="mileage"]]),ze(K("section",Nl,[X(Ve(r))],512),[[et,c.value==="analytics"]]),ze(K("section",Vl,[X(Ve(i))],512),[[et,c.value==="settlement"]]),ze(K("section",Ul,[X(Ve(o))],512),[[et,c.value==="ranking"]])])])],64)}}}),Bl=xl(Kl);Bl.mount("#app");export{Ae as F,Ho as a,Fo as b,zo as c,yr as d,K as e,No as f,ql as g,St as h,Pl as i,Gl as j,xs as k,zi as l,X as m,_e as n,Er as o,Yl as p,Pe as r,wt as t,Jl as v,ze as w};
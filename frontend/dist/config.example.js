@@ -1 +0,0 @@
-window.APP_CONFIG={AMAP_KEY:"",AMAP_SECURITY_JS:"",API_BASE:"/api"}
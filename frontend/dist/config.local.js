@@ -1 +0,0 @@
-window.APP_CONFIG={AMAP_KEY:"1ec5fd8cc7085d91e0a003784aeddefa",AMAP_SECURITY_JS:"d06c3fa0103ac7d317f893a83db6f3c1",API_BASE:"/api"}
@@ -26,8 +26,8 @@ export async function fetchJSONRetry<T=any>(path: string, tries=3, delay=500): P
   return attempt(tries);
 }
 
-export async function postJSON<T=any>(path: string, payload: any): Promise<T> {
-  const r = await fetch(apiBase() + '/' + path, { method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify(payload) });
+export async function postJSON<T=any>(path: string, payload: any, headers: Record<string,string> = {}): Promise<T> {
+  const r = await fetch(apiBase() + '/' + path, { method: 'POST', headers: { 'Content-Type': 'application/json', ...headers }, body: JSON.stringify(payload) });
   if (!r.ok) throw new Error('HTTP '+r.status);
   return r.json();
 }
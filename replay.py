@@ -0,0 +1,168 @@
+"""回放 server.py --capture 录制的流量：按原到达间隔（可加速）向本地服务重发请求，并输出延迟分布。
+
+用法：
+  python replay.py capture.ndjson                      # 1× 原速
+  python replay.py capture.ndjson --speed 5            # 5× 加速
+  python replay.py capture.ndjson --speed 0            # 不等待，按并发上限尽快发送
+  python replay.py capture.ndjson --only GET --concurrency 64 --json report.json
+"""
+import argparse
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+
+
+def load(path, methods=None, prefix=None, limit=0):
+    """读取录制文件，按开始时间排序；跳过无法解析的行。"""
+    recs = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except Exception:
+                continue
+            if methods and r.get('m') not in methods:
+                continue
+            if prefix and not str(r.get('p', '')).startswith(prefix):
+                continue
+            recs.append(r)
+    recs.sort(key=lambda r: r.get('t', 0))
+    return recs[:limit] if limit else recs
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, int(round(q / 100.0 * (len(values) - 1)))))
+    return values[k]
+
+
+def summarize(latencies):
+    return {
+        'count': len(latencies),
+        'p50': round(percentile(latencies, 50), 2),
+        'p90': round(percentile(latencies, 90), 2),
+        'p99': round(percentile(latencies, 99), 2),
+        'max': round(max(latencies), 2) if latencies else 0.0,
+    }
+
+
+def send(base, rec, timeout):
+    """重发一条请求，返回 (状态码, 耗时毫秒)；连接失败状态码为 0。"""
+    url = base.rstrip('/') + rec.get('p', '/') + ('?' + rec['q'] if rec.get('q') else '')
+    method = rec.get('m', 'GET')
+    data = rec.get('b', '').encode('utf-8') if method == 'POST' else None
+    req = urllib.request.Request(url, data=data, method=method)
+    if data is not None:
+        req.add_header('Content-Type', 'application/json')
+    t0 = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as f:
+            f.read()
+            status = f.status
+    except urllib.error.HTTPError as e:
+        e.read()
+        status = e.code
+    except Exception:
+        status = 0
+    return status, (time.perf_counter() - t0) * 1000
+
+
+def replay(recs, base, speed=1.0, concurrency=32, timeout=30):
+    """按录制的到达间隔 / speed 调度请求；同时在途的请求不超过 concurrency，来不及发出的记为调度滞后。"""
+    results = []
+    lock = threading.Lock()
+    slots = threading.Semaphore(max(1, concurrency))
+    t_first = recs[0].get('t', 0) if recs else 0
+    start = time.perf_counter()
+
+    def worker(rec):
+        try:
+            status, ms = send(base, rec, timeout)
+            with lock:
+                results.append((rec, status, ms))
+        finally:
+            slots.release()
+
+    threads = []
+    lags = []
+    for rec in recs:
+        due = (rec.get('t', t_first) - t_first) / speed if speed > 0 else 0.0
+        wait = start + due - time.perf_counter()
+        if wait > 0:
+            time.sleep(wait)
+        slots.acquire()
+        lags.append(max(0.0, (time.perf_counter() - start - due) * 1000))
+        t = threading.Thread(target=worker, args=(rec,), daemon=True)
+        t.start()
+        threads.append(t)
+    for t in threads:
+        t.join()
+    return results, lags, time.perf_counter() - start
+
+
+def report(results, lags, elapsed, recs):
+    by_route = defaultdict(list)
+    captured = defaultdict(list)
+    statuses = defaultdict(int)
+    for rec, status, ms in results:
+        key = f"{rec.get('m')} {rec.get('p')}"
+        by_route[key].append(ms)
+        if rec.get('ms') is not None:
+            captured[key].append(float(rec['ms']))
+        statuses[str(status)] += 1
+    span = (recs[-1].get('t', 0) - recs[0].get('t', 0)) if recs else 0
+    return {
+        'requests': len(results),
+        'elapsed_s': round(elapsed, 2),
+        'captured_span_s': round(span, 2),
+        'rps': round(len(results) / elapsed, 1) if elapsed else 0.0,
+        'status': dict(statuses),
+        'latency_ms': summarize([ms for _, _, ms in results]),
+        'schedule_lag_ms': summarize(lags),
+        'routes': {k: {**summarize(v), 'captured': summarize(captured[k])} for k, v in sorted(by_route.items(), key=lambda kv: -len(kv[1]))},
+    }
+
+
+def print_report(rep):
+    print(f"{rep['requests']} requests in {rep['elapsed_s']}s (captured span {rep['captured_span_s']}s, {rep['rps']} req/s)")
+    print('status: ' + ', '.join(f'{k}={v}' for k, v in sorted(rep['status'].items())))
+    lat, lag = rep['latency_ms'], rep['schedule_lag_ms']
+    print(f"latency ms  p50 {lat['p50']}  p90 {lat['p90']}  p99 {lat['p99']}  max {lat['max']}")
+    print(f"schedule lag ms  p50 {lag['p50']}  p99 {lag['p99']}  max {lag['max']}")
+    print()
+    print(f"{'route':<40} {'n':>6} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8} {'cap p50':>8} {'cap p99':>8}")
+    for k, r in rep['routes'].items():
+        print(f"{k[:40]:<40} {r['count']:>6} {r['p50']:>8} {r['p90']:>8} {r['p99']:>8} {r['max']:>8} {r['captured']['p50']:>8} {r['captured']['p99']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='回放 --capture 录制的请求并统计延迟')
+    parser.add_argument('file', help='server.py --capture 生成的 NDJSON 文件')
+    parser.add_argument('--base', default=f"http://localhost:{os.environ.get('PORT', '8001')}", help='目标服务地址')
+    parser.add_argument('--speed', type=float, default=1.0, help='回放倍速；0 表示不等待、尽快发送')
+    parser.add_argument('--concurrency', type=int, default=32, help='同时在途请求上限')
+    parser.add_argument('--only', action='append', choices=['GET', 'POST'], help='只回放指定方法，可重复')
+    parser.add_argument('--prefix', help='只回放以此开头的路径，如 /api/track')
+    parser.add_argument('--limit', type=int, default=0, help='最多回放条数')
+    parser.add_argument('--timeout', type=float, default=30, help='单个请求超时秒数')
+    parser.add_argument('--json', metavar='PATH', help='另将报告写为 JSON')
+    args = parser.parse_args()
+    recs = load(args.file, set(args.only or []), args.prefix, args.limit)
+    if not recs:
+        raise SystemExit('no requests to replay')
+    results, lags, elapsed = replay(recs, args.base, args.speed, args.concurrency, args.timeout)
+    rep = report(results, lags, elapsed, recs)
+    print_report(rep)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(rep, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,12 @@ $apiBase = 'http://localhost:8001/api'
 try { $cfg = Get-Content $configPath -Raw; $m = [regex]::Match($cfg, 'API_BASE"\s*:\s*"([^"]+)"'); if ($m.Success) { $apiBase = $m.Groups[1].Value } } catch {}
 $backend = Start-Process -FilePath $pythonExe -ArgumentList $backendArgs -WorkingDirectory $root -PassThru  # 启动后端
 Start-Sleep -Seconds 1
+# 存活看 livez（端口已可连即返回 200）；就绪看 readyz，预热完成前为 503，大库可能较慢，最多等 120 秒
 $ok = $false
-for ($i=0; $i -lt 10; $i++) { try { $r = Invoke-WebRequest -Uri ($apiBase + '/healthz') -UseBasicParsing -TimeoutSec 3; if ($r.StatusCode -eq 200) { $ok = $true; break } } catch { Start-Sleep -Milliseconds 500 } }
+for ($i=0; $i -lt 20; $i++) { try { $r = Invoke-WebRequest -Uri ($apiBase + '/livez') -UseBasicParsing -TimeoutSec 3; if ($r.StatusCode -eq 200) { $ok = $true; break } } catch { Start-Sleep -Milliseconds 500 } }
+$ready = $false
+$deadline = (Get-Date).AddSeconds(120)
+while ($ok -and (Get-Date) -lt $deadline) { try { $r = Invoke-WebRequest -Uri ($apiBase + '/readyz') -UseBasicParsing -TimeoutSec 3; if ($r.StatusCode -eq 200) { $ready = $true; break } } catch {}; Start-Sleep -Milliseconds 500 }
 
 # 启动前端（优先使用 Vite）
 $frontendDir = Join-Path $root 'frontend'
@@ -28,4 +32,4 @@ if ($npmCmd -ne $null -and (Test-Path (Join-Path $frontendDir 'package.json')))
   $frontend = Start-Process -FilePath $pythonExe -ArgumentList '-m http.server 8000' -WorkingDirectory $root -PassThru
   if (Test-Path (Join-Path $root 'index.html')) { Start-Process 'http://localhost:8000/' }
 }
-Write-Output ('API ' + $apiBase + ' ok=' + $ok)
+Write-Output ('API ' + $apiBase + ' ok=' + $ok + ' ready=' + $ready)
@@ -4,12 +4,15 @@
 - 初始化并维护数据表
 - 提供查询接口（概览、订单、骑手、告警、绩效、里程等）
 - 接收骑手轨迹与事件上报
-- 基础健康检查与启动备份、日志
+- 基础健康检查、在线定时备份与日志
 """
 import json
 import os
 import sqlite3
 import threading
+import functools
+import hashlib
+import math
 import time
 from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import logging
@@ -19,21 +22,22 @@ from urllib.parse import parse_qs
 
 DB_PATH = os.path.join(os.path.dirname(__file__), 'data.db')
 
-def init_db():
-    """创建/迁移数据库结构并注入示例数据（首次空库）。"""
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
+# --- schema migrations ---
+# 迁移按顺序执行且只执行一次，完成后 PRAGMA user_version 记为其序号；结构变更只能追加到 MIGRATIONS 末尾
+ORDER_COLUMNS = ('id', 'rider', 'status', 'created_ts', 'pickup_ts', 'delivered_ts', 'eta_ts', 'origin_lng', 'origin_lat', 'dest_lng', 'dest_lat', 'fee', 'distance', 'category')
+# 写入时附带按业务时区计算的 local_date / local_hour 与所在区域 zone_id（见 order_params / track_params / point_params / alert_params）
+# 主键冲突时就地更新上述列，不在其中的列（如 ETA 服务写入的 eta_pred_ts）保留
+ORDER_UPSERT_SQL = (f"INSERT INTO orders ({','.join(ORDER_COLUMNS)},local_date,local_hour,zone_id) VALUES ({','.join('?'*(len(ORDER_COLUMNS)+3))}) ON CONFLICT(id) DO UPDATE SET "
+                    + ','.join(f'{col}=excluded.{col}' for col in ORDER_COLUMNS[1:] + ('local_date', 'local_hour', 'zone_id')))
+TRACK_INSERT_SQL = 'INSERT INTO tracks (name, phone, start_ts, end_ts, distance, points, local_date) VALUES (?, ?, ?, ?, ?, ?, ?)'
+LIVE_POINT_SQL = 'INSERT INTO live_points (name, lng, lat, ts, zone_id) VALUES (?, ?, ?, ?, ?)'
+ALERT_INSERT_SQL = 'INSERT INTO alerts (order_id, rider, type, ts, lng, lat, severity, zone_id) VALUES (?,?,?,?,?,?,?,?)'
+
+def _migrate_base_schema(c):
     c.execute('CREATE TABLE IF NOT EXISTS riders (name TEXT PRIMARY KEY, phone TEXT)')
     c.execute('CREATE TABLE IF NOT EXISTS live_points (name TEXT, lng REAL, lat REAL, ts INTEGER)')
     c.execute('CREATE TABLE IF NOT EXISTS tracks (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, phone TEXT, start_ts INTEGER, end_ts INTEGER, distance REAL, points TEXT)')
     c.execute('CREATE TABLE IF NOT EXISTS orders (id TEXT PRIMARY KEY, rider TEXT, status TEXT, created_ts INTEGER, pickup_ts INTEGER, delivered_ts INTEGER, eta_ts INTEGER, origin_lng REAL, origin_lat REAL, dest_lng REAL, dest_lat REAL, fee REAL, distance REAL)')
-    c.execute('PRAGMA table_info(orders)')
-    cols = [r[1] for r in c.fetchall()]
-    if 'category' not in cols:
-        try:
-            c.execute('ALTER TABLE orders ADD COLUMN category TEXT')
-        except Exception:
-            pass
     c.execute('CREATE TABLE IF NOT EXISTS order_events (id INTEGER PRIMARY KEY AUTOINCREMENT, order_id TEXT, ts INTEGER, type TEXT, meta TEXT)')
     c.execute('CREATE TABLE IF NOT EXISTS alerts (id INTEGER PRIMARY KEY AUTOINCREMENT, order_id TEXT, rider TEXT, type TEXT, ts INTEGER, lng REAL, lat REAL, severity INTEGER)')
     c.execute('CREATE TABLE IF NOT EXISTS settlements (id INTEGER PRIMARY KEY AUTOINCREMENT, rider TEXT, period_start_ts INTEGER, period_end_ts INTEGER, orders_count INTEGER, total_income REAL, subsidy REAL, penalties REAL, net_income REAL, generated_ts INTEGER)')
@@ -42,79 +46,618 @@ def init_db():
     c.execute('CREATE INDEX IF NOT EXISTS idx_live_points_name_ts ON live_points(name, ts)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_order_events_order_ts ON order_events(order_id, ts)')
     c.execute('CREATE INDEX IF NOT EXISTS idx_alerts_ts ON alerts(ts)')
-    c.execute('SELECT COUNT(*) FROM orders')
-    if (c.fetchone()[0] or 0) == 0:
-        from time import time
-        now = int(time())
+
+def _migrate_order_category(c):
+    # 早期库可能已手工加过该列，仅此一次需要探测
+    c.execute('PRAGMA table_info(orders)')
+    if 'category' not in [r[1] for r in c.fetchall()]:
+        c.execute('ALTER TABLE orders ADD COLUMN category TEXT')
+
+def _migrate_range_indexes(c):
+    c.execute('CREATE INDEX IF NOT EXISTS idx_orders_created_ts ON orders(created_ts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_tracks_end_ts ON tracks(end_ts)')
+
+def _migrate_settings(c):
+    c.execute('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)')
+
+def _migrate_lifecycle_projection(c):
+    c.execute('CREATE TABLE IF NOT EXISTS projection_state (name TEXT PRIMARY KEY, last_id INTEGER)')
+    c.execute('CREATE TABLE IF NOT EXISTS order_stages (order_id TEXT PRIMARY KEY, hour_ts INTEGER, category TEXT, base_ts INTEGER, created_ts INTEGER, pickup_ts INTEGER, delivered_ts INTEGER)')
+    c.execute('CREATE TABLE IF NOT EXISTS funnel_hourly (hour_ts INTEGER, category TEXT, created INTEGER, picked INTEGER, delivered INTEGER, PRIMARY KEY (hour_ts, category))')
+    c.execute('CREATE TABLE IF NOT EXISTS stage_hist_hourly (hour_ts INTEGER, category TEXT, stage TEXT, bin INTEGER, count INTEGER, PRIMARY KEY (hour_ts, category, stage, bin))')
+    # 历史订单没有生命周期事件，按订单时间戳补齐一次，投影从事件日志完整重建
+    for type_, col in (('created', 'created_ts'), ('pickup', 'pickup_ts'), ('delivered', 'delivered_ts')):
+        c.execute(f"INSERT INTO order_events (order_id, ts, type, meta) SELECT id, {col}, ?, '{{}}' FROM orders o WHERE {col} IS NOT NULL AND NOT EXISTS (SELECT 1 FROM order_events e WHERE e.order_id=o.id AND e.type=?) ORDER BY {col}", (type_, type_))
+
+def _migrate_jobs(c):
+    c.execute('CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY AUTOINCREMENT, kind TEXT, params TEXT, state TEXT, done INTEGER DEFAULT 0, total INTEGER DEFAULT 0, '
+              'cancel INTEGER DEFAULT 0, result TEXT, error TEXT, created_ts INTEGER, started_ts INTEGER, finished_ts INTEGER)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_jobs_state ON jobs(state, id)')
+    # 按骑手删除/统计的列此前均为全表扫描
+    c.execute('CREATE INDEX IF NOT EXISTS idx_orders_rider ON orders(rider)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_alerts_rider ON alerts(rider)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_tracks_name ON tracks(name)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_settlements_rider ON settlements(rider)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_mileage_daily_rider ON mileage_daily(rider)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_performance_daily_rider ON performance_daily(rider)')
+
+def _migrate_change_log(c):
+    c.execute('CREATE TABLE IF NOT EXISTS changes (seq INTEGER PRIMARY KEY AUTOINCREMENT, entity TEXT, key TEXT, op TEXT, ts INTEGER, UNIQUE (entity, key))')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_changes_entity_seq ON changes(entity, seq)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_alerts_order_type ON alerts(order_id, type)')
+    # 已有数据不在日志中：写入首条重置标记，早于它的游标（含 since=0）一律全量返回
+    c.execute("INSERT INTO changes (entity, key, op, ts) VALUES ('*', 'reset', 'reset', strftime('%s','now'))")
+    c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('changes_floor', ?)", (str(c.lastrowid),))
+
+def _migrate_local_buckets(c):
+    c.execute('ALTER TABLE orders ADD COLUMN local_date TEXT')
+    c.execute('ALTER TABLE orders ADD COLUMN local_hour INTEGER')
+    c.execute('ALTER TABLE tracks ADD COLUMN local_date TEXT')
+    backfill_local_buckets(c)
+    c.execute('CREATE INDEX IF NOT EXISTS idx_orders_local_date ON orders(local_date, local_hour)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_tracks_local_date ON tracks(local_date, name)')
+    c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('business_tz', ?)", (BUSINESS_TZ,))
+
+def _migrate_performance_daily(c):
+    # 旧表从未写入：改为按 (日期, 骑手) 累计计数，比率在读取时由区间内的计数求得；内容由 materialize_performance 重建。
+    # WITHOUT ROWID 使行按主键聚簇存放，按日期区间求和时顺序读取，无需回表
+    c.execute('DROP TABLE IF EXISTS performance_daily')
+    c.execute('CREATE TABLE performance_daily (date TEXT, rider TEXT, orders_count INTEGER DEFAULT 0, delivered INTEGER DEFAULT 0, on_time INTEGER DEFAULT 0, '
+              'accepted INTEGER DEFAULT 0, rejected INTEGER DEFAULT 0, ratings INTEGER DEFAULT 0, positive INTEGER DEFAULT 0, PRIMARY KEY (date, rider)) WITHOUT ROWID')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_performance_daily_rider ON performance_daily(rider)')
+    c.execute('CREATE TABLE IF NOT EXISTS performance_orders (order_id TEXT PRIMARY KEY, rider TEXT, date TEXT, created_ts INTEGER, delivered INTEGER, on_time INTEGER)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_performance_orders_rider ON performance_orders(rider)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_order_events_type_ts ON order_events(type, ts)')
+
+def _migrate_zones(c):
+    # 取值由 sync_zones 按区域文件回填（启动时 settings 中尚无 zones 签名，必然执行一次）
+    c.execute('ALTER TABLE orders ADD COLUMN zone_id TEXT')
+    c.execute('ALTER TABLE live_points ADD COLUMN zone_id TEXT')
+    c.execute('ALTER TABLE alerts ADD COLUMN zone_id TEXT')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_orders_zone ON orders(zone_id, created_ts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_alerts_zone ON alerts(zone_id, ts)')
+
+def _migrate_eta_prediction(c):
+    c.execute('ALTER TABLE orders ADD COLUMN eta_pred_ts INTEGER')
+    # 部分索引只包含预测晚于承诺的订单，告警检查按它取回，代价与延迟单量成正比
+    c.execute('CREATE INDEX IF NOT EXISTS idx_orders_predicted_late ON orders(eta_pred_ts) WHERE eta_pred_ts > eta_ts')
+
+def _migrate_row_counts(c):
+    # 触发器维护订单总行数，健康检查读一行即可，不再 COUNT(*) 全表；写入走 UPSERT（冲突时为 UPDATE），不会重复计数
+    c.execute('CREATE TABLE IF NOT EXISTS row_counts (name TEXT PRIMARY KEY, n INTEGER NOT NULL) WITHOUT ROWID')
+    c.execute("INSERT OR REPLACE INTO row_counts (name, n) SELECT 'orders', COUNT(*) FROM orders")
+    c.execute("CREATE TRIGGER IF NOT EXISTS trg_orders_count_insert AFTER INSERT ON orders BEGIN UPDATE row_counts SET n = n + 1 WHERE name = 'orders'; END")
+    c.execute("CREATE TRIGGER IF NOT EXISTS trg_orders_count_delete AFTER DELETE ON orders BEGIN UPDATE row_counts SET n = n - 1 WHERE name = 'orders'; END")
+
+MIGRATIONS = [
+    _migrate_base_schema,
+    _migrate_order_category,
+    _migrate_range_indexes,
+    _migrate_settings,
+    _migrate_lifecycle_projection,
+    _migrate_jobs,
+    _migrate_change_log,
+    _migrate_local_buckets,
+    _migrate_performance_daily,
+    _migrate_zones,
+    _migrate_eta_prediction,
+    _migrate_row_counts,
+]
+
+def migrate(conn):
+    """执行尚未应用的迁移，每个迁移一个事务；返回迁移前的版本号。"""
+    c = conn.cursor()
+    c.execute('PRAGMA user_version')
+    version = c.fetchone()[0] or 0
+    for i in range(version, len(MIGRATIONS)):
+        step = MIGRATIONS[i]
+        t0 = time.perf_counter()
+        c.execute('BEGIN')
+        try:
+            step(c)
+            c.execute(f'PRAGMA user_version={i+1}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logging.info(f'migration {i+1} {step.__name__} applied in {round((time.perf_counter()-t0)*1000, 1)} ms')
+    return version
+
+# --- startup & readiness ---
+# 进程启动后立即绑定端口，迁移、回填与订单簿预热在后台线程中完成：期间 /api/livez 正常返回，
+# /api/readyz 与其他接口返回 503（带 Retry-After），全部完成后 readyz 返回各步骤耗时
+startup_state = {'ready': False, 'phase': 'starting', 'ready_ms': 0, 'steps': {}, 'error': ''}
+_boot_perf = time.perf_counter()
+
+def startup_step(name, fn, *args):
+    startup_state['phase'] = name
+    t0 = time.perf_counter()
+    result = fn(*args)
+    startup_state['steps'][name] = round((time.perf_counter()-t0)*1000, 1)
+    return result
+
+def wait_for_schema(poll=0.2):
+    """非 0 号进程等待 0 号进程完成迁移。"""
+    while True:
+        conn = db()
+        try:
+            if conn.execute('PRAGMA user_version').fetchone()[0] >= len(MIGRATIONS):
+                return
+        except sqlite3.Error:
+            pass
+        finally:
+            conn.close()
+        time.sleep(poll)
+
+def warm_up(leader=True):
+    """后台完成启动准备；0 号进程负责迁移并在就绪后启动后台线程。"""
+    try:
+        if leader:
+            init_db()
+        else:
+            startup_step('schema', wait_for_schema)
+        startup_step('order_book', order_book.sync)
+        startup_state.update(ready=True, phase='ready', ready_ms=round((time.perf_counter()-_boot_perf)*1000, 1))
+        logging.info(f"worker {WORKER_ID} ready in {startup_state['ready_ms']} ms {startup_state['steps']}")
+    except Exception as e:
+        startup_state.update(phase='failed', error=str(e))
+        logging.exception(e)
+        return
+    if leader:
+        start_background()
+
+# 健康检查的计数：订单总数读 row_counts（触发器维护），在线骑手与 24 小时告警为索引区间查询，结果缓存 ttl 秒
+health_cfg = {'ttl': 5}
+_health_counts = {}
+_health_lock = threading.Lock()
+
+def health_counts():
+    """返回缓存的 {orders, onlineRiders, alerts}；过期时只由一个线程刷新，其余探针直接取旧值。"""
+    fresh = time.time() - _health_counts.get('ts', 0) < health_cfg['ttl']
+    # 尚无缓存时等待刷新完成，之后的并发探针不排队
+    if fresh or not _health_lock.acquire(blocking=not _health_counts):
+        return {k: v for k, v in _health_counts.items() if k != 'ts'}
+    try:
+        conn = db()
+        try:
+            c = conn.cursor()
+            c.execute("SELECT n FROM row_counts WHERE name='orders'")
+            row = c.fetchone()
+            c.execute('SELECT COUNT(DISTINCT name) FROM live_points WHERE ts > strftime("%s","now")*1000 - 5*60*1000')
+            online = c.fetchone()[0] or 0
+            c.execute("SELECT COUNT(*) FROM alerts WHERE ts > strftime('%s','now')*1000 - 24*60*60*1000")
+            alerts = c.fetchone()[0] or 0
+        finally:
+            conn.close()
+        _health_counts.update(ts=time.time(), orders=row[0] if row else 0, onlineRiders=online, alerts=alerts)
+    finally:
+        _health_lock.release()
+    return {k: v for k, v in _health_counts.items() if k != 'ts'}
+
+def init_db():
+    """执行数据库迁移并注入示例数据（首次空库）。"""
+    conn = sqlite3.connect(DB_PATH)
+    # 新库启用增量 auto_vacuum（须在建表前设置），删除后的空闲页可由维护线程分步归还；旧库停服后用 --vacuum 转换
+    if conn.execute('PRAGMA page_count').fetchone()[0] == 0:
+        conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+    # WAL 为持久设置：多进程共享同一库时读写互不阻塞
+    conn.execute('PRAGMA journal_mode=WAL')
+    startup_step('migrate', migrate, conn)
+    c = conn.cursor()
+    startup_step('local_buckets', sync_local_buckets, c)
+    startup_step('zones', sync_zones, c)
+    c.execute('SELECT 1 FROM orders LIMIT 1')
+    if c.fetchone() is None:
+        now = int(time.time())
         sample = [
             ("OD20251210001","王明","配送中",now-3600,now-2400,None,now+1800,116.39,39.91,116.405,39.902,18.5,5.2,"快餐"),
             ("OD20251210002","李伟","延迟",now-5400,now-3000,None,now+2400,116.402,39.915,116.396,39.908,21.0,6.3,"奶茶"),
             ("OD20251210003","张强","待取餐",now-1800,None,None,now+1200,116.397,39.909,116.405,39.902,12.0,3.1,"咖啡")
         ]
-        c.execute('PRAGMA table_info(orders)')
-        cols = [r[1] for r in c.fetchall()]
-        if 'category' in cols:
-            c.executemany('INSERT INTO orders (id,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,origin_lng,origin_lat,dest_lng,dest_lat,fee,distance,category) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)', sample)
-        else:
-            c.executemany('INSERT INTO orders (id,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,origin_lng,origin_lat,dest_lng,dest_lat,fee,distance) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', [s[:-1] for s in sample])
+        c.executemany(ORDER_UPSERT_SQL, [order_params(r) for r in sample])
     conn.commit()
     conn.close()
-    
-    # Ensure generator thread starts if enabled
-    if generator_cfg.get('enabled'):
-        global generator_thread
-        if generator_thread is None or not generator_thread.is_alive():
-            generator_thread = threading.Thread(target=_generator_loop, daemon=True)
-            generator_thread.start()
+
+# --- business timezone ---
+# “今日”、按小时/按日分组统一按 BUSINESS_TZ（IANA 名称，如 Asia/Shanghai）计算，未设置时为进程本地时区。
+# orders.local_date/local_hour 与 tracks.local_date 在写入时存好并建索引，查询不再逐行做时区转换；时区变更后启动时整体重算
+BUSINESS_TZ = os.environ.get('BUSINESS_TZ', '')
+
+def _business_tz():
+    from zoneinfo import ZoneInfo
+    return ZoneInfo(BUSINESS_TZ)
+
+@functools.lru_cache(maxsize=8192)
+def _quarter_bucket(quarter):
+    # 各时区的 UTC 偏移都是 15 分钟的整数倍，同一刻钟内的日期与小时相同
+    if BUSINESS_TZ:
+        import datetime
+        d = datetime.datetime.fromtimestamp(quarter*900, _business_tz())
+        return f'{d.year:04d}-{d.month:02d}-{d.day:02d}', d.hour
+    t = time.localtime(quarter*900)
+    return f'{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}', t.tm_hour
+
+def local_bucket(ts):
+    """返回秒级时间戳在业务时区的 (日期 YYYY-MM-DD, 小时)；时间戳为空或非法时为 (None, None)。"""
+    try:
+        return _quarter_bucket(int(float(ts))//900)
+    except (TypeError, ValueError):
+        return None, None
+
+def local_offset(ts):
+    """业务时区在 ts 时刻相对 UTC 的偏移秒数。"""
+    if BUSINESS_TZ:
+        import datetime
+        return int(datetime.datetime.fromtimestamp(int(ts), _business_tz()).utcoffset().total_seconds())
+    return time.localtime(int(ts)).tm_gmtoff
+
+def local_midnight(date_str):
+    """业务时区某日（YYYY-MM-DD）零点的时间戳。"""
+    import datetime
+    d = datetime.datetime.strptime(date_str, '%Y-%m-%d')
+    if BUSINESS_TZ:
+        return int(d.replace(tzinfo=_business_tz()).timestamp())
+    return int(d.timestamp())
+
+def order_params(row):
+    """ORDER_COLUMNS 顺序的订单行补上 local_date/local_hour 与取餐点所在区域，供 ORDER_UPSERT_SQL 使用。"""
+    return tuple(row) + local_bucket(row[3]) + (zone_of(row[7], row[8]),)
+
+def track_params(row):
+    """(name, phone, start_ts, end_ts, distance, points) 补上 end_ts 所在的 local_date，供 TRACK_INSERT_SQL 使用。"""
+    end_ts = row[3]
+    return tuple(row) + (local_bucket(int(end_ts)//1000)[0] if end_ts is not None else None,)
+
+def backfill_local_buckets(c, schema='main', only_missing=False):
+    """按 BUSINESS_TZ 重算 schema 中 orders/tracks 的本地日期与小时列（不提交）。"""
+    cond = ' WHERE local_date IS NULL' if only_missing else ''
+    c.execute(f'SELECT rowid, created_ts FROM {schema}.orders{cond}')
+    rows = [(*local_bucket(ts), rid) for rid, ts in c.fetchall()]
+    c.executemany(f'UPDATE {schema}.orders SET local_date=?, local_hour=? WHERE rowid=?', rows)
+    c.execute(f'SELECT rowid, end_ts FROM {schema}.tracks{cond}')
+    tracks = [(local_bucket(int(ts)//1000)[0] if ts is not None else None, rid) for rid, ts in c.fetchall()]
+    c.executemany(f'UPDATE {schema}.tracks SET local_date=? WHERE rowid=?', tracks)
+    return len(rows) + len(tracks)
+
+def sync_local_buckets(c):
+    """启动时检查：业务时区与上次回填时不同则重算主库；归档分区补列并回填缺失行。"""
+    c.execute("SELECT value FROM settings WHERE key='business_tz'")
+    row = c.fetchone()
+    if row is not None and row[0] != BUSINESS_TZ:
+        n = backfill_local_buckets(c)
+        c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('business_tz', ?)", (BUSINESS_TZ,))
+        c.connection.commit()
+        logging.info(f'business timezone changed to {BUSINESS_TZ or "local"}, rebucketed {n} rows')
+    for _, _, _, path in list_partitions():
+        c.execute('ATTACH DATABASE ? AS arc', (path,))
+        try:
+            _sync_archive_schema(c, 'arc')
+            c.execute('BEGIN')
+            backfill_local_buckets(c, 'arc', only_missing=row is None or row[0] == BUSINESS_TZ)
+            c.connection.commit()
+        finally:
+            c.execute('DETACH DATABASE arc')
+
+def eta_label(eta_ts):
+    if not eta_ts:
+        return ''
+    t = int(eta_ts) + local_offset(int(eta_ts))
+    return f"{t//3600 % 24:02d}:{t//60 % 60:02d}"
+
+# --- delivery zones ---
+# 配送区域为 GeoJSON FeatureCollection（Polygon / MultiPolygon，properties.name 为显示名）：ZONES_FILE 指定，
+# 否则依次取 zones.geojson、zones.example.geojson。多边形按 zones_cfg['cell'] 度的网格分桶：
+# 完全落在某区域内的网格直接命中，只有边界穿过的网格才做射线法判断；区域重叠时以文件中靠前者为准
+zones_cfg = {'file': os.environ.get('ZONES_FILE', ''), 'cell': 0.005}
+
+def _in_polygon(x, y, rings):
+    """射线法：在外环内且不在任何内环（洞）内。"""
+    for k, ring in enumerate(rings):
+        inside = False
+        x1, y1 = ring[-1]
+        for x2, y2 in ring:
+            if (y2 > y) != (y1 > y) and x < (x1 - x2) * (y - y2) / (y1 - y2) + x2:
+                inside = not inside
+            x1, y1 = x2, y2
+        if inside != (k == 0):
+            return False
+    return True
+
+class ZoneIndex:
+    def __init__(self, features=(), cell=0.005):
+        self.cell = float(cell)
+        self.zones = []
+        for i, f in enumerate(features):
+            geom = f.get('geometry') or {}
+            props = f.get('properties') or {}
+            if geom.get('type') == 'Polygon':
+                polys = [geom['coordinates']]
+            elif geom.get('type') == 'MultiPolygon':
+                polys = geom['coordinates']
+            else:
+                continue
+            polys = [[[(float(p[0]), float(p[1])) for p in ring] for ring in poly if ring] for poly in polys if poly]
+            zid = str(f.get('id') or props.get('id') or props.get('name') or f'zone-{i+1}')
+            self.zones.append((zid, props.get('name') or zid, polys))
+        # 网格 -> [(区域下标, 是否需精确判断)]，按区域顺序排列
+        self.grid = {}
+        for zi, (_, _, polys) in enumerate(self.zones):
+            self._add(zi, polys)
+
+    def _cell(self, x, y):
+        return math.floor(x / self.cell), math.floor(y / self.cell)
+
+    def _contains(self, zi, x, y):
+        return any(_in_polygon(x, y, rings) for rings in self.zones[zi][2])
+
+    def _add(self, zi, polys):
+        pts = [p for rings in polys for ring in rings for p in ring]
+        if not pts:
+            return
+        edge = set()
+        for rings in polys:
+            for ring in rings:
+                for (x1, y1), (x2, y2) in zip(ring, ring[1:] + ring[:1]):
+                    cx1, cy1 = self._cell(min(x1, x2), min(y1, y2))
+                    cx2, cy2 = self._cell(max(x1, x2), max(y1, y2))
+                    edge.update((cx, cy) for cx in range(cx1, cx2 + 1) for cy in range(cy1, cy2 + 1))
+        # 边界不经过的网格整体在区域内或区域外，取中心点判断一次即可
+        cx1, cy1 = self._cell(min(p[0] for p in pts), min(p[1] for p in pts))
+        cx2, cy2 = self._cell(max(p[0] for p in pts), max(p[1] for p in pts))
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                if (cx, cy) in edge:
+                    self.grid.setdefault((cx, cy), []).append((zi, True))
+                elif self._contains(zi, (cx + 0.5) * self.cell, (cy + 0.5) * self.cell):
+                    self.grid.setdefault((cx, cy), []).append((zi, False))
+
+    def lookup(self, lng, lat):
+        """返回坐标所在区域 id，不在任何区域内或坐标无效时为 None。"""
+        try:
+            x, y = float(lng), float(lat)
+            key = self._cell(x, y)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        for zi, exact in self.grid.get(key, ()):
+            if not exact or self._contains(zi, x, y):
+                return self.zones[zi][0]
+        return None
+
+def zones_path():
+    if zones_cfg['file']:
+        return zones_cfg['file']
+    for fn in ('zones.geojson', 'zones.example.geojson'):
+        path = os.path.join(os.path.dirname(__file__), fn)
+        if os.path.exists(path):
+            return path
+    return ''
+
+_zone_index = None
+
+def zone_index():
+    """惰性加载区域索引；文件缺失或无法解析时为空索引（所有点 zone_id 为 NULL）。"""
+    global _zone_index
+    if _zone_index is None:
+        path, features, sig = zones_path(), [], ''
+        if path:
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                features = json.loads(raw.decode('utf-8')).get('features') or []
+                sig = hashlib.sha1(raw + repr(zones_cfg['cell']).encode()).hexdigest()
+            except Exception as e:
+                logging.warning(f'zones file {path} not loaded: {e}')
+        index = ZoneIndex(features, zones_cfg['cell'])
+        index.path, index.signature = path, sig
+        _zone_index = index
+    return _zone_index
+
+def zone_of(lng, lat):
+    return zone_index().lookup(lng, lat)
+
+def point_params(row):
+    """(name, lng, lat, ts) 补上所在区域，供 LIVE_POINT_SQL 使用。"""
+    return tuple(row) + (zone_of(row[1], row[2]),)
+
+def alert_params(row):
+    """(order_id, rider, type, ts, lng, lat, severity) 补上所在区域，供 ALERT_INSERT_SQL 使用。"""
+    return tuple(row) + (zone_of(row[4], row[5]),)
+
+def assign_zones(c, schema='main'):
+    """按当前区域索引重算 schema 中订单（取餐点）、骑手位置与告警的 zone_id（不提交）。"""
+    index = zone_index()
+    n = 0
+    for table, lng, lat in (('orders', 'origin_lng', 'origin_lat'), ('live_points', 'lng', 'lat'), ('alerts', 'lng', 'lat')):
+        try:
+            c.execute(f'SELECT rowid, {lng}, {lat}, zone_id FROM {schema}.{table}')
+        except sqlite3.OperationalError:
+            continue
+        rows = [(z, rid) for rid, x, y, old in c.fetchall() for z in (index.lookup(x, y),) if z != old]
+        c.executemany(f'UPDATE {schema}.{table} SET zone_id=? WHERE rowid=?', rows)
+        n += len(rows)
+    return n
+
+def sync_zones(c):
+    """启动时检查：区域文件（或网格大小）与上次回填时不同则重算主库与各归档分区。"""
+    sig = zone_index().signature
+    c.execute("SELECT value FROM settings WHERE key='zones'")
+    row = c.fetchone()
+    if row is not None and row[0] == sig:
+        return
+    t0 = time.perf_counter()
+    c.execute('BEGIN')
+    n = assign_zones(c)
+    c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('zones', ?)", (sig,))
+    c.connection.commit()
+    for _, _, _, path in list_partitions():
+        c.execute('ATTACH DATABASE ? AS arc', (path,))
+        try:
+            _sync_archive_schema(c, 'arc')
+            c.execute('BEGIN')
+            n += assign_zones(c, 'arc')
+            c.connection.commit()
+        finally:
+            c.execute('DETACH DATABASE arc')
+    logging.info(f'zones {zone_index().path or "(none)"}: {len(zone_index().zones)} zones, reassigned {n} rows in {round((time.perf_counter()-t0)*1000, 1)} ms')
 
 def stable_phone(name: str) -> str:
     base = sum(ord(ch) for ch in (name or '')) % 100000000
     return '139' + f"{base:08d}"
 
+# --- rider session tokens ---
+# 登录/登记时签发 "<base64(姓名)>.<过期时间>.<签名>"，签名为 HMAC-SHA256；上报接口在内存中校验，不再查询或写入 riders 表。
+# 密钥取环境变量 RIDER_TOKEN_SECRET，未设置时首次使用生成并存入 settings，多进程与重启后共用。
+# 上报默认必须带令牌；RIDER_TOKEN_REQUIRED=0 时兼容旧客户端，未带令牌按请求体 name 接受
+token_cfg = {'secret': os.environ.get('RIDER_TOKEN_SECRET', ''), 'ttl': 12*3600, 'required': os.environ.get('RIDER_TOKEN_REQUIRED', '1') != '0'}
+_token_key = []
+
+def token_key():
+    if not _token_key:
+        secret = token_cfg['secret']
+        if not secret:
+            conn = db()
+            try:
+                conn.execute("INSERT OR IGNORE INTO settings (key, value) VALUES ('rider_token_secret', ?)", (os.urandom(32).hex(),))
+                conn.commit()
+                secret = conn.execute("SELECT value FROM settings WHERE key='rider_token_secret'").fetchone()[0]
+            finally:
+                conn.close()
+        _token_key.append(secret.encode('utf-8'))
+    return _token_key[0]
+
+def _token_sig(body):
+    import hmac
+    import base64
+    return base64.urlsafe_b64encode(hmac.new(token_key(), body.encode('ascii'), hashlib.sha256).digest()[:18]).decode('ascii')
+
+def issue_token(name, now=None):
+    import base64
+    exp = int(time.time() if now is None else now) + int(token_cfg['ttl'])
+    body = base64.urlsafe_b64encode(name.encode('utf-8')).decode('ascii').rstrip('=') + '.' + str(exp)
+    return body + '.' + _token_sig(body), exp
+
+def verify_token(token, now=None):
+    """校验签名与有效期，返回骑手姓名；无效或过期返回 None。"""
+    import hmac
+    import base64
+    try:
+        enc, exp, sig = token.split('.')
+        body = enc + '.' + exp
+        if not hmac.compare_digest(sig, _token_sig(body)) or int(exp) < (time.time() if now is None else now):
+            return None
+        return base64.urlsafe_b64decode(enc + '=' * (-len(enc) % 4)).decode('utf-8')
+    except Exception:
+        return None
+
 def db():
-    return sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    return conn
 
 def cors_headers(handler):
     """为所有 API 响应设置基础 CORS 头。"""
     handler.send_header('Access-Control-Allow-Origin', '*')
     handler.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-    handler.send_header('Access-Control-Allow-Headers', 'Content-Type')
+    handler.send_header('Access-Control-Allow-Headers', 'Content-Type, Authorization')
+    handler.send_header('Access-Control-Expose-Headers', 'X-Snapshot-Age')
+
+# --- change log (delta sync) ---
+# 各写路径在同一事务内记录 (实体, 主键) 的变更；同一主键只保留最新一条（INSERT OR REPLACE 取新的 seq），
+# 客户端以 since=<seq> 拉取之后的增删，代价与变更量成正比。早于 changes_floor 的游标需全量重取
+# 定位上报频繁：同一骑手每 point_interval 秒最多记一条变更（间隔后的首个点立即记），增量同步看到的位置最多滞后这么久
+changes_cfg = {'keep_days': 7, 'point_interval': 30}
+_point_logged = {}
+_point_lock = threading.Lock()
+
+def record_changes(c, entity, keys, op='upsert'):
+    now = int(time.time())
+    c.executemany('INSERT OR REPLACE INTO changes (entity, key, op, ts) VALUES (?,?,?,?)', [(entity, str(k), op, now) for k in keys if k])
+
+def point_change_due(name, now=None):
+    """骑手定位是否需要记一条变更：距本进程上次记录已满 point_interval 秒时返回 True 并更新记录时间。"""
+    now = time.time() if now is None else now
+    with _point_lock:
+        if now - _point_logged.get(name, 0) < changes_cfg['point_interval']:
+            return False
+        _point_logged[name] = now
+        return True
+
+def alert_key(order_id, type_):
+    return f'{order_id}|{type_}'
+
+def change_cursor(c):
+    c.execute("SELECT seq FROM sqlite_sequence WHERE name='changes'")
+    row = c.fetchone()
+    return int(row[0]) if row else 0
+
+def _changes_floor(c):
+    c.execute("SELECT value FROM settings WHERE key='changes_floor'")
+    row = c.fetchone()
+    return int(row[0]) if row else 0
+
+def reset_changes(c, min_seq=0):
+    """丢弃变更日志并写入重置标记，此前的游标全部失效；min_seq 让序号从旧库游标之后继续（恢复备份时使用）。"""
+    c.execute('DELETE FROM changes')
+    if min_seq:
+        c.execute("UPDATE sqlite_sequence SET seq=MAX(seq, ?) WHERE name='changes'", (int(min_seq),))
+    record_changes(c, '*', ['reset'], 'reset')
+    c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('changes_floor', ?)", (str(change_cursor(c)),))
+
+def prune_changes(c):
+    """裁剪超过 keep_days 的变更，并把 changes_floor 提到被裁剪的最大序号。"""
+    c.execute('SELECT MAX(seq) FROM changes WHERE ts < ?', (int(time.time()) - changes_cfg['keep_days']*86400,))
+    top = c.fetchone()[0]
+    if top and top > _changes_floor(c):
+        c.execute('DELETE FROM changes WHERE seq <= ?', (top,))
+        c.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('changes_floor', ?)", (str(top),))
+
+def changes_since(entity, since):
+    """返回 (cursor, reset, upserts, deletes)；游标早于 floor 或晚于当前序号（库被恢复）时 reset 为 True。"""
+    conn = db()
+    c = conn.cursor()
+    try:
+        cursor = change_cursor(c)
+        if since < _changes_floor(c) or since > cursor:
+            return cursor, True, [], []
+        c.execute('SELECT key, op FROM changes WHERE entity=? AND seq > ? AND seq <= ? ORDER BY seq', (entity, since, cursor))
+        upserts, deletes = [], []
+        for key, op in c.fetchall():
+            (deletes if op == 'delete' else upserts).append(key)
+        return cursor, False, upserts, deletes
+    finally:
+        conn.close()
 
 # --- generator config & helpers ---
-generator_cfg = {'enabled': True, 'rate': 5, 'hours': 24, 'interval': 1, 'ai': True}
+generator_cfg = {'enabled': True, 'rate': 5, 'hours': 24, 'interval': 1, 'ai': True, 'forecast': False}
 generator_thread = None
 
-def insert_random_orders(count: int, hours: int, specific_riders=None):
+def insert_random_orders(count: int, hours: int, specific_riders=None, cat_weights=None):
     import random
     now = int(time.time())
     default_riders = ['王明','李伟','张强','赵敏','陈刚','刘洋']
     cats = ['快餐','奶茶','咖啡','轻食']
+    weights = [max(0.0, float((cat_weights or {}).get(k, 0))) for k in cats]
     statuses = ['待取餐','配送中','延迟','已送达']
+    model = eta_model(update=False)
     conn = db()
     c = conn.cursor()
     
     # 1. Ensure riders exist
-    for r in default_riders:
-        c.execute('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', (r, stable_phone(r)))
+    c.executemany('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', [(r, stable_phone(r)) for r in default_riders])
+    changed_riders = set(default_riders) if c.rowcount > 0 else set()
 
     if specific_riders:
         riders = specific_riders
     else:
         # Fetch all riders
-        try:
-            c.execute('SELECT name FROM riders')
-            all_riders = [r[0] for r in c.fetchall() if r[0]]
-        except Exception:
-            all_riders = []
-        
+        c.execute('SELECT name FROM riders')
+        all_riders = [r[0] for r in c.fetchall() if r[0]]
         riders = all_riders if all_riders else default_riders
 
-    try:
-        c.execute('PRAGMA table_info(orders)')
-        has_cat = any(r[1]=='category' for r in c.fetchall())
-    except Exception:
-        has_cat = False
-
+    order_rows = []
+    event_rows = []
+    track_rows = []
+    point_rows = []
     for i in range(max(0,int(count))):
         oid = 'OD'+str(now)+str(random.randint(0,9999)).zfill(4)
         rider = random.choice(riders)
@@ -132,64 +675,2374 @@ def insert_random_orders(count: int, hours: int, specific_riders=None):
             if pickup_ts and delivered_ts < pickup_ts:
                 delivered_ts = pickup_ts + 300
 
-        eta_ts = created_ts + random.randint(1800,7200)
-        olng,olat = 116.39+random.random()*0.02,39.90+random.random()*0.02
-        dlng,dlat = 116.40+random.random()*0.02,39.91+random.random()*0.02
-        fee = round(10+random.random()*15,2)
-        distance = round(2+random.random()*6,2)
-        category = random.choice(cats)
-        
-        # Insert Order
-        if has_cat:
-            c.execute('INSERT OR REPLACE INTO orders (id,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,origin_lng,origin_lat,dest_lng,dest_lat,fee,distance,category) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)', (oid,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,olng,olat,dlng,dlat,fee,distance,category))
+        olng,olat = 116.39+random.random()*0.02,39.90+random.random()*0.02
+        dlng,dlat = 116.40+random.random()*0.02,39.91+random.random()*0.02
+        fee = round(10+random.random()*15,2)
+        distance = round(2+random.random()*6,2)
+        category = random.choices(cats, weights)[0] if sum(weights) > 0 else random.choice(cats)
+        eta_ts = promise_eta(model, category, created_ts, olng, olat, dlng, dlat) or created_ts + random.randint(1800,7200)
+        
+        order_rows.append((oid,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,olng,olat,dlng,dlat,fee,distance,category))
+        event_rows.append((oid, created_ts, 'created', '{}'))
+        # 接单/拒单与评价事件：绩效的接单率、好评率由此统计
+        if random.random() < 0.08:
+            event_rows.append((oid, created_ts + 30, 'reject', json.dumps({'rider': random.choice(riders)}, ensure_ascii=False)))
+        event_rows.append((oid, created_ts + 60, 'accept', json.dumps({'rider': rider}, ensure_ascii=False)))
+        if delivered_ts and random.random() < 0.6:
+            event_rows.append((oid, delivered_ts + 600, 'rating', json.dumps({'rider': rider, 'score': random.choice((5, 5, 5, 4, 4, 3, 2, 1))}, ensure_ascii=False)))
+        if pickup_ts:
+            event_rows.append((oid, pickup_ts, 'pickup', '{}'))
+        if delivered_ts:
+            event_rows.append((oid, delivered_ts, 'delivered', '{}'))
+
+        # 2. Generate Track if delivered
+        if status == '已送达' and pickup_ts and delivered_ts:
+            # Simulate a track
+            track_dist = distance * (1.0 + random.random() * 0.3) * 1000 # meters
+            track_rows.append((rider, stable_phone(rider), int(pickup_ts*1000), int(delivered_ts*1000), track_dist, json.dumps([])))
+
+        # 3. Update Live Point (simulate current location)
+        if status in ['配送中', '延迟', '待取餐']:
+            # Random location around center
+            clng = 116.40 + (random.random() - 0.5) * 0.05
+            clat = 39.91 + (random.random() - 0.5) * 0.05
+            point_rows.append((rider, clng, clat, int(now*1000)))
+
+    c.executemany(ORDER_UPSERT_SQL, [order_params(r) for r in order_rows])
+    c.executemany('INSERT INTO order_events (order_id, ts, type, meta) VALUES (?,?,?,?)', event_rows)
+    c.executemany(TRACK_INSERT_SQL, [track_params(r) for r in track_rows])
+    c.executemany(LIVE_POINT_SQL, [point_params(r) for r in point_rows])
+    record_changes(c, 'orders', [r[0] for r in order_rows])
+    record_changes(c, 'riders', changed_riders | {r[0] for r in point_rows})
+    conn.commit()
+    conn.close()
+    order_book.apply(order_rows)
+
+def load_generator_cfg():
+    """从 settings 表读取生成器配置（多进程下由任一进程写入，后台进程读取）。"""
+    conn = db()
+    c = conn.cursor()
+    c.execute("SELECT value FROM settings WHERE key='generator'")
+    row = c.fetchone()
+    conn.close()
+    if row:
+        generator_cfg.update(json.loads(row[0]))
+    return generator_cfg
+
+def save_generator_cfg():
+    conn = db()
+    conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('generator', ?)", (json.dumps(generator_cfg),))
+    conn.commit()
+    conn.close()
+
+def _generator_loop():
+    # 常驻线程：每 5 秒重新读取配置，到达 interval 时生成一批订单
+    last = 0.0
+    while True:
+        try:
+            load_generator_cfg()
+            if generator_cfg['enabled'] and time.time() - last >= max(1, int(generator_cfg.get('interval', 5))) * 60:
+                last = time.time()
+                base = max(0, int(generator_cfg.get('rate', 0)))
+                hours = max(1, int(generator_cfg.get('hours', 1)))
+                use_ai = bool(generator_cfg.get('ai', True))
+                now = time.localtime()
+                mult = 1.0
+                # 可选按拟合的周内画像取当前小时的倍数与品类占比，单量按泊松分布抽取；尚无历史时回落到内置曲线
+                fitted = forecast_multiplier(time.time()) if generator_cfg.get('forecast') else None
+                if fitted:
+                    mult = fitted[0]
+                elif use_ai:
+                    h = now.tm_hour
+                    m = now.tm_min
+                    import math
+                    mult = 0.6 + 0.4*math.sin((m/60.0)*2*math.pi)
+                    if 11 <= h <= 13:
+                        mult *= 2.2
+                    elif 17 <= h <= 20:
+                        mult *= 2.6
+                    elif 0 <= h <= 6:
+                        mult *= 0.3
+                if fitted:
+                    import numpy as np
+                    insert_random_orders(int(np.random.poisson(base * mult)), hours, cat_weights=fitted[1])
+                else:
+                    insert_random_orders(int(round(base * mult)), hours)
+        except Exception:
+            pass
+        time.sleep(5)
+
+# --- online backups ---
+BACKUP_DIR = os.path.join(os.path.dirname(__file__), 'backups')
+# interval 为分钟；pages 为每步复制的页数，step_sleep 为两步之间让出锁的秒数
+backup_cfg = {'enabled': True, 'interval': 60, 'keep_hourly': 24, 'keep_daily': 7, 'compress': False, 'pages': 256, 'step_sleep': 0.01}
+backup_stats = {'last_ts': 0, 'file': '', 'bytes': 0, 'duration_ms': 0, 'restarts': 0, 'count': 0, 'pruned': 0, 'error': ''}
+backup_thread = None
+
+def backup_db(dst=None, compress=None):
+    """使用 SQLite 在线备份 API 分步复制数据库，步与步之间休眠，不阻塞写入。"""
+    import gzip
+    import shutil
+    compress = backup_cfg.get('compress') if compress is None else compress
+    if dst is None:
+        os.makedirs(BACKUP_DIR, exist_ok=True)
+        dst = os.path.join(BACKUP_DIR, f"data-{time.strftime('%Y%m%d-%H%M%S')}.db")
+    t0 = time.perf_counter()
+    tmp = dst + '.part'
+    progress = {'remaining': None, 'restarts': 0}
+    def on_step(status, remaining, total):
+        # 源库被其他连接修改时备份会从头开始；多次重启后不再休眠，尽快完成
+        if progress['remaining'] is not None and remaining > progress['remaining']:
+            progress['restarts'] += 1
+        progress['remaining'] = remaining
+        if progress['restarts'] < 3:
+            time.sleep(float(backup_cfg.get('step_sleep', 0)))
+    src = db()
+    out = sqlite3.connect(tmp)
+    try:
+        src.backup(out, pages=max(1, int(backup_cfg.get('pages', 256))), progress=on_step)
+    finally:
+        out.close()
+        src.close()
+    if compress:
+        final = dst + '.gz'
+        with open(tmp, 'rb') as fi, gzip.open(final, 'wb', compresslevel=6) as fo:
+            shutil.copyfileobj(fi, fo, 1024*1024)
+        os.remove(tmp)
+    else:
+        final = dst
+        os.replace(tmp, final)
+    backup_stats.update({
+        'last_ts': int(time.time()),
+        'file': os.path.basename(final),
+        'bytes': os.path.getsize(final),
+        'duration_ms': round((time.perf_counter()-t0)*1000, 1),
+        'restarts': progress['restarts'],
+        'count': backup_stats['count'] + 1,
+        'error': ''
+    })
+    logging.info(f"backup created: {final} ({backup_stats['bytes']} bytes, {backup_stats['duration_ms']} ms)")
+    return final
+
+def prune_backups():
+    """按保留策略清理备份：最近 keep_hourly 个小时与 keep_daily 天各保留最新的一份。"""
+    import re
+    if not os.path.isdir(BACKUP_DIR):
+        return []
+    files = []
+    for fn in os.listdir(BACKUP_DIR):
+        m = re.match(r'^data-(\d{8})-(\d{6})\.db(\.gz)?$', fn)
+        if m:
+            files.append((m.group(1) + m.group(2), fn))
+    files.sort(reverse=True)
+    hours, days, keep = set(), set(), set()
+    for stamp, fn in files:
+        if stamp[:10] not in hours and len(hours) < int(backup_cfg.get('keep_hourly', 24)):
+            hours.add(stamp[:10])
+            keep.add(fn)
+        if stamp[:8] not in days and len(days) < int(backup_cfg.get('keep_daily', 7)):
+            days.add(stamp[:8])
+            keep.add(fn)
+    removed = []
+    for _, fn in files:
+        if fn not in keep:
+            try:
+                os.remove(os.path.join(BACKUP_DIR, fn))
+                removed.append(fn)
+            except Exception:
+                pass
+    backup_stats['pruned'] += len(removed)
+    return removed
+
+def _open_backup(path):
+    """打开备份文件（.gz 先解压到临时文件），返回 (连接, 临时文件路径)。"""
+    if not path.endswith('.gz'):
+        return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True), None
+    import gzip
+    import shutil
+    import tempfile
+    fd, tmp = tempfile.mkstemp(suffix='.db')
+    with os.fdopen(fd, 'wb') as fo, gzip.open(path, 'rb') as fi:
+        shutil.copyfileobj(fi, fo, 1024*1024)
+    return sqlite3.connect(tmp), tmp
+
+def verify_backup(path):
+    """校验备份：integrity_check 并统计核心表行数。"""
+    conn, tmp = _open_backup(path)
+    try:
+        c = conn.cursor()
+        c.execute('PRAGMA integrity_check')
+        result = c.fetchone()[0]
+        counts = {}
+        for t in ('orders', 'riders', 'tracks', 'alerts'):
+            try:
+                c.execute(f'SELECT COUNT(*) FROM {t}')
+                counts[t] = c.fetchone()[0] or 0
+            except Exception:
+                counts[t] = None
+        return {'ok': result == 'ok', 'integrity': result, 'counts': counts}
+    finally:
+        conn.close()
+        if tmp:
+            os.remove(tmp)
+
+def restore_backup(path):
+    """校验通过后用备份 API 将备份内容写回 DB_PATH（需先停止服务）。"""
+    report = verify_backup(path)
+    if not report['ok']:
+        raise ValueError(f"backup failed integrity check: {report['integrity']}")
+    src, tmp = _open_backup(path)
+    dst = db()
+    try:
+        try:
+            old_cursor = change_cursor(dst.cursor())
+        except sqlite3.Error:
+            old_cursor = 0
+        src.backup(dst)
+        # 恢复后的变更序号接在旧库之后，客户端持有的旧游标全部触发全量重取
+        if _table_columns(dst.cursor(), 'main', 'changes'):
+            reset_changes(dst.cursor(), old_cursor)
+            dst.commit()
+    finally:
+        dst.close()
+        src.close()
+        if tmp:
+            os.remove(tmp)
+    return report
+
+def _backup_loop():
+    while backup_cfg['enabled']:
+        try:
+            backup_db()
+            prune_backups()
+        except Exception as e:
+            backup_stats['error'] = str(e)
+            try:
+                logging.warning(f'backup failed: {e}')
+            except Exception:
+                pass
+        time.sleep(max(1, int(backup_cfg.get('interval', 60))) * 60)
+
+# --- time partitions (cold archive) ---
+# 早于 days 天的订单、订单事件与轨迹按月（业务时区 BUSINESS_TZ，订单以 created_ts、轨迹以 end_ts 为准）
+# 移入 archive/orders-YYYYMM.db；区间查询只挂载与 [start, end] 重叠的分区
+ARCHIVE_DIR = os.path.join(os.path.dirname(__file__), 'archive')
+ARCHIVE_TABLES = ('orders', 'order_events', 'tracks')
+archive_cfg = {'enabled': True, 'days': 90, 'interval': 360, 'mmap': 64*1024*1024}
+archive_stats = {'last_ts': 0, 'orders': 0, 'events': 0, 'tracks': 0, 'duration_ms': 0, 'error': ''}
+archive_thread = None
+
+def _month_start(year, month):
+    """业务时区某月 1 日零点的时间戳，与 local_date 的日期划分一致。"""
+    if month > 12:
+        year, month = year + 1, 1
+    return local_midnight(f'{year:04d}-{month:02d}-01')
+
+def list_partitions():
+    """返回归档分区 [(YYYYMM, 起始秒, 结束秒, 路径)]，按月份升序。"""
+    import re
+    if not os.path.isdir(ARCHIVE_DIR):
+        return []
+    parts = []
+    for fn in sorted(os.listdir(ARCHIVE_DIR)):
+        m = re.match(r'^orders-(\d{4})(\d{2})\.db$', fn)
+        if m:
+            y, mo = int(m.group(1)), int(m.group(2))
+            parts.append((m.group(1) + m.group(2), _month_start(y, mo), _month_start(y, mo + 1), os.path.join(ARCHIVE_DIR, fn)))
+    return parts
+
+def partition_paths(start, end):
+    """返回与秒级区间 [start, end] 重叠的归档分区文件路径。"""
+    return [p[3] for p in list_partitions() if p[1] <= int(end) and p[2] > int(start)]
+
+def _table_columns(c, schema, table):
+    c.execute(f'PRAGMA {schema}.table_info({table})')
+    return [r[1] for r in c.fetchall()]
+
+def _sync_archive_schema(c, schema):
+    """在归档库中建表，并补齐主库后续迁移新增的列。"""
+    for t in ARCHIVE_TABLES:
+        c.execute('SELECT sql FROM main.sqlite_master WHERE type=? AND name=?', ('table', t))
+        ddl = c.fetchone()[0]
+        c.execute(ddl.replace(f'CREATE TABLE {t}', f'CREATE TABLE IF NOT EXISTS {schema}.{t}', 1))
+        have = set(_table_columns(c, schema, t))
+        c.execute(f'PRAGMA main.table_info({t})')
+        for _, name, type_, *_ in c.fetchall():
+            if name not in have:
+                c.execute(f'ALTER TABLE {schema}.{t} ADD COLUMN {name} {type_}')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_orders_created_ts ON orders(created_ts)')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_orders_rider ON orders(rider)')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_order_events_order_ts ON order_events(order_id, ts)')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_tracks_end_ts ON tracks(end_ts)')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_orders_local_date ON orders(local_date, local_hour)')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_tracks_local_date ON tracks(local_date, name)')
+    c.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_orders_zone ON orders(zone_id, created_ts)')
+
+def archive_old_data(days=None):
+    """将早于 days 天的数据按月滚动到归档文件，每个月一个事务。"""
+    days = int(archive_cfg['days'] if days is None else days)
+    t0 = time.perf_counter()
+    cutoff = int(time.time()) - days*86400
+    # 漏斗与绩效投影只读主库的 order_events：先消费完，只搬移两者都已处理的事件；期间新到的事件留在主库，区间视图中仍只出现一次
+    project_events()
+    materialize_performance()
+    conn = db()
+    c = conn.cursor()
+    c.execute("SELECT MIN(last_id) FROM projection_state WHERE name IN ('lifecycle', 'performance_events')")
+    consumed = c.fetchone()[0] or 0
+    c.execute('SELECT MIN(created_ts) FROM orders')
+    first_order = c.fetchone()[0]
+    c.execute('SELECT MIN(end_ts) FROM tracks')
+    first_track = c.fetchone()[0]
+    firsts = [int(first_order)] if first_order is not None else []
+    if first_track is not None:
+        firsts.append(int(first_track)//1000)
+    moved = {'orders': 0, 'events': 0, 'tracks': 0}
+    if firsts and min(firsts) < cutoff:
+        os.makedirs(ARCHIVE_DIR, exist_ok=True)
+        y, mo = map(int, local_bucket(min(firsts))[0].split('-')[:2])
+        while True:
+            lo, hi = _month_start(y, mo), min(_month_start(y, mo + 1), cutoff)
+            if lo >= cutoff:
+                break
+            c.execute('SELECT EXISTS(SELECT 1 FROM orders WHERE created_ts >= ? AND created_ts < ?) OR EXISTS(SELECT 1 FROM tracks WHERE end_ts >= ? AND end_ts < ?)', (lo, hi, lo*1000, hi*1000))
+            if c.fetchone()[0]:
+                c.execute('ATTACH DATABASE ? AS arc', (os.path.join(ARCHIVE_DIR, f'orders-{y:04d}{mo:02d}.db'),))
+                try:
+                    _sync_archive_schema(c, 'arc')
+                    c.execute('BEGIN')
+                    for t in ARCHIVE_TABLES:
+                        cols = ','.join(_table_columns(c, 'main', t))
+                        if t == 'orders':
+                            c.execute(f'INSERT OR REPLACE INTO arc.orders ({cols}) SELECT {cols} FROM main.orders WHERE created_ts >= ? AND created_ts < ?', (lo, hi))
+                            moved['orders'] += c.rowcount
+                        elif t == 'order_events':
+                            c.execute(f'INSERT OR REPLACE INTO arc.order_events ({cols}) SELECT {cols} FROM main.order_events WHERE id <= ? AND order_id IN (SELECT id FROM main.orders WHERE created_ts >= ? AND created_ts < ?)', (consumed, lo, hi))
+                            moved['events'] += c.rowcount
+                        else:
+                            c.execute(f'INSERT OR REPLACE INTO arc.tracks ({cols}) SELECT {cols} FROM main.tracks WHERE end_ts >= ? AND end_ts < ?', (lo*1000, hi*1000))
+                            moved['tracks'] += c.rowcount
+                    c.execute('DELETE FROM main.order_events WHERE id <= ? AND order_id IN (SELECT id FROM main.orders WHERE created_ts >= ? AND created_ts < ?)', (consumed, lo, hi))
+                    c.execute("INSERT OR REPLACE INTO main.changes (entity, key, op, ts) SELECT 'orders', id, 'delete', ? FROM main.orders WHERE created_ts >= ? AND created_ts < ?", (int(time.time()), lo, hi))
+                    c.execute('DELETE FROM main.orders WHERE created_ts >= ? AND created_ts < ?', (lo, hi))
+                    c.execute('DELETE FROM main.tracks WHERE end_ts >= ? AND end_ts < ?', (lo*1000, hi*1000))
+                    # 与搬移同一事务递增归档序号：快照记录自身内容对应的序号，不一致的快照不再与分区合并查询
+                    c.execute("INSERT INTO main.settings (key, value) VALUES ('archive_seq', '1') ON CONFLICT(key) DO UPDATE SET value = CAST(value AS INTEGER) + 1")
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                finally:
+                    c.execute('DETACH DATABASE arc')
+            y, mo = (y + 1, 1) if mo == 12 else (y, mo + 1)
+    conn.close()
+    archive_stats.update({'last_ts': int(time.time()), 'duration_ms': round((time.perf_counter()-t0)*1000, 1), 'error': '', **moved})
+    if any(moved.values()):
+        logging.info(f'archived {moved} older than {days} days')
+        request_maintenance('analyze', 'archive')
+    return moved
+
+def archive_seq(conn):
+    """返回 conn 主库中的归档序号（每搬移一个月加一）。"""
+    row = conn.execute("SELECT value FROM settings WHERE key='archive_seq'").fetchone()
+    return int(row[0]) if row else 0
+
+def range_db(start, end, base=None):
+    """打开区间查询连接：TEMP 视图 v_orders / v_order_events / v_tracks 合并热库与重叠的归档分区（只读、mmap）。
+    base 为只读快照文件时主库也以只读方式打开。分区数超过可挂载上限（SQLITE_LIMIT_ATTACHED）时，
+    最近的分区直接挂载，更早的逐个挂载后复制进 TEMP 表 o_* 再卸载，视图照常合并。"""
+    import pathlib
+    if base:
+        conn = sqlite3.connect(pathlib.Path(base).absolute().as_uri() + '?mode=ro', uri=True)
+    else:
+        conn = sqlite3.connect(pathlib.Path(DB_PATH).absolute().as_uri(), uri=True)
+    conn.execute('PRAGMA synchronous=NORMAL')
+    c = conn.cursor()
+    parts = [p for p in list_partitions() if p[1] <= int(end) and p[2] > int(start)]
+    try:
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+    except Exception:
+        limit = 10
+    # 留一个挂载位给溢出分区的逐个复制
+    overflow, parts = (parts[:len(parts) - limit + 1], parts[len(parts) - limit + 1:]) if len(parts) > limit else ([], parts)
+    cols = {t: _table_columns(c, 'main', t) for t in ARCHIVE_TABLES}
+    def select(s, t, name):
+        have = set(cols[t]) if s in ('main', 'temp') else set(_table_columns(c, s, t))
+        return 'SELECT ' + ','.join(col if col in have else f'NULL AS {col}' for col in cols[t]) + f' FROM {s}.{name}'
+    sources = [('main', '')]
+    for i, (_, _, _, path) in enumerate(parts):
+        c.execute(f'ATTACH DATABASE ? AS p{i}', (pathlib.Path(path).absolute().as_uri() + '?mode=ro',))
+        c.execute(f"PRAGMA p{i}.mmap_size={int(archive_cfg['mmap'])}")
+        sources.append((f'p{i}', ''))
+    if overflow:
+        for t in ARCHIVE_TABLES:
+            c.execute(f'CREATE TEMP TABLE o_{t} AS SELECT * FROM main.{t} WHERE 0')
+        for _, _, _, path in overflow:
+            c.execute('ATTACH DATABASE ? AS ovf', (pathlib.Path(path).absolute().as_uri() + '?mode=ro',))
+            try:
+                for t in ARCHIVE_TABLES:
+                    c.execute(f'INSERT INTO temp.o_{t} ' + select('ovf', t, t))
+            finally:
+                conn.commit()
+                c.execute('DETACH DATABASE ovf')
+        c.execute('CREATE INDEX temp.idx_o_orders_created_ts ON o_orders(created_ts)')
+        c.execute('CREATE INDEX temp.idx_o_order_events_order_ts ON o_order_events(order_id, ts)')
+        c.execute('CREATE INDEX temp.idx_o_tracks_end_ts ON o_tracks(end_ts)')
+        sources.append(('temp', 'o_'))
+    for t in ARCHIVE_TABLES:
+        c.execute(f'CREATE TEMP VIEW v_{t} AS ' + ' UNION ALL '.join(select(s, t, prefix + t) for s, prefix in sources))
+    return conn
+
+def _archive_loop():
+    while archive_cfg['enabled']:
+        try:
+            moved = archive_old_data()
+            # 旧快照的主库仍含刚搬走的数据，立即重建，期间长区间分析回落主库
+            if any(moved.values()) and snapshot_cfg.get('enabled'):
+                refresh_snapshot()
+        except Exception as e:
+            archive_stats['error'] = str(e)
+            try:
+                logging.warning(f'archive failed: {e}')
+            except Exception:
+                pass
+        time.sleep(max(1, int(archive_cfg.get('interval', 360))) * 60)
+
+# --- analytics snapshot ---
+# 长区间分析查询读取主库的只读副本，不与实时写入争用。0 号进程每 interval 秒用备份 API 刷新 A/B 两个文件中
+# 非当前的一个，完成后在 settings 表切换指针；跨度不小于 min_span_days 天的查询走当前快照，超过 max_age 秒视为失效回落主库
+SNAPSHOT_DIR = os.path.join(os.path.dirname(__file__), 'snapshot')
+SNAPSHOT_FILES = ('snapshot-a.db', 'snapshot-b.db')
+snapshot_cfg = {'enabled': True, 'interval': 300, 'min_span_days': 14, 'max_age': 1800}
+snapshot_stats = {'last_ts': 0, 'file': '', 'bytes': 0, 'duration_ms': 0, 'count': 0, 'served': 0, 'error': ''}
+snapshot_thread = None
+_snapshot_lock = threading.Lock()
+
+def current_snapshot():
+    """返回当前快照 {'file', 'ts'}；未生成或文件缺失时返回 None。"""
+    try:
+        conn = db()
+        try:
+            row = conn.execute("SELECT value FROM settings WHERE key='snapshot'").fetchone()
+        finally:
+            conn.close()
+        snap = json.loads(row[0]) if row else None
+    except Exception:
+        return None
+    if not snap or not os.path.exists(os.path.join(SNAPSHOT_DIR, snap.get('file') or '')):
+        return None
+    return snap
+
+def refresh_snapshot():
+    """把主库分步复制到非当前的快照文件，改为非 WAL 模式以便只读打开，再切换指针。"""
+    with _snapshot_lock:
+        return _refresh_snapshot()
+
+def _refresh_snapshot():
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    cur = current_snapshot()
+    name = SNAPSHOT_FILES[1] if cur and cur['file'] == SNAPSHOT_FILES[0] else SNAPSHOT_FILES[0]
+    path = os.path.join(SNAPSHOT_DIR, name)
+    t0 = time.perf_counter()
+    ts = int(time.time())
+    def on_step(status, remaining, total):
+        time.sleep(float(backup_cfg.get('step_sleep', 0)))
+    src = db()
+    out = sqlite3.connect(path, timeout=30)
+    try:
+        src.backup(out, pages=max(1, int(backup_cfg.get('pages', 256))), progress=on_step)
+        out.execute('PRAGMA journal_mode=DELETE')
+        # 归档序号从副本本身读取，与其内容一致（复制期间发生的归档不会被错记）
+        seq = archive_seq(out)
+    finally:
+        out.close()
+        src.close()
+    conn = db()
+    conn.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('snapshot', ?)", (json.dumps({'file': name, 'ts': ts, 'archive_seq': seq}),))
+    conn.commit()
+    conn.close()
+    snapshot_stats.update({
+        'last_ts': ts,
+        'file': name,
+        'bytes': os.path.getsize(path),
+        'duration_ms': round((time.perf_counter()-t0)*1000, 1),
+        'count': snapshot_stats['count'] + 1,
+        'error': ''
+    })
+    return path
+
+def analytics_db(start, end):
+    """区间分析连接：跨度达到 min_span_days 且快照未过期时打开快照，返回 (连接, 快照年龄秒)；走主库时年龄为 None。
+    快照之后又有数据归档时（归档序号不同），快照主库与分区会重复计数，此时也回落主库。"""
+    if snapshot_cfg.get('enabled') and int(end) - int(start) >= float(snapshot_cfg['min_span_days'])*86400:
+        snap = current_snapshot()
+        age = int(time.time()) - int(snap['ts']) if snap else None
+        if age is not None and snap.get('archive_seq') != _primary_archive_seq():
+            age = None
+        if age is not None and age <= int(snapshot_cfg['max_age']):
+            try:
+                conn = range_db(start, end, base=os.path.join(SNAPSHOT_DIR, snap['file']))
+                snapshot_stats['served'] += 1
+                return conn, max(0, age)
+            except sqlite3.Error as e:
+                logging.warning(f'snapshot unavailable, using primary: {e}')
+    return range_db(start, end), None
+
+def _primary_archive_seq():
+    conn = db()
+    try:
+        return archive_seq(conn)
+    finally:
+        conn.close()
+
+def snapshot_headers(age):
+    return {'X-Snapshot-Age': str(int(age))} if age is not None else None
+
+def _snapshot_loop():
+    while snapshot_cfg['enabled']:
+        try:
+            refresh_snapshot()
+        except Exception as e:
+            snapshot_stats['error'] = str(e)
+            try:
+                logging.warning(f'snapshot refresh failed: {e}')
+            except Exception:
+                pass
+        time.sleep(max(10, int(snapshot_cfg.get('interval', 300))))
+
+# --- database maintenance ---
+# 0 号进程每 interval 秒检查一次：统计信息过期（定时或批量写入后）时以 analysis_limit 采样 ANALYZE，
+# WAL 超过 wal_limit 字节时先 PASSIVE 检查点、追平后再 TRUNCATE 截断；quiet_hours（业务时区）内按小步 incremental_vacuum 归还空闲页
+maintenance_cfg = {'enabled': True, 'interval': 30, 'analyze_interval': 6*3600, 'analysis_limit': 1000,
+                   'wal_limit': 64*1024*1024, 'busy_ms': 200, 'quiet_hours': (2, 6), 'vacuum_pages': 256, 'vacuum_sleep': 0.05,
+                   'vacuum_budget': 10.0, 'vacuum_min_pages': 1024}
+maintenance_stats = {
+    'analyze': {'last_ts': 0, 'duration_ms': 0, 'count': 0, 'reason': ''},
+    'checkpoint': {'last_ts': 0, 'duration_ms': 0, 'count': 0, 'mode': '', 'wal_before': 0, 'wal_after': 0, 'frames': 0, 'busy': 0},
+    'vacuum': {'last_ts': 0, 'duration_ms': 0, 'count': 0, 'pages': 0, 'freelist': 0, 'auto_vacuum': 0},
+    'error': '',
+}
+maintenance_thread = None
+_maintenance_pending = set()
+_maintenance_wake = threading.Event()
+
+def request_maintenance(task, reason=''):
+    """批量写入结束后调用，下一轮立即执行对应任务（目前为 'analyze'）。"""
+    _maintenance_pending.add((task, reason))
+    _maintenance_wake.set()
+
+def run_analyze(conn, reason='scheduled'):
+    t0 = time.perf_counter()
+    # analysis_limit 让 ANALYZE 每个索引只采样有限行，大表上也是毫秒级；3.46 起 optimize 可自行判断哪些表需要重新统计
+    conn.execute(f"PRAGMA analysis_limit={int(maintenance_cfg['analysis_limit'])}")
+    if sqlite3.sqlite_version_info >= (3, 46, 0) and reason == 'scheduled':
+        conn.execute('PRAGMA optimize=0x10002')
+    else:
+        conn.execute('ANALYZE')
+    conn.commit()
+    st = maintenance_stats['analyze']
+    st.update(last_ts=int(time.time()), duration_ms=round((time.perf_counter()-t0)*1000, 1), count=st['count']+1, reason=reason)
+    return st
+
+def wal_size():
+    try:
+        return os.path.getsize(DB_PATH + '-wal')
+    except OSError:
+        return 0
+
+def run_checkpoint(conn, force=False):
+    """WAL 超限时检查点；PASSIVE 不等待读者，全部帧写回后再以短超时尝试 TRUNCATE 将文件截断为 0。"""
+    before = wal_size()
+    if not force and before <= maintenance_cfg['wal_limit']:
+        return None
+    t0 = time.perf_counter()
+    busy, frames, done = conn.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+    mode = 'PASSIVE'
+    if not busy and frames >= 0 and done == frames:
+        conn.execute(f"PRAGMA busy_timeout={int(maintenance_cfg['busy_ms'])}")
+        busy = conn.execute('PRAGMA wal_checkpoint(TRUNCATE)').fetchone()[0]
+        mode = 'TRUNCATE' if not busy else 'PASSIVE'
+    st = maintenance_stats['checkpoint']
+    st.update(last_ts=int(time.time()), duration_ms=round((time.perf_counter()-t0)*1000, 1), count=st['count']+1, mode=mode,
+              wal_before=before, wal_after=wal_size(), frames=max(0, done), busy=busy)
+    return st
+
+def in_quiet_hours(now=None):
+    lo, hi = maintenance_cfg['quiet_hours']
+    hour = local_bucket(int(time.time()) if now is None else now)[1]
+    if hour is None:
+        return False
+    return lo <= hour < hi if lo <= hi else (hour >= lo or hour < hi)
+
+def run_incremental_vacuum(conn, budget=None):
+    """按 vacuum_pages 小步归还空闲页，步间休眠让出写锁，总时长不超过 budget 秒；返回本次归还的页数。
+    库未启用 auto_vacuum=INCREMENTAL 时不做任何事（在线整体 VACUUM 会长时间独占写锁，转换见 convert_auto_vacuum）。"""
+    t0 = time.perf_counter()
+    budget = maintenance_cfg['vacuum_budget'] if budget is None else budget
+    mode = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+    free0 = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    maintenance_stats['vacuum'].update(auto_vacuum=mode, freelist=free0)
+    if mode != 2 or free0 < maintenance_cfg['vacuum_min_pages']:
+        return 0
+    step = max(1, int(maintenance_cfg['vacuum_pages']))
+    while time.perf_counter() - t0 < budget:
+        # execute() 只单步执行一次该 PRAGMA（每次只归还一页），executescript 会执行到底
+        conn.executescript(f'PRAGMA incremental_vacuum({step});')
+        if conn.execute('PRAGMA freelist_count').fetchone()[0] == 0:
+            break
+        time.sleep(maintenance_cfg['vacuum_sleep'])
+    free1 = conn.execute('PRAGMA freelist_count').fetchone()[0]
+    st = maintenance_stats['vacuum']
+    st.update(last_ts=int(time.time()), duration_ms=round((time.perf_counter()-t0)*1000, 1), count=st['count']+1,
+              pages=free0 - free1, freelist=free1, auto_vacuum=conn.execute('PRAGMA auto_vacuum').fetchone()[0])
+    return free0 - free1
+
+def convert_auto_vacuum():
+    """离线把旧库转换为 auto_vacuum=INCREMENTAL：整体 VACUUM 重写文件（需先停止服务）。返回转换前后的模式。"""
+    t0 = time.perf_counter()
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    try:
+        before = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+        if before != 2:
+            conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            conn.execute('VACUUM')
+        after = conn.execute('PRAGMA auto_vacuum').fetchone()[0]
+    finally:
+        conn.close()
+    logging.info(f'auto_vacuum {before} -> {after} in {round(time.perf_counter()-t0, 1)} s')
+    return {'before': before, 'after': after, 'duration_ms': round((time.perf_counter()-t0)*1000, 1)}
+
+def maintenance_tick(now=None):
+    now = int(time.time()) if now is None else now
+    conn = db()
+    try:
+        pending = list(_maintenance_pending)
+        _maintenance_pending.difference_update(pending)
+        stale = now - maintenance_stats['analyze']['last_ts'] >= maintenance_cfg['analyze_interval']
+        if pending or stale:
+            if not conn.execute("SELECT 1 FROM sqlite_master WHERE name='sqlite_stat1'").fetchone():
+                reason = 'initial'
+            else:
+                reason = ','.join(sorted({r or t for t, r in pending})) or 'scheduled'
+            run_analyze(conn, reason)
+        run_checkpoint(conn)
+        if in_quiet_hours(now):
+            run_incremental_vacuum(conn)
+    finally:
+        conn.close()
+
+def _maintenance_loop():
+    while maintenance_cfg['enabled']:
+        try:
+            maintenance_tick()
+            maintenance_stats['error'] = ''
+        except Exception as e:
+            maintenance_stats['error'] = str(e)
+            try:
+                logging.warning(f'maintenance failed: {e}')
+            except Exception:
+                pass
+        _maintenance_wake.wait(max(1, int(maintenance_cfg['interval'])))
+        _maintenance_wake.clear()
+
+# --- order lifecycle projections ---
+# 增量消费 order_events（记录已处理的最大 id），维护每单各环节时间戳，
+# 并按下单小时与品类累计漏斗计数和环节耗时直方图；读取漏斗只需按小时求和
+LIFECYCLE_EVENTS = {'created': 'created_ts', 'pickup': 'pickup_ts', 'delivered': 'delivered_ts'}
+# (环节, 起点, 终点)；起点 base_ts 为订单 created_ts，缺失时取首个事件时间
+STAGES = (('prep', 'base_ts', 'pickup_ts'), ('delivery', 'pickup_ts', 'delivered_ts'), ('total', 'base_ts', 'delivered_ts'))
+STAGE_BINS = (0, 5, 10, 15, 20, 30, 45, 60, 90, 120)
+STAGE_FIELDS = ('hour_ts', 'category', 'base_ts', 'created_ts', 'pickup_ts', 'delivered_ts')
+
+def lifecycle_event_rows(c, rows):
+    """为即将写入的订单行（ORDER_COLUMNS 顺序）生成 created/pickup/delivered 事件：库中原为空、本次有值的时间戳各一条。
+    须在同一事务内、写入订单之前调用。"""
+    cols = [ORDER_COLUMNS.index(col) for col in LIFECYCLE_EVENTS.values()]
+    ids = list({r[0] for r in rows if r[0]})
+    old = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i+500]
+        c.execute(f'SELECT id, {",".join(LIFECYCLE_EVENTS.values())} FROM orders WHERE id IN ({",".join("?"*len(chunk))})', chunk)
+        old.update((r[0], r[1:]) for r in c.fetchall())
+    events = []
+    for r in rows:
+        before = old.get(r[0], (None,)*len(cols))
+        for type_, j, prev in zip(LIFECYCLE_EVENTS, cols, before):
+            try:
+                ts = int(float(r[j]))
+            except (TypeError, ValueError):
+                continue
+            if prev is None and ts > 0:
+                events.append((r[0], ts, type_, '{}'))
+        old[r[0]] = tuple(r[j] for j in cols)
+    return events
+
+def _stage_bin(seconds):
+    import bisect
+    return max(0, bisect.bisect_right(STAGE_BINS, max(0, seconds)/60.0) - 1)
+
+def _stage_deltas(st, before, sign, funnel, hist):
+    """比较单个订单投影的新旧状态，累加漏斗与直方图增量（sign=-1 用于撤销）。"""
+    key = (st['hour_ts'], st['category'] or '未分类')
+    f = funnel.setdefault(key, [0, 0, 0])
+    for i, col in enumerate(('created_ts', 'pickup_ts', 'delivered_ts')):
+        if st[col] is not None and before.get(col) is None:
+            f[i] += sign
+    for stage, a, b in STAGES:
+        if st[a] is not None and st[b] is not None and (before.get(a) is None or before.get(b) is None):
+            k = key + (stage, _stage_bin(st[b] - st[a]))
+            hist[k] = hist.get(k, 0) + sign
+
+def _apply_projection(c, funnel, hist):
+    c.executemany('INSERT INTO funnel_hourly (hour_ts, category, created, picked, delivered) VALUES (?,?,?,?,?) '
+                  'ON CONFLICT(hour_ts, category) DO UPDATE SET created=created+excluded.created, picked=picked+excluded.picked, delivered=delivered+excluded.delivered',
+                  [k + tuple(v) for k, v in funnel.items() if any(v)])
+    c.executemany('INSERT INTO stage_hist_hourly (hour_ts, category, stage, bin, count) VALUES (?,?,?,?,?) '
+                  'ON CONFLICT(hour_ts, category, stage, bin) DO UPDATE SET count=count+excluded.count',
+                  [k + (v,) for k, v in hist.items() if v])
+
+def project_events(batch=5000):
+    """将新增的订单事件折叠进投影；每批一个 IMMEDIATE 事务，多进程并发调用也不会重复计数。"""
+    conn = db()
+    c = conn.cursor()
+    processed = 0
+    try:
+        # 无新事件时不申请写锁
+        c.execute("SELECT (SELECT MAX(id) FROM order_events) > COALESCE((SELECT last_id FROM projection_state WHERE name='lifecycle'), 0)")
+        if not c.fetchone()[0]:
+            return 0
+        while True:
+            c.execute('BEGIN IMMEDIATE')
+            c.execute("SELECT last_id FROM projection_state WHERE name='lifecycle'")
+            row = c.fetchone()
+            last = row[0] if row else 0
+            c.execute('SELECT id, order_id, ts, type FROM order_events WHERE id > ? ORDER BY id LIMIT ?', (last, batch))
+            events = c.fetchall()
+            if not events:
+                conn.rollback()
+                break
+            ids = list({e[1] for e in events if e[3] in LIFECYCLE_EVENTS and e[1]})
+            stages = {}
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                marks = ','.join('?'*len(chunk))
+                c.execute(f'SELECT order_id, {",".join(STAGE_FIELDS)} FROM order_stages WHERE order_id IN ({marks})', chunk)
+                for r in c.fetchall():
+                    stages[r[0]] = dict(zip(STAGE_FIELDS, r[1:]))
+                c.execute(f'SELECT id, created_ts, category FROM orders WHERE id IN ({marks})', chunk)
+                orders = {r[0]: r[1:] for r in c.fetchall()}
+                for oid in chunk:
+                    if oid not in stages and oid in orders and orders[oid][0] is not None:
+                        base = int(orders[oid][0])
+                        stages[oid] = {'hour_ts': base//3600*3600, 'category': orders[oid][1], 'base_ts': base, 'created_ts': None, 'pickup_ts': None, 'delivered_ts': None}
+            funnel, hist, touched = {}, {}, set()
+            for _, oid, ts, type_ in events:
+                col = LIFECYCLE_EVENTS.get(type_)
+                if not (col and oid and ts):
+                    continue
+                ts = int(ts)
+                if ts > 100000000000:
+                    ts //= 1000
+                st = stages.get(oid)
+                if st is None:
+                    st = stages[oid] = {'hour_ts': ts//3600*3600, 'category': None, 'base_ts': ts, 'created_ts': None, 'pickup_ts': None, 'delivered_ts': None}
+                if st[col] is not None:
+                    continue
+                before = dict(st)
+                st[col] = ts
+                _stage_deltas(st, before, 1, funnel, hist)
+                touched.add(oid)
+            c.executemany(f'INSERT OR REPLACE INTO order_stages (order_id, {",".join(STAGE_FIELDS)}) VALUES (?,?,?,?,?,?,?)',
+                          [(oid,) + tuple(stages[oid][f] for f in STAGE_FIELDS) for oid in touched])
+            _apply_projection(c, funnel, hist)
+            c.execute("INSERT OR REPLACE INTO projection_state (name, last_id) VALUES ('lifecycle', ?)", (events[-1][0],))
+            conn.commit()
+            processed += len(events)
+    finally:
+        conn.close()
+    return processed
+
+def retract_orders(c, where, params=()):
+    """删除订单前撤销其在漏斗与直方图中的贡献；where 作用于 orders 表。"""
+    c.execute(f'SELECT order_id, {",".join(STAGE_FIELDS)} FROM order_stages WHERE order_id IN (SELECT id FROM orders WHERE {where})', params)
+    funnel, hist, ids = {}, {}, []
+    for r in c.fetchall():
+        _stage_deltas(dict(zip(STAGE_FIELDS, r[1:])), {}, -1, funnel, hist)
+        ids.append((r[0],))
+    _apply_projection(c, funnel, hist)
+    c.executemany('DELETE FROM order_stages WHERE order_id=?', ids)
+
+def reset_projections(c):
+    for t in ('order_stages', 'funnel_hourly', 'stage_hist_hourly', 'projection_state', 'performance_daily', 'performance_orders'):
+        c.execute(f'DELETE FROM {t}')
+
+def lifecycle_summary(start, end, category=None):
+    """按下单时间区间汇总漏斗与各环节耗时分布（分钟）；只读投影表，由 _projection_loop 维护。"""
+    lo, hi = int(start)//3600*3600, int(end)
+    cond, params = 'hour_ts BETWEEN ? AND ?', [lo, hi]
+    if category:
+        cond += ' AND category=?'
+        params.append(category)
+    conn = db()
+    c = conn.cursor()
+    c.execute(f'SELECT COALESCE(SUM(created),0), COALESCE(SUM(picked),0), COALESCE(SUM(delivered),0) FROM funnel_hourly WHERE {cond}', params)
+    created, picked, delivered = c.fetchone()
+    c.execute(f'SELECT stage, bin, SUM(count) FROM stage_hist_hourly WHERE {cond} GROUP BY stage, bin', params)
+    series = {stage: [0]*len(STAGE_BINS) for stage, _, _ in STAGES}
+    for stage, b, n in c.fetchall():
+        if stage in series and 0 <= b < len(STAGE_BINS):
+            series[stage][b] = int(n or 0)
+    conn.close()
+    labels = [f'{STAGE_BINS[i]}-{STAGE_BINS[i+1]}' for i in range(len(STAGE_BINS)-1)] + [f'{STAGE_BINS[-1]}+']
+    p50 = {}
+    for stage, counts in series.items():
+        total, acc, p50[stage] = sum(counts), 0, None
+        for i, n in enumerate(counts):
+            acc += n
+            if total and acc*2 >= total:
+                p50[stage] = STAGE_BINS[i]
+                break
+    funnel = [{'name': '下单', 'value': int(created)}, {'name': '取餐', 'value': int(picked)}, {'name': '送达', 'value': int(delivered)}]
+    return funnel, {'labels': labels, 'series': series, 'p50': p50}
+
+# --- demand forecast ---
+# 按品类 × 周内小时（业务时区，周一 0 点为 0）拟合季节性画像：以 funnel_hourly 的逐小时下单数为样本，
+# 权重按样本距今的时长指数衰减（half_life_weeks），模型只保存加权的零/一/二阶矩，预测值为加权均值、区间取 ±1.28 倍加权标准差。
+# 早于 settle_hours 的小时视为已结算（生成器与导入会回填过去的订单）：新结算的小时先整体衰减再折叠进矩，无需重读历史；
+# 每 refit 秒整体重拟合一次，吸收删除、归档后投影重建等对历史的修改
+forecast_cfg = {'half_life_weeks': 4.0, 'settle_hours': 48, 'refit': 6*3600, 'max_hours': 72}
+forecast_stats = {'fits': 0, 'updates': 0, 'fit_ms': 0.0, 'update_ms': 0.0, 'hours': 0}
+_forecast_lock = threading.Lock()
+_forecast_model = None
+
+def hour_of_week(hours):
+    """UTC 整点时间戳数组 -> 业务时区的周内小时（1970-01-01 为周四，故偏移 72 小时）。"""
+    import numpy as np
+    hours = np.asarray(hours, dtype=np.int64)
+    offsets = np.fromiter((local_offset(int(h)) for h in hours), dtype=np.int64, count=len(hours))
+    return ((hours + offsets) // 3600 + 72) % 168
+
+def _fold_forecast(model, rows, lo, hi):
+    """把 [lo, hi) 内各小时的样本折叠进模型（矩先按 hi 与原截止时间之差衰减）；rows 为 (hour_ts, category, created)。"""
+    import numpy as np
+    decay = math.log(2) / (forecast_cfg['half_life_weeks'] * 168 * 3600)
+    if model['until'] is not None:
+        model['moments'] *= math.exp(-decay * (hi - model['until']))
+    firsts = {}
+    for h, cat, _ in rows:
+        firsts[cat] = min(firsts.get(cat, h), h)
+    for cat in sorted(firsts):
+        if cat not in model['first']:
+            model['first'][cat] = firsts[cat]
+            model['cats'].append(cat)
+            model['moments'] = np.concatenate([model['moments'], np.zeros((3, 1, 168))], axis=1)
+    model['until'] = hi
+    if hi <= lo:
+        return
+    hours = np.arange(lo, hi, 3600, dtype=np.int64)
+    slots = hour_of_week(hours)
+    weights = np.exp(-decay * (hi - 3600 - hours))
+    ncat = len(model['cats'])
+    # 零阶矩：每个品类自首次出现起的每个小时都是一个样本，无订单的小时计为 0
+    for i, cat in enumerate(model['cats']):
+        since = hours >= model['first'][cat]
+        model['moments'][0, i] += np.bincount(slots[since], weights[since], minlength=168)
+    if rows:
+        index = {cat: i for i, cat in enumerate(model['cats'])}
+        h = np.fromiter((r[0] for r in rows), dtype=np.int64, count=len(rows))
+        ci = np.fromiter((index[r[1]] for r in rows), dtype=np.int64, count=len(rows))
+        x = np.fromiter((r[2] for r in rows), dtype=float, count=len(rows))
+        pos = (h - lo) // 3600
+        key = ci*168 + slots[pos]
+        w = weights[pos]
+        model['moments'][1] += np.bincount(key, w*x, minlength=ncat*168).reshape(ncat, 168)
+        model['moments'][2] += np.bincount(key, w*x*x, minlength=ncat*168).reshape(ncat, 168)
+
+def _forecast_rows(c, lo, hi):
+    c.execute("SELECT hour_ts, COALESCE(category, '未分类'), SUM(created) FROM funnel_hourly WHERE hour_ts >= ? AND hour_ts < ? AND created > 0 "
+              "GROUP BY hour_ts, COALESCE(category, '未分类')", (lo, hi))
+    return c.fetchall()
+
+def forecast_model():
+    """返回当前模型（已结算的小时）；超过 refit 秒时整体重拟合，否则只折叠新结算的小时。"""
+    import numpy as np
+    global _forecast_model
+    settled = (int(time.time())//3600 - int(forecast_cfg['settle_hours'])) * 3600
+    with _forecast_lock:
+        model = _forecast_model
+        full = model is None or time.time() - model['fitted'] > forecast_cfg['refit']
+        if not full and settled <= model['until']:
+            return model
+        t0 = time.perf_counter()
+        conn = db()
+        try:
+            c = conn.cursor()
+            if full:
+                c.execute('SELECT MIN(hour_ts) FROM funnel_hourly WHERE created > 0')
+                first = c.fetchone()[0]
+                model = {'cats': [], 'first': {}, 'moments': np.zeros((3, 0, 168)), 'until': None, 'start': first, 'fitted': time.time()}
+                lo = int(first) if first is not None else settled
+                _fold_forecast(model, _forecast_rows(c, lo, settled) if lo < settled else [], lo, max(lo, settled))
+            else:
+                _fold_forecast(model, _forecast_rows(c, model['until'], settled), model['until'], settled)
+        finally:
+            conn.close()
+        ms = round((time.perf_counter()-t0)*1000, 2)
+        if full:
+            forecast_stats.update(fits=forecast_stats['fits']+1, fit_ms=ms)
+        else:
+            forecast_stats.update(updates=forecast_stats['updates']+1, update_ms=ms)
+        forecast_stats['hours'] = (model['until'] - model['start'])//3600 if model['start'] is not None else 0
+        _forecast_model = model
+        return model
+
+def forecast_profile(model, hours):
+    """各品类在给定 UTC 整点的预测均值与标准差：(cats, mean[C, N], sd[C, N])。"""
+    import numpy as np
+    slots = hour_of_week(hours)
+    n0, n1, n2 = model['moments']
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(n0 > 0, n1 / n0, 0.0)
+        sd = np.sqrt(np.maximum(np.where(n0 > 0, n2 / n0, 0.0) - mean*mean, 0.0))
+    return model['cats'], mean[:, slots], sd[:, slots]
+
+def forecast_multiplier(ts):
+    """生成器用：当前小时预测总量相对一周平均的倍数与品类占比；尚无历史时返回 None。"""
+    import numpy as np
+    model = forecast_model()
+    if not model['cats']:
+        return None
+    cats, mean, _ = forecast_profile(model, np.arange(168, dtype=np.int64)*3600 + int(ts)//3600*3600)
+    total = mean.sum(axis=0)
+    if total.mean() <= 0:
+        return None
+    return float(total[0] / total.mean()), dict(zip(cats, mean[:, 0].tolist()))
+
+# --- performance materializer ---
+# performance_daily 按 (业务日期, 骑手) 累计订单、送达、准时与接单/拒单/评价计数。订单侧以变更日志为游标：
+# performance_orders 记着每单上次计入的贡献，改派、改状态时先减后加；移入归档的订单贡献不变。
+# 事件侧以 order_events.id 为游标只追加。游标早于变更日志 floor（清空、恢复）或尚未建立时整体重建
+PERF_COUNTS = ('orders_count', 'delivered', 'on_time', 'accepted', 'rejected', 'ratings', 'positive')
+PERF_EVENTS = ('accept', 'reject', 'rating')
+
+def order_contribution(status, delivered_ts, eta_ts):
+    """单个订单计入的 (订单, 送达, 准时)：已送达状态或有送达时间记为送达，送达不晚于 ETA 记为准时。"""
+    delivered = 1 if (status == '已送达' or delivered_ts) else 0
+    on_time = 0
+    if delivered:
+        try:
+            on_time = 1 if eta_ts and int(delivered_ts) <= int(eta_ts) else 0
+        except Exception:
+            on_time = 0
+    return (1, delivered, on_time, 0, 0, 0, 0)
+
+def event_contribution(type_, ts, meta, order_rider):
+    """接单/拒单/评价事件计入的 (日期, 骑手, 计数)；骑手取 meta.rider，缺省为订单骑手。评价 score>=4 或 positive 为好评。"""
+    try:
+        m = json.loads(meta or '{}')
+    except Exception:
+        m = {}
+    if not isinstance(m, dict):
+        m = {}
+    rider = m.get('rider') or order_rider
+    try:
+        ts = int(ts)
+    except (TypeError, ValueError):
+        return None, None, None
+    if ts > 100000000000:
+        ts //= 1000
+    if type_ == 'accept':
+        counts = (0, 0, 0, 1, 0, 0, 0)
+    elif type_ == 'reject':
+        counts = (0, 0, 0, 0, 1, 0, 0)
+    else:
+        positive = m.get('positive')
+        if positive is None:
+            try:
+                positive = float(m.get('score')) >= 4
+            except (TypeError, ValueError):
+                positive = False
+        counts = (0, 0, 0, 0, 0, 1, 1 if positive else 0)
+    return local_bucket(ts)[0], rider, counts
+
+def _perf_add(deltas, date, rider, counts, sign=1):
+    if not (date and rider):
+        return
+    acc = deltas.setdefault((date, rider), [0]*len(PERF_COUNTS))
+    for i, n in enumerate(counts):
+        acc[i] += sign*n
+
+def _perf_apply(c, deltas):
+    cols = ','.join(PERF_COUNTS)
+    sets = ','.join(f'{k}={k}+excluded.{k}' for k in PERF_COUNTS)
+    c.executemany(f"INSERT INTO performance_daily (date, rider, {cols}) VALUES ({','.join('?'*(len(PERF_COUNTS)+2))}) ON CONFLICT(date, rider) DO UPDATE SET {sets}",
+                  [(d, r, *v) for (d, r), v in deltas.items() if any(v)])
+
+def _perf_scan(deltas, order_rows, event_rows):
+    """把 (id, rider, created_ts, status, delivered_ts, eta_ts) 订单行与 (type, ts, meta, 订单骑手) 事件行计入 deltas，返回订单贡献行。"""
+    contrib = []
+    for oid, rider, created_ts, status, delivered_ts, eta_ts in order_rows:
+        date = local_bucket(created_ts)[0]
+        counts = order_contribution(status, delivered_ts, eta_ts)
+        if rider and date:
+            _perf_add(deltas, date, rider, counts)
+            contrib.append((oid, rider, date, created_ts, counts[1], counts[2]))
+    for type_, ts, meta, order_rider in event_rows:
+        date, rider, counts = event_contribution(type_, ts, meta, order_rider)
+        _perf_add(deltas, date, rider, counts)
+    return contrib
+
+PERF_ORDER_SQL = 'SELECT id, rider, created_ts, status, delivered_ts, eta_ts FROM orders'
+PERF_EVENT_SQL = "SELECT e.type, e.ts, e.meta, o.rider FROM order_events e LEFT JOIN orders o ON o.id=e.order_id WHERE e.type IN ('accept','reject','rating')"
+
+def rebuild_performance(c):
+    """从热库与全部归档分区重建 performance_daily / performance_orders，游标置为当前位置（调用方持有写事务）。"""
+    c.execute('DELETE FROM performance_daily')
+    c.execute('DELETE FROM performance_orders')
+    deltas, contrib = {}, []
+    c.execute(PERF_ORDER_SQL)
+    orders = c.fetchall()
+    c.execute(PERF_EVENT_SQL)
+    contrib += _perf_scan(deltas, orders, c.fetchall())
+    for _, _, _, path in list_partitions():
+        arc = sqlite3.connect(f'file:{os.path.abspath(path)}?mode=ro', uri=True)
+        try:
+            orders = arc.execute(PERF_ORDER_SQL).fetchall()
+            contrib += _perf_scan(deltas, orders, arc.execute(PERF_EVENT_SQL).fetchall())
+        finally:
+            arc.close()
+    _perf_apply(c, deltas)
+    c.executemany('INSERT OR REPLACE INTO performance_orders (order_id, rider, date, created_ts, delivered, on_time) VALUES (?,?,?,?,?,?)', contrib)
+    c.execute('SELECT COALESCE(MAX(id), 0) FROM order_events')
+    last_event = c.fetchone()[0]
+    c.executemany('INSERT OR REPLACE INTO projection_state (name, last_id) VALUES (?, ?)',
+                  [('performance_orders', change_cursor(c)), ('performance_events', last_event)])
+    return len(contrib)
+
+def _archived_ids(old):
+    """old 为 {订单 id: created_ts}；返回其中已在归档分区中的订单 id。"""
+    found = set()
+    by_part = {}
+    parts = list_partitions()
+    for oid, ts in old.items():
+        for _, lo, hi, path in parts:
+            if ts is not None and lo <= int(ts) < hi:
+                by_part.setdefault(path, []).append(oid)
+    for path, ids in by_part.items():
+        arc = sqlite3.connect(f'file:{os.path.abspath(path)}?mode=ro', uri=True)
+        try:
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                found.update(r[0] for r in arc.execute(f'SELECT id FROM orders WHERE id IN ({",".join("?"*len(chunk))})', chunk))
+        finally:
+            arc.close()
+    return found
+
+def materialize_performance(batch=5000):
+    """把新的订单变更与接单/评价事件折叠进 performance_daily；每批一个 IMMEDIATE 事务，多进程并发调用也不会重复计数。"""
+    conn = db()
+    c = conn.cursor()
+    processed = 0
+    try:
+        # 无新变更、无新事件时不申请写锁
+        c.execute("SELECT name, last_id FROM projection_state WHERE name IN ('performance_orders', 'performance_events')")
+        state = dict(c.fetchall())
+        c.execute('SELECT COALESCE(MAX(id), 0) FROM order_events')
+        last_event = c.fetchone()[0]
+        if len(state) == 2 and state['performance_orders'] == change_cursor(c) and state['performance_events'] >= last_event:
+            return 0
+        while True:
+            c.execute('BEGIN IMMEDIATE')
+            c.execute("SELECT name, last_id FROM projection_state WHERE name IN ('performance_orders', 'performance_events')")
+            state = dict(c.fetchall())
+            cursor = change_cursor(c)
+            if len(state) < 2 or state['performance_orders'] < _changes_floor(c) or state['performance_orders'] > cursor:
+                processed += rebuild_performance(c)
+                conn.commit()
+                break
+            last_seq, last_event = state['performance_orders'], state['performance_events']
+            c.execute("SELECT seq, key, op FROM changes WHERE entity='orders' AND seq > ? ORDER BY seq LIMIT ?", (last_seq, batch))
+            changes = c.fetchall()
+            c.execute("SELECT id, order_id, ts, type, meta FROM order_events WHERE id > ? AND type IN ('accept','reject','rating') ORDER BY id LIMIT ?", (last_event, batch))
+            events = c.fetchall()
+            if not changes and not events and last_seq == cursor:
+                c.execute('SELECT COALESCE(MAX(id), 0) FROM order_events')
+                c.execute("INSERT OR REPLACE INTO projection_state (name, last_id) VALUES ('performance_events', ?)", (max(last_event, c.fetchone()[0]),))
+                conn.commit()
+                break
+            deltas = {}
+            keys = [k for _, k, _ in changes]
+            old, cur = {}, {}
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i+500]
+                marks = ','.join('?'*len(chunk))
+                c.execute(f'SELECT order_id, rider, date, created_ts, delivered, on_time FROM performance_orders WHERE order_id IN ({marks})', chunk)
+                old.update((r[0], r[1:]) for r in c.fetchall())
+                c.execute(f'SELECT id, rider, created_ts, status, delivered_ts, eta_ts FROM orders WHERE id IN ({marks})', chunk)
+                cur.update((r[0], r) for r in c.fetchall())
+            archived = _archived_ids({k: old[k][2] for k in keys if k not in cur and k in old})
+            drop = []
+            for k in keys:
+                if k in archived:
+                    continue
+                if k in old:
+                    rider, date, _, delivered, on_time = old[k]
+                    _perf_add(deltas, date, rider, (1, delivered, on_time, 0, 0, 0, 0), -1)
+                    drop.append((k,))
+            c.executemany('DELETE FROM performance_orders WHERE order_id=?', drop)
+            contrib = _perf_scan(deltas, [cur[k] for k in keys if k in cur], [])
+            c.executemany('INSERT OR REPLACE INTO performance_orders (order_id, rider, date, created_ts, delivered, on_time) VALUES (?,?,?,?,?,?)', contrib)
+            riders = {}
+            ids = list({e[1] for e in events if e[1]})
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                c.execute(f'SELECT id, rider FROM orders WHERE id IN ({",".join("?"*len(chunk))})', chunk)
+                riders.update(c.fetchall())
+            _perf_scan(deltas, [], [(t, ts, meta, riders.get(oid)) for _, oid, ts, t, meta in events])
+            _perf_apply(c, deltas)
+            next_seq = changes[-1][0] if len(changes) == batch else cursor
+            if len(events) == batch:
+                next_event = events[-1][0]
+            else:
+                c.execute('SELECT COALESCE(MAX(id), 0) FROM order_events')
+                next_event = max(last_event, c.fetchone()[0])
+            c.executemany('INSERT OR REPLACE INTO projection_state (name, last_id) VALUES (?, ?)',
+                          [('performance_orders', next_seq), ('performance_events', next_event)])
+            conn.commit()
+            processed += len(changes) + len(events)
+            if len(changes) < batch and len(events) < batch:
+                break
+    finally:
+        conn.close()
+    return processed
+
+# 漏斗/环节投影与绩效计数由 0 号进程每 interval 秒物化一次（写事务只在后台线程中申请），
+# 读接口只读物化表，最多滞后 interval 秒，不与上报写入争用写锁
+projection_cfg = {'enabled': True, 'interval': 5}
+projection_stats = {'last_ts': 0, 'events': 0, 'performance': 0, 'duration_ms': 0, 'error': ''}
+projection_thread = None
+
+def _projection_loop():
+    while projection_cfg['enabled']:
+        t0 = time.perf_counter()
+        try:
+            events = project_events()
+            perf = materialize_performance()
+            projection_stats.update(last_ts=int(time.time()), events=events, performance=perf, duration_ms=round((time.perf_counter()-t0)*1000, 1), error='')
+        except Exception as e:
+            projection_stats['error'] = str(e)
+            try:
+                logging.warning(f'projection failed: {e}')
+            except Exception:
+                pass
+        time.sleep(max(1, int(projection_cfg.get('interval', 5))))
+
+def _next_date(date_str, days=1):
+    import datetime
+    return (datetime.date.fromisoformat(date_str) + datetime.timedelta(days=days)).isoformat()
+
+def performance_summary(start, end):
+    """按下单时间区间汇总各骑手计数：整日取 performance_daily 的区间和，首尾不足一天的部分从原始订单与事件补算。"""
+    d0, d1 = local_bucket(start)[0], local_bucket(end)[0]
+    lo_full = d0 if int(start) <= local_midnight(d0) else _next_date(d0)
+    hi_full = d1 if int(end) >= local_midnight(_next_date(d1)) - 1 else _next_date(d1, -1)
+    edges = []
+    if lo_full > hi_full:
+        edges.append((int(start), int(end)))
+    else:
+        if lo_full != d0:
+            edges.append((int(start), local_midnight(lo_full) - 1))
+        if hi_full != d1:
+            edges.append((local_midnight(d1), int(end)))
+    totals = {}
+    conn = db()
+    c = conn.cursor()
+    try:
+        if lo_full <= hi_full:
+            c.execute(f"SELECT rider, {','.join(f'SUM({k})' for k in PERF_COUNTS)} FROM performance_daily WHERE date BETWEEN ? AND ? GROUP BY rider", (lo_full, hi_full))
+            for r in c.fetchall():
+                totals[r[0]] = list(r[1:])
+    finally:
+        conn.close()
+    for lo, hi in edges:
+        rc = range_db(lo, hi)
+        try:
+            c = rc.cursor()
+            deltas = {}
+            c.execute('SELECT id, rider, created_ts, status, delivered_ts, eta_ts FROM v_orders WHERE created_ts BETWEEN ? AND ?', (lo, hi))
+            orders = c.fetchall()
+            c.execute("SELECT order_id, type, ts, meta FROM v_order_events WHERE type IN ('accept','reject','rating') AND (ts BETWEEN ? AND ? OR ts BETWEEN ? AND ?)", (lo, hi, lo*1000, hi*1000 + 999))
+            events = c.fetchall()
+            riders = {}
+            ids = list({e[0] for e in events if e[0]})
+            for i in range(0, len(ids), 500):
+                chunk = ids[i:i+500]
+                c.execute(f'SELECT id, rider FROM v_orders WHERE id IN ({",".join("?"*len(chunk))})', chunk)
+                riders.update(c.fetchall())
+            _perf_scan(deltas, orders, [(t, ts, meta, riders.get(oid)) for oid, t, ts, meta in events])
+        finally:
+            rc.close()
+        for (_, rider), counts in deltas.items():
+            acc = totals.setdefault(rider, [0]*len(PERF_COUNTS))
+            for i, n in enumerate(counts):
+                acc[i] += n
+    return totals
+
+# --- dispatch engine ---
+# 成本 = 取餐距离(米) + load_weight * 骑手当前在途单量；超过 max_km 的组合不参与分配
+dispatch_cfg = {'batch_size': 200, 'max_km': 5.0, 'capacity': 3, 'load_weight': 800.0, 'candidates': 8, 'hungarian_max': 48}
+
+def haversine_np(lng1, lat1, lng2, lat2):
+    """向量化 haversine 距离（米），参数按 NumPy 规则广播。"""
+    import numpy as np
+    lng1, lat1, lng2, lat2 = (np.radians(np.asarray(v, dtype=float)) for v in (lng1, lat1, lng2, lat2))
+    h = np.sin((lat2-lat1)/2)**2 + np.cos(lat1)*np.cos(lat2)*np.sin((lng2-lng1)/2)**2
+    return 2*6371000*np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+def point_segment_distance_np(plng, plat, alng, alat, blng, blat):
+    """Web 墨卡托平面上点到线段 AB 的距离（米），按数组批量计算。"""
+    import numpy as np
+    def to_xy(lng, lat):
+        return lng*np.pi/180*6378137, np.log(np.tan((90+lat)*np.pi/360))*6378137
+    px, py = to_xy(plng, plat)
+    ax, ay = to_xy(alng, alat)
+    bx, by = to_xy(blng, blat)
+    vx, vy = bx-ax, by-ay
+    c1 = vx*(px-ax) + vy*(py-ay)
+    c2 = vx*vx + vy*vy
+    # 投影参数夹在 [0, 1]：落在 A 之前取 A，越过 B 取 B；A、B 重合时取 A
+    t = np.clip(c1/np.where(c2 > 0, c2, 1), 0, 1)
+    return np.hypot(px-(ax+t*vx), py-(ay+t*vy))
+
+def _hungarian(cost):
+    """Kuhn-Munkres 最小费用指派（行数 <= 列数），返回每行对应的列下标。"""
+    import numpy as np
+    n, m = cost.shape
+    inf = float('inf')
+    u = np.zeros(n+1)
+    v = np.zeros(m+1)
+    p = np.zeros(m+1, dtype=int)
+    way = np.zeros(m+1, dtype=int)
+    for i in range(1, n+1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m+1, inf)
+        used = np.zeros(m+1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = p[j0]
+            cur = cost[i0-1] - u[i0] - v[1:]
+            free = ~used[1:]
+            better = free & (cur < minv[1:])
+            minv[1:][better] = cur[better]
+            way[1:][better] = j0
+            masked = np.where(free, minv[1:], inf)
+            j1 = int(np.argmin(masked)) + 1
+            delta = masked[j1-1]
+            used_idx = np.nonzero(used)[0]
+            u[p[used_idx]] += delta
+            v[used_idx] -= delta
+            minv[1:][free] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    res = np.full(n, -1, dtype=int)
+    for j in range(1, m+1):
+        if p[j]:
+            res[p[j]-1] = j-1
+    return res
+
+def _assign_batch(dist, load, slots, cfg):
+    """为一批订单分配骑手，返回 [(订单下标, 骑手下标, 距离)] 与所用算法。"""
+    import numpy as np
+    n, m = dist.shape
+    reach = dist <= float(cfg['max_km'])*1000
+    total_slots = int(slots.sum())
+    if n * total_slots <= int(cfg['hungarian_max'])**2:
+        # 小批量：按剩余运力展开骑手槽位，第 k 个槽位的负载成本递增，求全局最优
+        cols = np.repeat(np.arange(m), slots)
+        extra = np.concatenate([np.arange(s) for s in slots]) if total_slots else np.zeros(0, dtype=int)
+        big = 1e12
+        cost = dist[:, cols] + float(cfg['load_weight'])*(load[cols] + extra)[None, :]
+        cost = np.where(reach[:, cols], cost, big)
+        if cost.shape[1] < n:
+            cost = np.hstack([cost, np.full((n, n - cost.shape[1]), big)])
+        picked = _hungarian(cost)
+        pairs = [(i, int(cols[j]), float(dist[i, cols[j]])) for i, j in enumerate(picked) if j >= 0 and cost[i, j] < big]
+        return pairs, 'hungarian'
+    # 大批量：每单只保留最近的 k 个候选骑手（空间剪枝），再按成本全局贪心
+    cost = np.where(reach, dist + float(cfg['load_weight'])*load[None, :], np.inf)
+    k = min(m, max(1, int(cfg['candidates'])))
+    cand = np.argpartition(cost, k-1, axis=1)[:, :k] if k < m else np.tile(np.arange(m), (n, 1))
+    rows = np.repeat(np.arange(n), cand.shape[1])
+    flat = cand.ravel()
+    cc = cost[rows, flat]
+    keep = np.isfinite(cc)
+    rows, flat, cc = rows[keep], flat[keep], cc[keep]
+    order = np.argsort(cc, kind='stable')
+    left = slots.copy()
+    done = np.zeros(n, dtype=bool)
+    pairs = []
+    for i, j in zip(rows[order].tolist(), flat[order].tolist()):
+        if done[i] or left[j] <= 0:
+            continue
+        done[i] = True
+        left[j] -= 1
+        pairs.append((i, j, float(dist[i, j])))
+    return pairs, 'greedy'
+
+def dispatch_pending(**overrides):
+    """批量派单：为待取餐且未分配骑手的订单选择在线骑手，一次事务写回。"""
+    import numpy as np
+    cfg = dict(dispatch_cfg)
+    cfg.update({k: v for k, v in overrides.items() if v is not None})
+    t0 = time.perf_counter()
+    now = int(time.time())
+    conn = db()
+    c = conn.cursor()
+    c.execute("SELECT id, origin_lng, origin_lat FROM orders WHERE status='待取餐' AND (rider IS NULL OR rider='') AND origin_lng IS NOT NULL AND origin_lat IS NOT NULL ORDER BY created_ts")
+    orders = c.fetchall()
+    # 在线骑手取最近 5 分钟内的最新位置（SQLite 对 MAX() 聚合返回同一行的裸列）
+    c.execute('SELECT name, lng, lat, MAX(ts) FROM live_points WHERE ts > ? GROUP BY name', ((now - 5*60)*1000,))
+    riders = [r for r in c.fetchall() if r[0] and r[1] is not None and r[2] is not None]
+    order_book.sync()
+    active = order_book.open_load()
+    stats = {'orders': len(orders), 'riders': len(riders), 'assigned': 0, 'batches': []}
+    if not orders or not riders:
+        conn.close()
+        stats['ms'] = round((time.perf_counter()-t0)*1000, 2)
+        return stats
+    names = [r[0] for r in riders]
+    rlng = np.array([r[1] for r in riders], dtype=float)
+    rlat = np.array([r[2] for r in riders], dtype=float)
+    load = np.array([int(active.get(nm, 0)) for nm in names], dtype=int)
+    capacity = max(1, int(cfg['capacity']))
+    assignments = []
+    size = max(1, int(cfg['batch_size']))
+    for b in range(0, len(orders), size):
+        tb = time.perf_counter()
+        batch = orders[b:b+size]
+        slots = np.clip(capacity - load, 0, None)
+        avail = np.nonzero(slots)[0]
+        pairs, method = [], 'skip'
+        if len(avail):
+            olng = np.array([o[1] for o in batch], dtype=float)
+            olat = np.array([o[2] for o in batch], dtype=float)
+            dist = haversine_np(rlng[avail][None, :], rlat[avail][None, :], olng[:, None], olat[:, None])
+            pairs, method = _assign_batch(dist, load[avail], slots[avail], cfg)
+        for i, j, d in pairs:
+            r = int(avail[j])
+            load[r] += 1
+            assignments.append((batch[i][0], names[r], d))
+        stats['batches'].append({'size': len(batch), 'riders': int(len(avail)), 'method': method, 'assigned': len(pairs), 'ms': round((time.perf_counter()-tb)*1000, 2)})
+    if assignments:
+        c.executemany("UPDATE orders SET rider=? WHERE id=? AND (rider IS NULL OR rider='')", [(nm, oid) for oid, nm, _ in assignments])
+        c.executemany('INSERT INTO order_events (order_id, ts, type, meta) VALUES (?,?,?,?)',
+                      [(oid, now, 'dispatch', json.dumps({'rider': nm, 'distance': round(d, 1)})) for oid, nm, d in assignments])
+        record_changes(c, 'orders', [oid for oid, _, _ in assignments])
+        conn.commit()
+    conn.close()
+    stats['assigned'] = len(assignments)
+    stats['ms'] = round((time.perf_counter()-t0)*1000, 2)
+    return stats
+
+# --- ETA estimation ---
+# 从已送达订单学习各品类 × 下单小时（业务时区）的出餐时长（下单→取餐）与配送节奏（取餐→送达耗时 / 取餐点到送达点的球面距离，
+# 即每米秒数，已含绕路系数），单元样本不足 min_samples 时依次回落到品类、全局与默认值。模型常驻内存：按变更日志并入新送达的订单，
+# 每 refit 秒按最近 days 天整体重拟合。全局样本不足 min_samples 时模型视为未训练，承诺时间改用历史送达总时长（下单→送达）
+# 的中位数，无历史时用 default_total，避免按默认速度承诺过短导致准时率全为 0。0 号进程每 interval 秒按骑手最新位置批量重估全部在途订单，写入 eta_pred_ts；
+# eta_ts 仍是承诺时间（准时率按它计算），预测晚于承诺时产生延迟告警
+eta_cfg = {'enabled': True, 'interval': 30, 'min_change': 60, 'days': 28, 'refit': 6*3600, 'min_samples': 20,
+           'default_prep': 900, 'default_speed': 4.0, 'default_total': 4500, 'max_stage': 4*3600}
+eta_stats = {'fits': 0, 'samples': 0, 'runs': 0, 'scored': 0, 'updated': 0, 'score_ms': 0.0, 'write_ms': 0.0, 'error': ''}
+eta_thread = None
+_eta_lock = threading.Lock()
+_eta_model = None
+# 本进程上次写入的预测值，变化不足 min_change 秒的订单不回写
+_eta_written = {}
+ETA_SAMPLE_SQL = 'SELECT id, category, local_hour, created_ts, pickup_ts, delivered_ts, origin_lng, origin_lat, dest_lng, dest_lat FROM orders'
+
+def _eta_fold(model, rows):
+    """把已送达订单（ETA_SAMPLE_SQL 的行）累加到各 (品类, 小时) 的出餐与配送计数；同一订单只计一次。"""
+    import numpy as np
+    rows = [r for r in rows if r[0] not in model['seen'] and r[2] is not None and None not in r[3:]]
+    for r in rows:
+        model['seen'].add(r[0])
+        if r[1] not in model['index']:
+            model['index'][r[1]] = len(model['cats'])
+            model['cats'].append(r[1])
+            model['sums'] = np.concatenate([model['sums'], np.zeros((5, 1, 24))], axis=1)
+    if not rows:
+        return 0
+    n = len(rows)
+    key = np.fromiter((model['index'][r[1]]*24 + int(r[2]) % 24 for r in rows), dtype=np.int64, count=n)
+    a = np.array([r[3:] for r in rows], dtype=float)
+    prep, leg = a[:, 1] - a[:, 0], a[:, 2] - a[:, 1]
+    meters = haversine_np(a[:, 3], a[:, 4], a[:, 5], a[:, 6])
+    ok_prep = (prep >= 0) & (prep <= eta_cfg['max_stage'])
+    ok_leg = (leg > 0) & (leg <= eta_cfg['max_stage']) & (meters > 50)
+    total = a[:, 2] - a[:, 0]
+    ok_total = (total > 0) & (total <= 2*eta_cfg['max_stage'])
+    # total: 送达总时长按分钟计数的直方图，用于未训练时的回落值
+    model['total'] += np.bincount((total[ok_total] // 60).astype(np.int64), minlength=len(model['total']))
+    size = len(model['cats'])*24
+    # sums: 出餐样本数、出餐秒数、配送样本数、配送米数、配送秒数
+    for i, (ok, value) in enumerate(((ok_prep, None), (ok_prep, prep), (ok_leg, None), (ok_leg, meters), (ok_leg, leg))):
+        model['sums'][i] += np.bincount(key[ok], None if value is None else value[ok], minlength=size).reshape(-1, 24)
+    return n
+
+def _eta_tables(model):
+    """由计数求 (品类 + 未知品类, 小时) 的出餐秒数与每米秒数查找表，末行为未知品类。"""
+    import numpy as np
+    k = eta_cfg['min_samples']
+    prep_n, prep_s, leg_n, leg_m, leg_s = model['sums']
+    def table(n, num, den, default):
+        top = num.sum()/den.sum() if n.sum() >= k and den.sum() > 0 else default
+        per_cat = np.where(n.sum(axis=1) >= k, num.sum(axis=1)/np.maximum(den.sum(axis=1), 1e-9), top)
+        cell = np.where(n >= k, num/np.maximum(den, 1e-9), per_cat[:, None])
+        return np.vstack([cell, np.full((1, 24), top)])
+    model['prep'] = table(prep_n, prep_s, prep_n, float(eta_cfg['default_prep']))
+    model['pace'] = table(leg_n, leg_s, leg_m, 1.0/float(eta_cfg['default_speed']))
+    model['trained'] = bool(prep_n.sum() >= k and leg_n.sum() >= k)
+    hist = model['total']
+    n = hist.sum()
+    model['fallback'] = int(np.searchsorted(np.cumsum(hist), n/2.0)*60 + 30) if n else int(eta_cfg['default_total'])
+
+def eta_model(update=True):
+    """返回当前模型：首次使用、超过 refit 秒或变更日志游标失效时整体拟合；update 时并入游标之后新送达的订单。"""
+    import numpy as np
+    global _eta_model
+    with _eta_lock:
+        model = _eta_model
+        if model is not None and not update and time.time() - model['fitted'] <= eta_cfg['refit']:
+            return model
+        conn = db()
+        c = conn.cursor()
+        try:
+            cursor = change_cursor(c)
+            if model is None or time.time() - model['fitted'] > eta_cfg['refit'] or not _changes_floor(c) <= model['cursor'] <= cursor:
+                model = {'cats': [], 'index': {}, 'sums': np.zeros((5, 0, 24)), 'total': np.zeros(2*eta_cfg['max_stage']//60 + 1), 'seen': set(), 'cursor': cursor, 'fitted': time.time()}
+                c.execute(ETA_SAMPLE_SQL + ' WHERE delivered_ts >= ? AND pickup_ts IS NOT NULL', (int(time.time()) - int(eta_cfg['days'])*86400,))
+                _eta_fold(model, c.fetchall())
+                _eta_tables(model)
+                eta_stats['fits'] += 1
+            elif cursor != model['cursor']:
+                c.execute("SELECT key FROM changes WHERE entity='orders' AND seq > ? AND seq <= ?", (model['cursor'], cursor))
+                ids = [r[0] for r in c.fetchall()]
+                rows = []
+                for i in range(0, len(ids), 500):
+                    chunk = ids[i:i+500]
+                    c.execute(ETA_SAMPLE_SQL + f' WHERE id IN ({",".join("?"*len(chunk))}) AND delivered_ts IS NOT NULL AND pickup_ts IS NOT NULL', chunk)
+                    rows += c.fetchall()
+                if _eta_fold(model, rows):
+                    _eta_tables(model)
+                model['cursor'] = cursor
+        finally:
+            conn.close()
+        eta_stats['samples'] = len(model['seen'])
+        _eta_model = model
+        return model
+
+def promise_eta(model, category, created_ts, olng, olat, dlng, dlat):
+    """新订单的承诺送达时间：下单小时的出餐时长 + 取餐点到送达点的预计配送时长；模型未训练时为历史送达时长中位数；
+    时间或坐标缺失、非法时为 None。"""
+    try:
+        created = int(float(created_ts))
+        meters = float(haversine_np(float(olng), float(olat), float(dlng), float(dlat)))
+    except (TypeError, ValueError):
+        return None
+    if meters != meters:
+        return None
+    if not model['trained']:
+        return created + model['fallback']
+    i = model['index'].get(category, len(model['cats']))
+    h = local_bucket(created)[1] or 0
+    return int(created + model['prep'][i, h] + meters*model['pace'][i, h])
+
+def _float_or_nan(v):
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+def rescore_etas(now=None):
+    """按骑手最新位置与剩余距离一次性重估全部在途订单的预计送达时间，批量写回变化超过 min_change 秒的订单。
+    未取餐：max(出餐完成, 骑手到店, 当前) + 店到客配送；已取餐：当前 + 骑手到客配送（无位置时按取餐时间推算）。"""
+    import itertools
+    import operator
+    import numpy as np
+    t0 = time.perf_counter()
+    now = int(time.time()) if now is None else int(now)
+    model = eta_model()
+    order_book.sync()
+    orders = order_book.open_orders()
+    n = len(orders)
+    # 属性按列一次取出（None 转为 NaN），逐单的 Python 运算只剩字典查找
+    ids = list(map(operator.attrgetter('id'), orders))
+    cols = list(map(operator.attrgetter('created_ts', 'pickup_ts', 'origin_lng', 'origin_lat', 'dest_lng', 'dest_lat'), orders))
+    try:
+        a = np.array(cols, dtype=float).reshape(n, 6)
+    except (TypeError, ValueError):
+        # 个别订单字段写入了非数值：只对出问题的列逐个转换，无法转换的按缺失处理
+        obj = np.array(cols, dtype=object).reshape(n, 6)
+        a = np.empty((n, 6))
+        for j in range(6):
+            try:
+                a[:, j] = obj[:, j].astype(float)
+            except (TypeError, ValueError):
+                a[:, j] = np.fromiter(map(_float_or_nan, obj[:, j]), dtype=float, count=n)
+    riders = list(map(operator.attrgetter('rider'), orders))
+    names = list(set(riders))
+    unknown = len(model['cats'])
+    cat = np.fromiter(map(model['index'].get, map(operator.attrgetter('category'), orders), itertools.repeat(unknown)), dtype=np.int64, count=n)
+    conn = db()
+    c = conn.cursor()
+    try:
+        c.execute('SELECT name, lng, lat FROM live_points WHERE rowid IN (SELECT (SELECT rowid FROM live_points WHERE name = n.value ORDER BY ts DESC LIMIT 1) FROM json_each(?) n)',
+                  (json.dumps([r for r in names if r]),))
+        points = {r[0]: r[1:] for r in c.fetchall()}
+        pos = np.array([points.get(r, (None, None)) for r in names], dtype=float).reshape(len(names), 2)
+        where = {r: i for i, r in enumerate(names)}
+        plng, plat = pos[np.fromiter(map(where.__getitem__, riders), dtype=np.int64, count=n)].T if n else (np.zeros(0), np.zeros(0))
+        created, pickup, olng, olat, dlng, dlat = a.T
+        hour = local_bucket(now)[1] or 0
+        prep, pace = model['prep'][cat, hour], model['pace'][cat, hour]
+        located = ~np.isnan(plng)
+        leg = haversine_np(olng, olat, dlng, dlat) * pace
+        to_origin = np.where(located, haversine_np(plng, plat, olng, olat) * pace, 0.0)
+        to_dest = np.where(located, haversine_np(plng, plat, dlng, dlat) * pace, np.maximum(pickup + leg - now, 0.0))
+        waiting = np.maximum(np.maximum(created + prep, now + to_origin), now) + leg
+        eta = np.where(np.isnan(pickup), waiting, now + to_dest)
+        # 下单时间或坐标缺失的订单算不出结果，保持原值
+        valid = ~np.isnan(eta)
+        eta = np.rint(np.where(valid, eta, 0)).astype(np.int64)
+        old = np.array(list(map(_eta_written.get, ids)), dtype=float).reshape(n)
+        changed = valid & (np.isnan(old) | (np.abs(eta - np.nan_to_num(old)) >= eta_cfg['min_change']))
+        t1 = time.perf_counter()
+        idx = np.nonzero(changed)[0]
+        rows = list(zip(eta[idx].tolist(), [ids[i] for i in idx.tolist()]))
+        if rows:
+            c.executemany('UPDATE orders SET eta_pred_ts=? WHERE id=?', rows)
+            conn.commit()
+    finally:
+        conn.close()
+    keep = np.where(changed, eta, np.nan_to_num(old, nan=-1).astype(np.int64))
+    _eta_written.clear()
+    _eta_written.update((k, v) for k, v in zip(ids, keep.tolist()) if v >= 0)
+    eta_stats.update(runs=eta_stats['runs']+1, scored=int(valid.sum()), updated=len(rows), score_ms=round((t1-t0)*1000, 2), write_ms=round((time.perf_counter()-t1)*1000, 2))
+    return eta_stats
+
+def _eta_loop():
+    while eta_cfg['enabled']:
+        try:
+            rescore_etas()
+            eta_stats['error'] = ''
+        except Exception as e:
+            eta_stats['error'] = str(e)
+            try:
+                logging.warning(f'eta rescoring failed: {e}')
+            except Exception:
+                pass
+        time.sleep(max(5, int(eta_cfg.get('interval', 30))))
+
+# --- background jobs ---
+# 重型写操作（清空、删除骑手、批量生成、结算重算）排入 jobs 表，由 0 号进程的后台线程执行；
+# 每种任务是一个生成器：按块提交后产出 (done, total)，块之间释放写锁让请求穿插，并检查取消标记
+jobs_cfg = {'chunk': 2000, 'poll': 1.0, 'keep_days': 7}
+jobs_thread = None
+_jobs_wake = threading.Event()
+JOB_FIELDS = ('id', 'kind', 'params', 'state', 'done', 'total', 'result', 'error', 'created_ts', 'started_ts', 'finished_ts')
+
+def _chunked_delete(c, table, where='1', params=()):
+    """按 rowid 分块删除并逐块提交，产出每块删除的行数。"""
+    while True:
+        c.execute(f'DELETE FROM {table} WHERE rowid IN (SELECT rowid FROM {table} WHERE {where} LIMIT ?)', tuple(params) + (jobs_cfg['chunk'],))
+        n = c.rowcount
+        c.connection.commit()
+        if n <= 0:
+            return
+        yield n
+
+def _job_generate(conn, params):
+    count = max(0, int(params.get('count') or 0))
+    hours = max(1, int(params.get('hours') or 6))
+    riders = params.get('riders') or None
+    done = 0
+    while done < count:
+        n = min(jobs_cfg['chunk'], count - done)
+        insert_random_orders(n, hours, riders)
+        done += n
+        yield done, count
+    return {'inserted': done}
+
+def _job_clear(conn, params):
+    c = conn.cursor()
+    tables = ('alerts', 'order_events', 'settlements', 'orders')
+    total = 0
+    for t in tables:
+        c.execute(f'SELECT COUNT(*) FROM {t}')
+        total += c.fetchone()[0] or 0
+    done = 0
+    for t in tables:
+        for n in _chunked_delete(c, t):
+            done += n
+            yield done, total
+    # 投影最后整体重置；清空期间新写入的事件会从头重新投影
+    c.execute('BEGIN IMMEDIATE')
+    reset_projections(c)
+    reset_changes(c)
+    conn.commit()
+    # 归档分区中只清订单与订单事件；轨迹（里程历史）与热库一样保留
+    for _, _, _, path in list_partitions():
+        arc = sqlite3.connect(path)
+        arc.execute('DELETE FROM order_events')
+        arc.execute('DELETE FROM orders')
+        arc.commit()
+        arc.close()
+    return {'deleted': done}
+
+def _job_rider_delete(conn, params):
+    name = params['name']
+    c = conn.cursor()
+    per_rider = (('alerts', 'rider'), ('live_points', 'name'), ('tracks', 'name'), ('settlements', 'rider'), ('mileage_daily', 'rider'))
+    c.execute('SELECT COUNT(*) FROM orders WHERE rider=?', (name,))
+    total = c.fetchone()[0] or 0
+    for t, col in per_rider:
+        c.execute(f'SELECT COUNT(*) FROM {t} WHERE {col}=?', (name,))
+        total += c.fetchone()[0] or 0
+    done = 0
+    c.execute("INSERT OR REPLACE INTO changes (entity, key, op, ts) SELECT 'alerts', order_id || '|' || type, 'delete', ? FROM alerts WHERE rider=? GROUP BY order_id, type", (int(time.time()), name))
+    conn.commit()
+    # 订单连同其事件与投影贡献按块删除
+    while True:
+        c.execute('BEGIN IMMEDIATE')
+        c.execute('SELECT id FROM orders WHERE rider=? LIMIT ?', (name, jobs_cfg['chunk']))
+        ids = [r[0] for r in c.fetchall()]
+        if not ids:
+            conn.rollback()
+            break
+        marks = ','.join('?'*len(ids))
+        retract_orders(c, f'id IN ({marks})', ids)
+        c.execute(f'DELETE FROM order_events WHERE order_id IN ({marks})', ids)
+        c.execute(f'DELETE FROM orders WHERE id IN ({marks})', ids)
+        record_changes(c, 'orders', ids, 'delete')
+        conn.commit()
+        done += len(ids)
+        yield done, total
+    for t, col in per_rider:
+        for n in _chunked_delete(c, t, f'{col}=?', (name,)):
+            done += n
+            yield done, total
+    c.execute('DELETE FROM riders WHERE name=?', (name,))
+    record_changes(c, 'riders', [name], 'delete')
+    # 被删订单上的拒单/评价事件也计在其他骑手名下，绩效汇总整体重建
+    c.execute("DELETE FROM projection_state WHERE name IN ('performance_orders', 'performance_events')")
+    conn.commit()
+    for _, _, _, path in list_partitions():
+        arc = sqlite3.connect(path)
+        arc.execute('DELETE FROM order_events WHERE order_id IN (SELECT id FROM orders WHERE rider=?)', (name,))
+        arc.execute('DELETE FROM orders WHERE rider=?', (name,))
+        arc.execute('DELETE FROM tracks WHERE name=?', (name,))
+        arc.commit()
+        arc.close()
+    return {'deleted': done}
+
+def compute_settlements(c, start, end):
+    """按下单时间区间计算骑手结算行（只读）；c 需为 range_db 连接以包含归档订单。"""
+    rows = []
+    # 1. Fetch all orders CREATED in the period (Unified View)
+    c.execute('SELECT id, rider, fee, delivered_ts, eta_ts, status FROM v_orders WHERE created_ts BETWEEN ? AND ?', (start, end))
+    order_rows = c.fetchall()
+    
+    # 2. Fetch delays linked to these orders (Unified View)
+    # Using a join to ensure we only count alerts for the relevant orders
+    c.execute('''
+        SELECT t1.rider, COUNT(t2.id) 
+        FROM v_orders t1 
+        JOIN alerts t2 ON t1.id = t2.order_id 
+        WHERE t1.created_ts BETWEEN ? AND ? AND t2.type="延迟" 
+        GROUP BY t1.rider
+    ''', (start, end))
+    delay_map = {r[0]: r[1] for r in c.fetchall()}
+    
+    from collections import defaultdict
+    # {rider: {'count':0, 'income':0.0, 'on_time':0, 'delivered_count':0}}
+    agg = defaultdict(lambda: {'count':0, 'income':0.0, 'on_time':0, 'delivered_count':0})
+    
+    for oid, rider, fee, delivered_ts, eta_ts, status in order_rows:
+        if not rider: continue
+        agg[rider]['count'] += 1 # Total Created
+        
+        # Only count income and on-time for delivered orders
+        if status == '已送达' or delivered_ts:
+            agg[rider]['income'] += float(fee or 0)
+            agg[rider]['delivered_count'] += 1
+            try:
+                if delivered_ts and eta_ts and int(delivered_ts) <= int(eta_ts):
+                    agg[rider]['on_time'] += 1
+            except Exception:
+                pass
+    
+    for rider, stats in agg.items():
+        cnt = stats['count'] # Display Total Created Orders to match Monitoring
+        delivered_cnt = stats['delivered_count']
+        income = stats['income']
+        on_time = stats['on_time']
+        delays = delay_map.get(rider, 0)
+        
+        # Rates based on DELIVERED orders for fairness
+        on_time_rate = (on_time/delivered_cnt) if delivered_cnt else 0.0
+        
+        base_bonus = float(on_time)*1.2
+        tier_bonus = 0.0
+        # Tier bonus criteria based on DELIVERED volume
+        if delivered_cnt >= 100 and on_time_rate >= 0.95:
+            tier_bonus = 80.0
+        elif delivered_cnt >= 60 and on_time_rate >= 0.92:
+            tier_bonus = 40.0
+        
+        zero_delay_bonus = 50.0 if (delays == 0 and delivered_cnt > 0) else 0.0
+        subsidy = round(base_bonus + tier_bonus + zero_delay_bonus, 2)
+        penalties = float(delays)*2.0
+        net = float(income) + subsidy - penalties
+        rows.append((rider, start, end, cnt, income, subsidy, penalties, net, end))
+    return rows
+
+def save_settlements(c, start, end, rows):
+    """覆盖写入一个周期的结算行（不提交）。"""
+    c.execute('DELETE FROM settlements WHERE period_start_ts=? AND period_end_ts=?', (start, end))
+    c.executemany('INSERT INTO settlements (rider, period_start_ts, period_end_ts, orders_count, total_income, subsidy, penalties, net_income, generated_ts) VALUES (?,?,?,?,?,?,?,?,?)', rows)
+
+def settle_period(c, start, end):
+    """按下单时间区间重算骑手结算并写入 settlements（不提交）。"""
+    save_settlements(c, start, end, compute_settlements(c, start, end))
+
+def _job_settlements(conn, params):
+    """按 days 天为一个周期，逐周期重算 [start, end] 内的结算。"""
+    start, end = int(params['start']), int(params['end'])
+    step = max(1, int(params.get('days') or 7))*86400
+    periods = [(s, min(end, s + step - 1)) for s in range(start, end, step)]
+    for i, (s, e) in enumerate(periods):
+        rc = range_db(s, e)
+        try:
+            settle_period(rc.cursor(), s, e)
+            rc.commit()
+        finally:
+            rc.close()
+        yield i + 1, len(periods)
+    return {'periods': len(periods)}
+
+JOB_KINDS = {
+    'generate': _job_generate,
+    'clear': _job_clear,
+    'rider_delete': _job_rider_delete,
+    'settlements': _job_settlements,
+}
+
+# 成批增删行的任务结束后重新统计，使查询计划跟上表的规模变化
+BULK_JOB_KINDS = ('generate', 'clear', 'rider_delete')
+
+def submit_job(kind, params=None):
+    """登记一个排队任务并返回任务 id；执行由后台线程完成。"""
+    if kind not in JOB_KINDS:
+        raise ValueError(f'unknown job kind: {kind}')
+    conn = db()
+    c = conn.cursor()
+    c.execute("INSERT INTO jobs (kind, params, state, created_ts) VALUES (?, ?, 'queued', ?)", (kind, json.dumps(params or {}, ensure_ascii=False), int(time.time())))
+    job_id = c.lastrowid
+    conn.commit()
+    conn.close()
+    _jobs_wake.set()
+    return job_id
+
+def _job_row(r):
+    job = dict(zip(JOB_FIELDS, r))
+    for k in ('params', 'result'):
+        job[k] = json.loads(job[k]) if job[k] else None
+    return job
+
+def get_job(job_id):
+    job_id = int(job_id)
+    conn = db()
+    c = conn.cursor()
+    c.execute(f'SELECT {",".join(JOB_FIELDS)} FROM jobs WHERE id=?', (job_id,))
+    row = c.fetchone()
+    conn.close()
+    return _job_row(row) if row else None
+
+def list_jobs(limit=50):
+    conn = db()
+    c = conn.cursor()
+    c.execute(f'SELECT {",".join(JOB_FIELDS)} FROM jobs ORDER BY id DESC LIMIT ?', (int(limit),))
+    rows = [_job_row(r) for r in c.fetchall()]
+    conn.close()
+    return rows
+
+def cancel_job(job_id):
+    """排队中的任务直接取消；运行中的任务在当前块提交后停止，已提交的块不回滚。"""
+    job_id = int(job_id)
+    conn = db()
+    c = conn.cursor()
+    c.execute("UPDATE jobs SET state='cancelled', finished_ts=? WHERE id=? AND state='queued'", (int(time.time()), job_id))
+    if not c.rowcount:
+        c.execute("UPDATE jobs SET cancel=1 WHERE id=? AND state='running'", (job_id,))
+    conn.commit()
+    conn.close()
+    return get_job(job_id)
+
+def run_next_job():
+    """领取并执行最早的排队任务；没有任务时返回 None。"""
+    conn = db()
+    c = conn.cursor()
+    try:
+        c.execute('BEGIN IMMEDIATE')
+        c.execute("SELECT id, kind, params FROM jobs WHERE state='queued' ORDER BY id LIMIT 1")
+        row = c.fetchone()
+        if row is None:
+            conn.rollback()
+            return None
+        job_id, kind, params = row
+        c.execute("UPDATE jobs SET state='running', started_ts=? WHERE id=?", (int(time.time()), job_id))
+        conn.commit()
+        t0 = time.perf_counter()
+        state, result, error = 'done', None, None
+        work = db()
+        try:
+            steps = JOB_KINDS[kind](work, json.loads(params or '{}'))
+            try:
+                while True:
+                    done, total = next(steps)
+                    c.execute('UPDATE jobs SET done=?, total=? WHERE id=?', (done, total, job_id))
+                    conn.commit()
+                    c.execute('SELECT cancel FROM jobs WHERE id=?', (job_id,))
+                    if c.fetchone()[0]:
+                        steps.close()
+                        state = 'cancelled'
+                        break
+            except StopIteration as stop:
+                result = stop.value
+        except Exception as e:
+            work.rollback()
+            logging.exception(e)
+            state, error = 'failed', str(e)
+        finally:
+            work.close()
+        c.execute('UPDATE jobs SET state=?, result=?, error=?, finished_ts=? WHERE id=?',
+                  (state, json.dumps(result, ensure_ascii=False) if result is not None else None, error, int(time.time()), job_id))
+        conn.commit()
+        if kind in BULK_JOB_KINDS and state != 'failed':
+            request_maintenance('analyze', 'job:' + kind)
+        logging.info(f'job {job_id} {kind} {state} in {round((time.perf_counter()-t0)*1000, 1)} ms')
+        return job_id
+    finally:
+        conn.close()
+
+def _jobs_loop():
+    # 上次进程退出时仍在运行的任务无法确定进度，标记为失败而不是重跑（生成类任务重跑会重复插入）
+    conn = db()
+    conn.execute("UPDATE jobs SET state='failed', error='interrupted', finished_ts=? WHERE state='running'", (int(time.time()),))
+    conn.commit()
+    conn.close()
+    last_prune = 0.0
+    while True:
+        try:
+            while run_next_job() is not None:
+                pass
+            if time.time() - last_prune > 3600:
+                last_prune = time.time()
+                conn = db()
+                conn.execute("DELETE FROM jobs WHERE finished_ts < ?", (int(time.time()) - jobs_cfg['keep_days']*86400,))
+                prune_changes(conn.cursor())
+                conn.commit()
+                conn.close()
+        except Exception as e:
+            logging.exception(e)
+        _jobs_wake.wait(jobs_cfg['poll'])
+        _jobs_wake.clear()
+
+# --- workers & response cache ---
+# 预派生模式下每个进程一个 WORKER_ID，只有 0 号进程运行后台线程
+WORKER_ID = 0
+_version_conn = None
+_version_pid = None
+_version_lock = threading.Lock()
+
+def is_leader():
+    return WORKER_ID == 0
+
+def data_version():
+    """返回专用只读连接上的 PRAGMA data_version：任一进程、任一其他连接提交后都会变化。"""
+    global _version_conn, _version_pid
+    with _version_lock:
+        if _version_conn is None or _version_pid != os.getpid():
+            _version_conn = sqlite3.connect(DB_PATH, check_same_thread=False)
+            _version_pid = os.getpid()
+        return _version_conn.execute('PRAGMA data_version').fetchone()[0]
+
+class ResponseCache:
+    """进程内 GET 响应缓存：数据版本变化或超过 ttl 秒即失效，LRU 淘汰。"""
+    def __init__(self, maxsize=256, ttl=30):
+        from collections import OrderedDict
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, version):
+        with self.lock:
+            item = self.items.get(key)
+            if item and item[0] == version and time.time() - item[1] < self.ttl:
+                self.items.move_to_end(key)
+                self.hits += 1
+                return item[2]
+            self.misses += 1
+            return None
+
+    def put(self, key, version, data):
+        with self.lock:
+            self.items[key] = (version, time.time(), data)
+            self.items.move_to_end(key)
+            while len(self.items) > self.maxsize:
+                self.items.popitem(last=False)
+
+response_cache = ResponseCache()
+CACHED_PATHS = {'/api/analytics.json', '/api/performance.json', '/api/mileage.json'}
+
+# --- density heatmap ---
+# 取餐/送达点或骑手位置按网格计数：服务端游标分块读取坐标，numpy.histogram2d 逐块累加到同一网格，
+# 只返回非零网格（行、列、计数），载荷不超过 max_res² 格、与数据量无关。
+# 结果按 (类型, 区间, 分辨率, 范围) 缓存；版本取对应实体在变更日志中的最新序号，其他实体的写入不会使其失效
+heatmap_cfg = {'res': 64, 'max_res': 256, 'chunk': 50000}
+# 类型 -> (数据源, 经度列, 纬度列, 时间列, 时间列单位倍数, 变更日志实体)
+HEATMAP_SOURCES = {
+    'pickup': ('v_orders', 'origin_lng', 'origin_lat', 'created_ts', 1, 'orders'),
+    'dropoff': ('v_orders', 'dest_lng', 'dest_lat', 'created_ts', 1, 'orders'),
+    'riders': ('live_points', 'lng', 'lat', 'ts', 1000, 'riders'),
+}
+heatmap_cache = ResponseCache(maxsize=64, ttl=600)
+
+def heatmap_version(entity):
+    conn = db()
+    try:
+        return conn.execute("SELECT COALESCE((SELECT MAX(seq) FROM changes WHERE entity=?), 0), COALESCE((SELECT MAX(seq) FROM changes WHERE entity='*'), 0)",
+                            (entity,)).fetchone()
+    finally:
+        conn.close()
+
+def build_heatmap(kind, start, end, res, bbox=None):
+    """统计 [start, end] 内的点；bbox 为 (minLng, minLat, maxLng, maxLat)，缺省取数据范围。
+    网格近似等距：经度方向按纬度余弦缩放，长边 res 格。"""
+    import itertools
+    import numpy as np
+    table, xcol, ycol, tcol, unit, _ = HEATMAP_SOURCES[kind]
+    conn = range_db(start, end) if table.startswith('v_') else db()
+    try:
+        c = conn.cursor()
+        where = f'{tcol} BETWEEN ? AND ? AND {xcol} IS NOT NULL AND {ycol} IS NOT NULL'
+        args = (start*unit, end*unit + unit - 1)
+        if bbox is None:
+            c.execute(f'SELECT MIN({xcol}), MIN({ycol}), MAX({xcol}), MAX({ycol}) FROM {table} WHERE {where}', args)
+            bbox = c.fetchone()
+        resp = {'kind': kind, 'start': start, 'end': end, 'total': 0, 'outside': 0, 'max': 0, 'bbox': None, 'shape': [0, 0], 'cell': None,
+                'cells': {'row': [], 'col': [], 'count': []}}
+        if bbox[0] is None:
+            return resp
+        x0, y0, x1, y1 = (float(v) for v in bbox)
+        kx = math.cos(math.radians((y0 + y1) / 2))
+        size = max((x1 - x0)*kx, y1 - y0) / res or 1e-4
+        nx, ny = max(1, math.ceil((x1 - x0)*kx / size - 1e-9)), max(1, math.ceil((y1 - y0) / size - 1e-9))
+        x1, y1 = x0 + nx*size/kx, y0 + ny*size
+        hist = np.zeros((ny, nx), dtype=np.int64)
+        total = 0
+        c.execute(f'SELECT {ycol}, {xcol} FROM {table} WHERE {where}', args)
+        while True:
+            rows = c.fetchmany(heatmap_cfg['chunk'])
+            if not rows:
+                break
+            # fromiter 直接展开元组，比 np.array(rows) 快约 3 倍
+            pts = np.fromiter(itertools.chain.from_iterable(rows), dtype=float, count=2*len(rows)).reshape(-1, 2)
+            h, _, _ = np.histogram2d(pts[:, 0], pts[:, 1], bins=(ny, nx), range=((y0, y1), (x0, x1)))
+            hist += h.astype(np.int64)
+            total += len(rows)
+    finally:
+        conn.close()
+    row, col = np.nonzero(hist)
+    counts = hist[row, col]
+    resp.update(total=total, outside=total - int(counts.sum()), max=int(counts.max()) if len(counts) else 0,
+                bbox=[round(v, 6) for v in (x0, y0, x1, y1)], shape=[ny, nx], cell=[round(size/kx, 7), round(size, 7)],
+                cells={'row': row.tolist(), 'col': col.tolist(), 'count': counts.tolist()})
+    return resp
+
+# --- in-memory order book ---
+# 监控视图只关心在途订单与近期订单：常驻内存并按 id / 骑手 / 状态建索引。本进程的写路径提交后直接写入（write-through），
+# 其他进程的写入通过变更日志追上；读取前比较 data_version，无变化时不查询数据库
+order_book_cfg = {'recent_hours': 48, 'keep_latest': 100, 'prune_interval': 60}
+DONE_STATUS = '已送达'
+
+class BookOrder:
+    __slots__ = ORDER_COLUMNS + ('eta', 'zone')
+
+    def __init__(self, row):
+        (self.id, self.rider, self.status, self.created_ts, self.pickup_ts, self.delivered_ts, self.eta_ts,
+         self.origin_lng, self.origin_lat, self.dest_lng, self.dest_lat, self.fee, self.distance, self.category) = row
+        # ETA 文本在写入时格式化一次，列表读取不再逐行 localtime
+        self.eta = eta_label(self.eta_ts)
+        self.zone = zone_of(self.origin_lng, self.origin_lat)
+
+class OrderBook:
+    """在途订单、近 recent_hours 小时订单与最新 keep_latest 单的内存副本。"""
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.by_id = {}
+        self.by_rider = {}
+        self.by_status = {}
+        self.by_zone = {}
+        self.cursor = None
+        self.version = None
+        self.pruned = 0.0
+        self.loads = 0
+        # 每次变更递增；派生视图（最新 N 单、下单时间序列）按 rev 缓存，数据不变时重复读取为 O(1)
+        self.rev = 0
+        self._derived = {}
+        # 本进程最近写入的告警 (order_id, type) -> (lng, lat, severity)；未变化的告警无需回库比对
+        self.alerts = {}
+
+    def _cached(self, key, build):
+        hit = self._derived.get(key)
+        if hit is None or hit[0] != self.rev:
+            hit = self._derived[key] = (self.rev, build())
+        return hit[1]
+
+    def _put(self, row):
+        self.rev += 1
+        o = BookOrder(row)
+        old = self.by_id.get(o.id)
+        if old is not None:
+            self._unindex(old)
+        self.by_id[o.id] = o
+        self.by_rider.setdefault(o.rider, set()).add(o.id)
+        self.by_status.setdefault(o.status, set()).add(o.id)
+        self.by_zone.setdefault(o.zone, set()).add(o.id)
+
+    def _unindex(self, o):
+        for index, key in ((self.by_rider, o.rider), (self.by_status, o.status), (self.by_zone, o.zone)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(o.id)
+                if not ids:
+                    del index[key]
+
+    def _remove(self, oid):
+        o = self.by_id.pop(oid, None)
+        if o is not None:
+            self.rev += 1
+            self._unindex(o)
+            self.alerts.pop((oid, '延迟'), None)
+            self.alerts.pop((oid, '偏航'), None)
+
+    def apply(self, rows):
+        """write-through：调用方提交 SQLite 事务后传入已写入的订单行（ORDER_COLUMNS 顺序）。"""
+        with self.lock:
+            if self.cursor is not None:
+                for r in rows:
+                    self._put(r)
+
+    def load(self):
+        conn = db()
+        c = conn.cursor()
+        try:
+            # 先取游标与版本号再读数据：读取期间的写入会在下次 sync 时重放
+            cursor, version = change_cursor(c), data_version()
+            cutoff = int(time.time()) - order_book_cfg['recent_hours']*3600
+            cols = ','.join(ORDER_COLUMNS)
+            c.execute(f'SELECT {cols} FROM orders WHERE status<>? OR created_ts>=? UNION SELECT * FROM (SELECT {cols} FROM orders ORDER BY created_ts DESC LIMIT ?)',
+                      (DONE_STATUS, cutoff, order_book_cfg['keep_latest']))
+            rows = c.fetchall()
+        finally:
+            conn.close()
+        with self.lock:
+            self.by_id, self.by_rider, self.by_status, self.by_zone, self.alerts = {}, {}, {}, {}, {}
+            self.rev += 1
+            for r in rows:
+                self._put(r)
+            self.cursor, self.version = cursor, version
+            self.loads += 1
+
+    def sync(self):
+        """读取前调用：库无变化时直接返回；否则按变更日志增量更新，游标失效时整体重载。"""
+        version = data_version()
+        with self.lock:
+            if self.cursor is None:
+                return self.load()
+            if version != self.version:
+                cursor, reset, upserts, deletes = changes_since('orders', self.cursor)
+                if reset:
+                    return self.load()
+                conn = db()
+                c = conn.cursor()
+                try:
+                    found = set()
+                    for i in range(0, len(upserts), 500):
+                        chunk = upserts[i:i+500]
+                        c.execute(f'SELECT {",".join(ORDER_COLUMNS)} FROM orders WHERE id IN ({",".join("?"*len(chunk))})', chunk)
+                        for r in c.fetchall():
+                            self._put(r)
+                            found.add(r[0])
+                finally:
+                    conn.close()
+                for oid in deletes + [k for k in upserts if k not in found]:
+                    self._remove(oid)
+                self.cursor, self.version = cursor, version
+            if time.time() - self.pruned > order_book_cfg['prune_interval']:
+                self._prune()
+
+    def _prune(self):
+        """淘汰窗口外的已送达订单，保留最新 keep_latest 单。"""
+        self.pruned = time.time()
+        cutoff = int(time.time()) - order_book_cfg['recent_hours']*3600
+        done = self.by_status.get(DONE_STATUS, ())
+        stale = [oid for oid in done if (self.by_id[oid].created_ts or 0) < cutoff]
+        if stale:
+            keep = {o.id for o in self.latest(order_book_cfg['keep_latest'])}
+            for oid in stale:
+                if oid not in keep:
+                    self._remove(oid)
+
+    def latest(self, n):
+        import heapq
+        with self.lock:
+            return self._cached(('latest', n), lambda: heapq.nlargest(n, self.by_id.values(), key=lambda o: o.created_ts or 0))
+
+    def open_orders(self):
+        with self.lock:
+            return [self.by_id[oid] for status, ids in self.by_status.items() if status != DONE_STATUS for oid in ids]
+
+    def open_load(self):
+        """各骑手的在途单量。"""
+        with self.lock:
+            done = self.by_status.get(DONE_STATUS, set())
+            return {rider: len(ids - done) for rider, ids in self.by_rider.items() if rider and len(ids - done)}
+
+    def count_created(self, lo, hi):
+        """下单时间落在 [lo, hi) 的订单数（二分查找缓存的有序时间序列）。"""
+        import bisect
+        with self.lock:
+            times = self._cached('created', lambda: sorted(int(o.created_ts) for o in self.by_id.values() if o.created_ts is not None))
+            return bisect.bisect_left(times, hi) - bisect.bisect_left(times, lo)
+
+    def zone_counts(self, lo, hi):
+        """各区域（取餐点）下单时间落在 [lo, hi) 的订单数与在途单量：{zone_id: (下单数, 在途数)}。"""
+        def build():
+            done = self.by_status.get(DONE_STATUS, set())
+            return {zone: (sum(1 for oid in ids if lo <= (self.by_id[oid].created_ts or 0) < hi), len(ids - done))
+                    for zone, ids in self.by_zone.items()}
+        with self.lock:
+            return self._cached(('zones', lo, hi), build)
+
+    def stats(self):
+        with self.lock:
+            return {'orders': len(self.by_id), 'riders': len(self.by_rider), 'cursor': self.cursor, 'loads': self.loads}
+
+order_book = OrderBook()
+
+# --- admission control ---
+# 路由分三类，优先级 ingest > default > heavy：各类有独立并发上限，并共享 total 个槽位；
+# 高优先级有排队时低优先级让行；排队已满或等待超时则以 429 快速拒绝
+admission_cfg = {
+    'total': 48,
+    'limits': {'ingest': 32, 'default': 16, 'heavy': 4},
+    'queue': {'ingest': 256, 'default': 64, 'heavy': 8},
+    'wait': 2.0,
+    # 每客户端令牌桶：(每秒令牌数, 桶容量)；ingest 带有效令牌时按骑手名，其余按客户端 IP；
+    # heavy 的 GET 只受并发槽位约束（经 Vite 代理时所有浏览器同一 IP），桶仅用于 heavy 写入
+    'rate': {'ingest': (10, 30), 'default': (50, 100), 'heavy': (2, 5)},
+    'max_generate': 50000,
+    'max_import': 5000,
+}
+ADMISSION_PRIORITY = ('ingest', 'default', 'heavy')
+INGEST_PATHS = {'/api/track-point', '/api/tracks/submit', '/api/order-event', '/api/order-upsert', '/api/alert-report'}
+HEAVY_PATHS = {'/api/analytics.json', '/api/performance.json', '/api/settlements.json', '/api/mileage.json', '/api/heatmap.json',
+               '/api/generate-orders', '/api/sample/generate', '/api/sample/clear', '/api/orders/import',
+               '/api/rider-delete', '/api/dispatch/run', '/api/settlements/recompute'}
+metrics = {'admitted': {}, 'shed': {}, 'throttled': {}, 'capped': 0}
+_metrics_lock = threading.Lock()
+
+def count_metric(kind, cls=None):
+    with _metrics_lock:
+        if cls is None:
+            metrics[kind] += 1
         else:
-            c.execute('INSERT OR REPLACE INTO orders (id,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,origin_lng,origin_lat,dest_lng,dest_lat,fee,distance) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', (oid,rider,status,created_ts,pickup_ts,delivered_ts,eta_ts,olng,olat,dlng,dlat,fee,distance))
+            metrics[kind][cls] = metrics[kind].get(cls, 0) + 1
 
-        # 2. Generate Track if delivered
-        if status == '已送达' and pickup_ts and delivered_ts:
-            # Simulate a track
-            track_dist = distance * (1.0 + random.random() * 0.3) * 1000 # meters
-            c.execute('INSERT INTO tracks (name, phone, start_ts, end_ts, distance, points) VALUES (?, ?, ?, ?, ?, ?)',
-                      (rider, stable_phone(rider), int(pickup_ts*1000), int(delivered_ts*1000), track_dist, json.dumps([])))
+def route_class(path):
+    if path in INGEST_PATHS:
+        return 'ingest'
+    if path in HEAVY_PATHS or path.startswith('/api/export/'):
+        return 'heavy'
+    return 'default'
 
-        # 3. Update Live Point (simulate current location)
-        if status in ['配送中', '延迟', '待取餐']:
-            # Random location around center
-            clng = 116.40 + (random.random() - 0.5) * 0.05
-            clat = 39.91 + (random.random() - 0.5) * 0.05
-            c.execute('INSERT OR REPLACE INTO live_points (name, lng, lat, ts) VALUES (?, ?, ?, ?)',
-                      (rider, clng, clat, int(now*1000)))
+class TokenBucket:
+    __slots__ = ('rate', 'burst', 'tokens', 'ts')
 
-    conn.commit()
-    conn.close()
+    def __init__(self, rate, burst):
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self.tokens = float(burst)
+        self.ts = time.monotonic()
 
-def _generator_loop():
-    while generator_cfg['enabled']:
-        try:
-            base = max(0, int(generator_cfg.get('rate', 0)))
-            hours = max(1, int(generator_cfg.get('hours', 1)))
-            use_ai = bool(generator_cfg.get('ai', True))
-            now = time.localtime()
-            mult = 1.0
-            if use_ai:
-                h = now.tm_hour
-                m = now.tm_min
-                import math
-                mult = 0.6 + 0.4*math.sin((m/60.0)*2*math.pi)
-                if 11 <= h <= 13:
-                    mult *= 2.2
-                elif 17 <= h <= 20:
-                    mult *= 2.6
-                elif 0 <= h <= 6:
-                    mult *= 0.3
-            count = int(round(base * mult))
-            insert_random_orders(count, hours)
-        except Exception:
-            pass
-        time.sleep(max(1, int(generator_cfg.get('interval', 5))) * 60)
+    def take(self):
+        """取一个令牌；不足时返回需要等待的秒数。"""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.ts)*self.rate)
+        self.ts = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens)/self.rate
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+def throttle(cls, client):
+    """按 (类别, 客户端) 令牌桶限流，返回 0 表示放行，否则为建议重试秒数。"""
+    key = (cls, str(client))
+    with _buckets_lock:
+        b = _buckets.get(key)
+        if b is None:
+            if len(_buckets) > 20000:
+                # 清理已回满的空闲桶，避免客户端数量无界增长
+                for k in [k for k, v in _buckets.items() if time.monotonic() - v.ts > 60]:
+                    del _buckets[k]
+            b = _buckets[key] = TokenBucket(*admission_cfg['rate'][cls])
+        wait = b.take()
+    if wait > 0:
+        count_metric('throttled', cls)
+    return wait
+
+class Admission:
+    """按类别的并发槽位与有界等待队列。"""
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.running = {k: 0 for k in ADMISSION_PRIORITY}
+        self.waiting = {k: 0 for k in ADMISSION_PRIORITY}
+
+    def _can_run(self, cls):
+        if self.running[cls] >= admission_cfg['limits'][cls]:
+            return False
+        if sum(self.running.values()) >= admission_cfg['total']:
+            return False
+        # 只有高优先级类能拿到名额时才让路；它只是被自身上限卡住时，让出空位也帮不了它
+        limits = admission_cfg['limits']
+        for higher in ADMISSION_PRIORITY[:ADMISSION_PRIORITY.index(cls)]:
+            if self.waiting[higher] and self.running[higher] < limits[higher]:
+                return False
+        return True
+
+    def acquire(self, cls):
+        with self.cond:
+            if not self._can_run(cls):
+                if self.waiting[cls] >= admission_cfg['queue'][cls]:
+                    count_metric('shed', cls)
+                    return False
+                self.waiting[cls] += 1
+                deadline = time.monotonic() + admission_cfg['wait']
+                try:
+                    while not self._can_run(cls):
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            count_metric('shed', cls)
+                            return False
+                        self.cond.wait(left)
+                finally:
+                    self.waiting[cls] -= 1
+                    self.cond.notify_all()
+            self.running[cls] += 1
+        count_metric('admitted', cls)
+        return True
+
+    def release(self, cls):
+        with self.cond:
+            self.running[cls] -= 1
+            self.cond.notify_all()
+
+    def snapshot(self):
+        with self.cond:
+            return {'running': dict(self.running), 'waiting': dict(self.waiting)}
+
+admission = Admission()
+
+# --- traffic capture ---
+# --capture PATH 时每个请求结束后追加一行 NDJSON：t 开始时间、m 方法、p 路径、q 查询串、b 请求体、s 状态码、ms 耗时、w 进程号。
+# 每行一次 O_APPEND 写入，多进程可共用同一文件；replay.py 按原到达间隔回放
+capture_cfg = {'path': None, 'max_body': 64*1024}
+_capture_fd = None
+_capture_pid = None
+
+def capture_request(rec):
+    """追加一条请求记录；写入失败只记日志，不影响请求本身。"""
+    global _capture_fd, _capture_pid
+    try:
+        if _capture_fd is None or _capture_pid != os.getpid():
+            _capture_fd = os.open(capture_cfg['path'], os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            _capture_pid = os.getpid()
+        os.write(_capture_fd, (json.dumps(rec, ensure_ascii=False, separators=(',', ':')) + '\n').encode('utf-8'))
+    except Exception as e:
+        logging.warning(f'capture failed: {e}')
+
+def start_background():
+    """启动后台线程；多进程部署时只在 0 号进程调用。"""
+    global generator_thread, backup_thread, archive_thread, jobs_thread, snapshot_thread, eta_thread, maintenance_thread, projection_thread
+    generator_thread = threading.Thread(target=_generator_loop, daemon=True)
+    generator_thread.start()
+    jobs_thread = threading.Thread(target=_jobs_loop, daemon=True)
+    jobs_thread.start()
+    if backup_cfg.get('enabled'):
+        backup_thread = threading.Thread(target=_backup_loop, daemon=True)
+        backup_thread.start()
+    if archive_cfg.get('enabled'):
+        archive_thread = threading.Thread(target=_archive_loop, daemon=True)
+        archive_thread.start()
+    if snapshot_cfg.get('enabled'):
+        snapshot_thread = threading.Thread(target=_snapshot_loop, daemon=True)
+        snapshot_thread.start()
+    if eta_cfg.get('enabled'):
+        eta_thread = threading.Thread(target=_eta_loop, daemon=True)
+        eta_thread.start()
+    if maintenance_cfg.get('enabled'):
+        maintenance_thread = threading.Thread(target=_maintenance_loop, daemon=True)
+        maintenance_thread.start()
+    if projection_cfg.get('enabled'):
+        projection_thread = threading.Thread(target=_projection_loop, daemon=True)
+        projection_thread.start()
 
 class Handler(BaseHTTPRequestHandler):
     """HTTP 请求处理器：路由 GET/POST 到具体方法。"""
+    def handle_one_request(self):
+        if not capture_cfg['path']:
+            return super().handle_one_request()
+        self.command = None
+        self._body = b''
+        self._status = None
+        t0 = time.time()
+        super().handle_one_request()
+        if not self.command:
+            return
+        parsed = urlparse(self.path)
+        body = self._body[:int(capture_cfg['max_body'])].decode('utf-8', 'replace')
+        capture_request({'t': round(t0, 3), 'm': self.command, 'p': parsed.path, 'q': parsed.query, 'b': body,
+                         's': self._status, 'ms': round((time.time()-t0)*1000, 2), 'w': WORKER_ID})
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
     def do_OPTIONS(self):
         self.send_response(204)
         cors_headers(self)
@@ -205,45 +3058,31 @@ class Handler(BaseHTTPRequestHandler):
                 logging.info(f"GET {path}")
             except Exception:
                 pass
-            if path == '/api/riders.json':
-                return self.get_riders()
-            if path == '/api/overview.json':
-                return self.get_overview()
-            if path == '/api/orders.json':
-                return self.get_orders()
-            if path == '/api/analytics.json':
-                return self.get_analytics()
-            if path == '/api/generate-orders':
-                return self.generate_orders(qs)
-            if path == '/api/sample/generate':
-                return self.sample_generate(qs)
-            if path == '/api/sample/clear':
-                return self.sample_clear()
-            if path == '/api/sample/status':
-                return self.sample_status()
-            if path == '/api/alerts.json':
-                return self.get_alerts()
-            if path == '/api/settlements.json':
-                return self.get_settlements(qs)
-            if path == '/api/performance.json':
-                return self.get_performance(qs)
-            if path == '/api/mileage.json':
-                return self.get_mileage(qs)
-            if path == '/api/tracks.json':
-                return self.get_tracks(qs)
-            if path == '/api/rider-register':
-                name = (qs.get('name',[""])[0] or '').strip()
-                phone = (qs.get('phone',[""])[0] or '').strip()
-                return self.post_rider_register({'name': name, 'phone': phone})
-            if path == '/api/rider-login':
-                name = (qs.get('name',[""])[0] or '').strip()
-                phone = (qs.get('phone',[""])[0] or '').strip()
-                return self.post_rider_login({'name': name, 'phone': phone})
+            self._cache = None
+            if path == '/api/livez':
+                return self.json({"ok": True, "uptime": max(0, int(time.time()) - START_TS), "worker": WORKER_ID, "pid": os.getpid()})
+            if path == '/api/readyz':
+                return self.get_ready()
+            if not startup_state['ready']:
+                return self.not_ready()
+            if path in CACHED_PATHS:
+                version = data_version()
+                hit = response_cache.get(self.path, version)
+                if hit is not None:
+                    data, age, built = hit
+                    if age is not None:
+                        age += int(time.time()) - built
+                    return self.send_json_bytes(200, data, cache='hit', headers=snapshot_headers(age))
+                self._cache = (self.path, version)
             if path == '/api/healthz':
                 return self.get_health()
-            self.send_response(404)
-            cors_headers(self)
-            self.end_headers()
+            cls = route_class(path)
+            if not self.admit(cls, None if cls == 'heavy' else self.client_address[0]):
+                return
+            try:
+                return self._route_get(path, qs)
+            finally:
+                admission.release(cls)
         except Exception as e:
             try:
                 logging.exception(e)
@@ -258,6 +3097,7 @@ class Handler(BaseHTTPRequestHandler):
             path = parsed.path
             length = int(self.headers.get('Content-Length', '0'))
             body = self.rfile.read(length) if length > 0 else b''
+            self._body = body
             try:
                 payload = json.loads(body.decode('utf-8')) if body else {}
             except Exception:
@@ -266,35 +3106,19 @@ class Handler(BaseHTTPRequestHandler):
                 logging.info(f"POST {path} len={len(body)}")
             except Exception:
                 pass
-            if path == '/api/rider-register':
-                return self.post_rider_register(payload)
-            if path == '/api/rider-login':
-                return self.post_rider_login(payload)
-            if path == '/api/track-point':
-                return self.post_track_point(payload)
-            if path == '/api/tracks/submit':
-                return self.post_track_submit(payload)
-            if path == '/api/order-upsert':
-                return self.post_order_upsert(payload)
-            if path == '/api/order-event':
-                return self.post_order_event(payload)
-            if path == '/api/alert-report':
-                return self.post_alert_report(payload)
-            if path == '/api/rider-delete':
-                return self.post_rider_delete(payload)
-            if path == '/api/mileage/delete-by-rider':
-                return self.post_mileage_delete_by_rider(payload)
-            if path == '/api/mileage/update':
-                return self.post_mileage_update(payload)
-            if path == '/api/generator/start':
-                return self.post_generator_start(payload)
-            if path == '/api/generator/stop':
-                return self.post_generator_stop(payload)
-            if path == '/api/orders/import':
-                return self.post_orders_import(payload)
-            self.send_response(404)
-            cors_headers(self)
-            self.end_headers()
+            # 各 POST 处理函数都按对象取字段，数组/标量请求体直接拒绝
+            if not isinstance(payload, dict):
+                return self.json_status(400, {"ok": False, "error": "body must be a JSON object"})
+            if not startup_state['ready']:
+                return self.not_ready()
+            cls = route_class(path)
+            rider = self.token_rider(payload) if cls == 'ingest' else None
+            if not self.admit(cls, ('rider', rider) if rider else self.client_address[0]):
+                return
+            try:
+                return self._route_post(path, payload)
+            finally:
+                admission.release(cls)
         except Exception as e:
             try:
                 logging.exception(e)
@@ -302,53 +3126,241 @@ class Handler(BaseHTTPRequestHandler):
                 pass
             return self.json_status(500, {"ok": False, "error": str(e)})
 
-    def json(self, obj):
-        """返回 200 JSON 响应。"""
-        data = json.dumps(obj).encode('utf-8')
-        self.send_response(200)
-        self.send_header('Content-Type', 'application/json; charset=utf-8')
-        self.send_header('Content-Length', str(len(data)))
+    def get_ready(self):
+        """就绪探针：启动准备完成前 503，完成后返回各步骤耗时（毫秒）。"""
+        if not startup_state['ready']:
+            return self.not_ready()
+        return self.json({"ok": True, **startup_state, 'steps': dict(startup_state['steps']), 'worker': WORKER_ID})
+
+    def not_ready(self):
+        state = {**startup_state, 'steps': dict(startup_state['steps']), 'worker': WORKER_ID}
+        return self.json_status(503, {"ok": False, "error": "starting", **state}, headers={'Retry-After': '1'})
+
+    def _route_get(self, path, qs):
+        if path == '/api/riders.json':
+            return self.get_riders(qs)
+        if path == '/api/overview.json':
+            return self.get_overview()
+        if path == '/api/orders.json':
+            return self.get_orders(qs)
+        if path == '/api/zones.json':
+            return self.get_zones(qs)
+        if path == '/api/heatmap.json':
+            return self.get_heatmap(qs)
+        if path == '/api/forecast.json':
+            return self.get_forecast(qs)
+        if path == '/api/analytics.json':
+            return self.get_analytics()
+        if path == '/api/generate-orders':
+            return self.generate_orders(qs)
+        if path == '/api/sample/generate':
+            return self.sample_generate(qs)
+        if path == '/api/sample/clear':
+            return self.sample_clear()
+        if path == '/api/sample/status':
+            return self.sample_status()
+        if path == '/api/alerts.json':
+            return self.get_alerts(qs)
+        if path == '/api/settlements.json':
+            return self.get_settlements(qs)
+        if path == '/api/performance.json':
+            return self.get_performance(qs)
+        if path == '/api/mileage.json':
+            return self.get_mileage(qs)
+        if path == '/api/tracks.json':
+            return self.get_tracks(qs)
+        if path == '/api/rider-register':
+            name = (qs.get('name',[""])[0] or '').strip()
+            phone = (qs.get('phone',[""])[0] or '').strip()
+            return self.post_rider_register({'name': name, 'phone': phone})
+        if path == '/api/rider-login':
+            name = (qs.get('name',[""])[0] or '').strip()
+            phone = (qs.get('phone',[""])[0] or '').strip()
+            return self.post_rider_login({'name': name, 'phone': phone})
+        if path.startswith('/api/export/'):
+            return self.get_export(path[len('/api/export/'):], qs)
+        if path == '/api/jobs.json':
+            return self.json(list_jobs())
+        if path.startswith('/api/jobs/'):
+            return self.get_job_status(path[len('/api/jobs/'):])
+        self.send_response(404)
         cors_headers(self)
         self.end_headers()
-        self.wfile.write(data)
 
-    def json_status(self, code, obj):
-        """返回带状态码的 JSON 响应。"""
+    def _route_post(self, path, payload):
+        if path.startswith('/api/jobs/') and path.endswith('/cancel'):
+            return self.post_job_cancel(path[len('/api/jobs/'):-len('/cancel')])
+        if path == '/api/settlements/recompute':
+            return self.post_settlements_recompute(payload)
+        if path == '/api/rider-register':
+            return self.post_rider_register(payload)
+        if path == '/api/rider-login':
+            return self.post_rider_login(payload)
+        if path == '/api/track-point':
+            return self.post_track_point(payload)
+        if path == '/api/tracks/submit':
+            return self.post_track_submit(payload)
+        if path == '/api/order-upsert':
+            return self.post_order_upsert(payload)
+        if path == '/api/order-event':
+            return self.post_order_event(payload)
+        if path == '/api/alert-report':
+            return self.post_alert_report(payload)
+        if path == '/api/rider-delete':
+            return self.post_rider_delete(payload)
+        if path == '/api/mileage/delete-by-rider':
+            return self.post_mileage_delete_by_rider(payload)
+        if path == '/api/mileage/update':
+            return self.post_mileage_update(payload)
+        if path == '/api/generator/start':
+            return self.post_generator_start(payload)
+        if path == '/api/generator/stop':
+            return self.post_generator_stop(payload)
+        if path == '/api/orders/import':
+            return self.post_orders_import(payload)
+        if path == '/api/dispatch/run':
+            return self.post_dispatch_run(payload)
+        self.send_response(404)
+        cors_headers(self)
+        self.end_headers()
+
+    def admit(self, cls, client):
+        """准入检查：先按客户端令牌桶限流（client 为 None 时不限流），再按路由类别申请并发槽位；失败时返回 429。"""
+        wait = throttle(cls, client) if client is not None else 0
+        if wait > 0:
+            self.json_status(429, {"ok": False, "error": "rate limited"}, headers={'Retry-After': str(max(1, int(wait + 0.999)))})
+            return False
+        if not admission.acquire(cls):
+            self.json_status(429, {"ok": False, "error": "server busy"}, headers={'Retry-After': '1'})
+            return False
+        return True
+
+    def json(self, obj, snapshot_age=None):
+        """返回 200 JSON 响应；可缓存的路由同时写入响应缓存。读自分析快照时带 X-Snapshot-Age（秒）。"""
         data = json.dumps(obj).encode('utf-8')
+        cache = getattr(self, '_cache', None)
+        if cache:
+            response_cache.put(cache[0], cache[1], (data, snapshot_age, int(time.time())))
+        self.send_json_bytes(200, data, cache='miss' if cache else None, headers=snapshot_headers(snapshot_age))
+
+    def send_json_bytes(self, code, data, cache=None, headers=None):
         self.send_response(code)
         self.send_header('Content-Type', 'application/json; charset=utf-8')
         self.send_header('Content-Length', str(len(data)))
+        if cache:
+            self.send_header('X-Cache', cache)
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
         cors_headers(self)
         self.end_headers()
         self.wfile.write(data)
 
-    def get_health(self):
-        """健康检查：统计核心表并返回运行时信息。"""
+    def json_status(self, code, obj, headers=None):
+        """返回带状态码的 JSON 响应。"""
+        self.send_json_bytes(code, json.dumps(obj).encode('utf-8'), headers=headers)
+
+    # 导出规格：(数据源, 时间列, 时间列单位倍数)；orders/tracks 走区间视图以包含归档分区
+    EXPORTS = {
+        'orders': ('v_orders', 'created_ts', 1),
+        'tracks': ('v_tracks', 'end_ts', 1000),
+        'settlements': ('settlements', 'period_start_ts', 1),
+        'alerts': ('alerts', 'ts', 1),
+    }
+
+    def get_export(self, kind, qs):
+        """流式导出 CSV/NDJSON：服务端游标 fetchmany 分批读取，分块传输写出，可选 gzip。"""
+        import csv
+        import io
+        import zlib
+        spec = self.EXPORTS.get(kind.replace('.json', '').replace('.csv', ''))
+        if spec is None:
+            return self.json_status(404, {'ok': False, 'error': 'unknown export'})
+        fmt = (qs.get('format', ['csv'])[0] or 'csv').lower()
+        if fmt not in ('csv', 'ndjson'):
+            return self.json_status(400, {'ok': False, 'error': 'format must be csv or ndjson'})
+        gz = (qs.get('gzip', [''])[0] or '').lower() in ('1', 'true', 'yes')
+        start = int((qs.get('start',[0])[0])) if qs.get('start') else 0
+        end = int((qs.get('end',[0])[0])) if qs.get('end') else 0
+        if not (start and end):
+            end = int(time.time())
+            start = end - 7*24*3600
+        table, col, unit = spec
+        conn = range_db(start, end)
         try:
-            conn = db()
             c = conn.cursor()
-            c.execute('SELECT COUNT(*) FROM orders')
-            orders = c.fetchone()[0] or 0
-            c.execute('SELECT COUNT(DISTINCT name) FROM live_points WHERE ts > strftime("%s","now")*1000 - 5*60*1000')
-            online = c.fetchone()[0] or 0
-            try:
-                c.execute("SELECT COUNT(*) FROM alerts WHERE ts > strftime('%s','now')*1000 - 24*60*60*1000")
-                alerts = c.fetchone()[0] or 0
-            except Exception:
-                alerts = 0
+            c.execute(f'SELECT * FROM {table} WHERE {col} BETWEEN ? AND ? ORDER BY {col}', (start*unit, end*unit + unit - 1))
+            cols = [d[0] for d in c.description]
+            # 分块传输仅 HTTP/1.1 支持；HTTP/1.0 客户端以关闭连接作为结束
+            chunked = self.request_version == 'HTTP/1.1'
+            if chunked:
+                self.protocol_version = 'HTTP/1.1'
+            self.close_connection = True
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv; charset=utf-8' if fmt == 'csv' else 'application/x-ndjson; charset=utf-8')
+            self.send_header('Content-Disposition', f'attachment; filename="{kind}-{start}-{end}.{fmt}{".gz" if gz else ""}"')
+            if gz:
+                self.send_header('Content-Encoding', 'gzip')
+            if chunked:
+                self.send_header('Transfer-Encoding', 'chunked')
+            self.send_header('Connection', 'close')
+            cors_headers(self)
+            self.end_headers()
+            comp = zlib.compressobj(6, zlib.DEFLATED, 31) if gz else None
+            def emit(data, final=False):
+                if comp:
+                    data = comp.compress(data) + (comp.flush() if final else b'')
+                if data:
+                    self.wfile.write(b'%x\r\n%b\r\n' % (len(data), data) if chunked else data)
+            buf = io.StringIO()
+            writer = csv.writer(buf)
+            if fmt == 'csv':
+                buf.write('\ufeff')
+                writer.writerow(cols)
+            rows = 0
+            while True:
+                batch = c.fetchmany(2000)
+                if not batch:
+                    break
+                rows += len(batch)
+                if fmt == 'csv':
+                    writer.writerows(batch)
+                else:
+                    for r in batch:
+                        buf.write(json.dumps(dict(zip(cols, r)), ensure_ascii=False))
+                        buf.write('\n')
+                emit(buf.getvalue().encode('utf-8'))
+                buf.seek(0)
+                buf.truncate()
+            emit(buf.getvalue().encode('utf-8'), final=True)
+            if chunked:
+                self.wfile.write(b'0\r\n\r\n')
+            logging.info(f'export {kind} {fmt} rows={rows} gzip={gz}')
+        finally:
             conn.close()
+
+    def get_health(self):
+        """健康检查：返回缓存的核心计数与运行时信息。"""
+        try:
+            counts = health_counts()
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
         uptime = max(0, int(time.time()) - START_TS)
-        status = {"ok": True, "uptime": uptime, "orders": orders, "onlineRiders": online, "alerts": alerts}
+        status = {"ok": True, "uptime": uptime, **counts, "worker": WORKER_ID, "pid": os.getpid(), "startup": {'ready_ms': startup_state['ready_ms'], 'steps': dict(startup_state['steps'])},
+                  "admission": {**admission.snapshot(), **metrics}, "orderBook": order_book.stats(),
+                  "cache": {"hits": response_cache.hits, "misses": response_cache.misses}, "backup": dict(backup_stats),
+                  "snapshot": {**snapshot_stats, 'current': current_snapshot()}, "forecast": dict(forecast_stats), "eta": dict(eta_stats), "projection": dict(projection_stats),
+                  "maintenance": {k: dict(v) if isinstance(v, dict) else v for k, v in maintenance_stats.items()}}
         return self.json(status)
 
-    def get_riders(self):
+    def get_riders(self, qs):
+        if 'since' in qs:
+            return self.delta('riders', qs, self.rider_list, self.rider_items)
         conn = db()
         c = conn.cursor()
         try:
             c.execute('SELECT DISTINCT rider FROM orders')
             order_riders = [r[0] for r in c.fetchall()]
+            repaired = []
             for nm in order_riders:
                 if not nm:
                     continue
@@ -356,50 +3368,105 @@ class Handler(BaseHTTPRequestHandler):
                 row = c.fetchone()
                 if row is None:
                     c.execute('INSERT INTO riders (name, phone) VALUES (?, ?)', (nm, stable_phone(nm)))
+                    repaired.append(nm)
                 else:
                     ph = (row[0] or '').strip()
                     if ph == '':
                         c.execute('UPDATE riders SET phone=? WHERE name=?', (stable_phone(nm), nm))
+                        repaired.append(nm)
+            record_changes(c, 'riders', repaired)
             conn.commit()
         except Exception:
             pass
-        c.execute('SELECT name, phone FROM riders')
-        riders = c.fetchall()
-        from time import time
-        now = int(time()*1000)
-        res = []
-        for name, phone in riders:
-            c.execute('SELECT lng, lat, ts FROM live_points WHERE name=? ORDER BY ts DESC LIMIT 1', (name,))
-            rp = c.fetchone()
-            if rp:
-                lng, lat, ts = rp
-                status = '在线' if (ts and now - int(ts) < 5*60*1000) else '离线'
-                res.append({'name': name, 'phone': phone, 'status': status, 'lng': lng, 'lat': lat, 'last': int(ts or 0)})
-            else:
-                res.append({'name': name, 'phone': phone, 'status': '离线', 'lng': None, 'lat': None, 'last': 0})
-        c.execute('SELECT DISTINCT name FROM live_points')
-        extras = [r[0] for r in c.fetchall()]
-        for name in extras:
-            if any(x['name'] == name for x in res):
-                continue
-            c.execute('SELECT lng, lat, ts FROM live_points WHERE name=? ORDER BY ts DESC LIMIT 1', (name,))
-            rp = c.fetchone()
-            if rp:
-                lng, lat, ts = rp
-                status = '在线' if (ts and now - int(ts) < 5*60*1000) else '离线'
-                res.append({'name': name, 'phone': '', 'status': status, 'lng': lng, 'lat': lat, 'last': int(ts or 0)})
+        columnar, precision = self.columnar_args(qs)
+        if columnar:
+            cols = self.columns(self.rider_rows(c), ('name', 'phone', 'lng', 'lat', 'last'), precision)
+            conn.close()
+            now = int(time.time()*1000)
+            cols['status'] = [self.rider_status(ts, now) for ts in cols['last']]
+            cols['last'] = [int(ts or 0) for ts in cols['last']]
+            return self.json(cols)
+        res = self.rider_list(c)
         conn.close()
         return self.json(res)
 
-    def get_overview(self):
+    # 每个骑手一行：登记信息 + 最新位置（按 (name, ts) 索引逐个定位，单条语句完成）
+    RIDER_ROWS_SQL = ("SELECT n.name, CASE WHEN r.name IS NULL THEN '' ELSE r.phone END, p.lng, p.lat, p.ts, r.name IS NOT NULL FROM ({names}) n "
+                      "LEFT JOIN riders r ON r.name = n.name "
+                      "LEFT JOIN live_points p ON p.rowid = (SELECT rowid FROM live_points WHERE name = n.name ORDER BY ts DESC LIMIT 1)")
+
+    def rider_rows(self, c, names=None):
+        """返回 (name, phone, lng, lat, ts) 行；names 为空时为全部已登记骑手加上只有位置上报的骑手。"""
+        if names is None:
+            c.execute(self.RIDER_ROWS_SQL.format(names='SELECT name FROM riders UNION ALL SELECT DISTINCT name FROM live_points WHERE name NOT IN (SELECT name FROM riders)'))
+        else:
+            c.execute(self.RIDER_ROWS_SQL.format(names='SELECT value AS name FROM json_each(?)'), (json.dumps(list(names)),))
+        # 既未登记也无位置的名字视为已删除
+        return [r[:5] for r in c.fetchall() if r[5] or r[4] is not None]
+
+    def rider_status(self, ts, now):
+        return '在线' if (ts and now - int(ts) < 5*60*1000) else '离线'
+
+    def rider_item(self, row, now):
+        name, phone, lng, lat, ts = row
+        return {'name': name, 'phone': phone, 'status': self.rider_status(ts, now), 'lng': lng, 'lat': lat, 'last': int(ts or 0)}
+
+    def rider_list(self, c):
+        now = int(time.time()*1000)
+        return [self.rider_item(r, now) for r in self.rider_rows(c)]
+
+    def rider_items(self, c, names):
+        now = int(time.time()*1000)
+        res = [self.rider_item(r, now) for r in self.rider_rows(c, names)]
+        return res, {x['name'] for x in res}
+
+    def columnar_args(self, qs):
+        """解析 format=columnar 与 precision=（坐标小数位，0-8）；返回 (是否按列, precision 或 None)。"""
+        if (qs.get('format', [''])[0] or '') != 'columnar':
+            return False, None
+        try:
+            return True, min(max(int(qs['precision'][0]), 0), 8)
+        except (KeyError, ValueError):
+            return True, None
+
+    def columns(self, rows, names, precision=None, coords=('lng', 'lat')):
+        """游标行直接转置为按列的 dict（struct-of-arrays），不构造逐行 dict；precision 作用于坐标列。"""
+        cols = dict(zip(names, map(list, zip(*rows)))) if rows else {k: [] for k in names}
+        if precision is not None:
+            for k in coords:
+                if k in cols:
+                    cols[k] = [None if v is None else round(v, precision) for v in cols[k]]
+        return cols
+
+    def delta(self, entity, qs, full, fetch):
+        """since= 增量响应：游标之后变更的行与已删除的主键，以及新游标；游标失效时 reset=true 并返回全量。"""
+        try:
+            since = int(qs['since'][0] or 0)
+        except ValueError:
+            return self.json_status(400, {'ok': False, 'error': 'bad since'})
+        cursor, reset, keys, deleted = changes_since(entity, since)
         conn = db()
         c = conn.cursor()
         try:
-            c.execute("SELECT COUNT(*) FROM orders WHERE date(created_ts, 'unixepoch', 'localtime') = date('now','localtime')")
-            orders_total = c.fetchone()[0] or 0
-        except Exception:
-            c.execute('SELECT COUNT(*) FROM orders')
-            orders_total = c.fetchone()[0] or 0
+            if reset:
+                items = full(c)
+            else:
+                items, found = fetch(c, keys)
+                deleted += [k for k in keys if k not in found]
+        finally:
+            conn.close()
+        return self.json({'cursor': cursor, 'reset': reset, 'items': items, 'deleted': deleted})
+
+    def get_overview(self):
+        import time as _t
+        now = int(_t.time())
+        start = now - 5*3600
+        # 今日单量与近 6 小时分布取自内存订单簿（覆盖近 48 小时的全部订单）
+        order_book.sync()
+        midnight = local_midnight(local_bucket(now)[0])
+        orders_total = order_book.count_created(midnight, midnight + 86400)
+        conn = db()
+        c = conn.cursor()
         c.execute('SELECT COUNT(DISTINCT name) FROM live_points WHERE ts > strftime("%s","now")*1000 - 5*60*1000')
         online = c.fetchone()[0] or 0
         try:
@@ -407,21 +3474,14 @@ class Handler(BaseHTTPRequestHandler):
             alerts_cnt = c.fetchone()[0] or 0
         except Exception:
             alerts_cnt = 0
-        import time as _t
-        now = int(_t.time())
-        start = now - 5*3600
-        try:
-            c.execute("SELECT strftime('%H:00', created_ts, 'unixepoch', 'localtime') as h, COUNT(*) FROM orders WHERE created_ts BETWEEN ? AND ? GROUP BY h", (start, now))
-            rows = c.fetchall()
-        except Exception:
-            rows = []
         conn.close()
         labels = []
         for i in range(5, -1, -1):
-            t = _t.localtime(now - i*3600)
-            labels.append(f"{t.tm_hour:02d}:00")
-        counts_map = {r[0]: int(r[1] or 0) for r in rows}
-        series = [counts_map.get(l, 0) for l in labels]
+            labels.append(f"{local_bucket(now - i*3600)[1]:02d}:00")
+        # 各小时桶：最早一桶从 start 起，其余为整点边界，当前小时截至 now
+        hour = now - (now + local_offset(now)) % 3600
+        edges = [start] + [hour - i*3600 for i in range(4, -1, -1)] + [now + 1]
+        series = [order_book.count_created(edges[i], edges[i+1]) for i in range(6)]
         resp = {
             'kpi': {
                 'orders': orders_total,
@@ -436,34 +3496,143 @@ class Handler(BaseHTTPRequestHandler):
         }
         return self.json(resp)
 
-    def get_orders(self):
-        conn = db()
-        c = conn.cursor()
+    def get_zones(self, qs):
+        """各配送区域 KPI：下单数（默认今日，可传 start/end）、在途单、在线骑手（最新位置在 5 分钟内）、近 24 小时延迟与偏航告警。"""
         try:
-            c.execute('SELECT id, rider, status, eta_ts, category FROM orders ORDER BY created_ts DESC LIMIT 100')
-            rows = c.fetchall()
-        except Exception:
-            c.execute('SELECT id, rider, status, eta_ts FROM orders ORDER BY created_ts DESC LIMIT 100')
-            rows = [r + (None,) for r in c.fetchall()]
-        conn.close()
+            now = int(time.time())
+            start = int(qs['start'][0]) if qs.get('start') else 0
+            end = int(qs['end'][0]) if qs.get('end') else 0
+            # 今日单量与在途单取自订单簿按区域的索引，订单写入时已按取餐点记录区域
+            order_book.sync()
+            midnight = local_midnight(local_bucket(now)[0])
+            book = order_book.zone_counts(midnight, midnight + 86400)
+            created = {z: v[0] for z, v in book.items()}
+            if start and end:
+                conn = range_db(start, end)
+                try:
+                    c = conn.cursor()
+                    c.execute('SELECT zone_id, COUNT(*) FROM v_orders WHERE created_ts BETWEEN ? AND ? GROUP BY zone_id', (start, end))
+                    created = dict(c.fetchall())
+                finally:
+                    conn.close()
+            conn = db()
+            try:
+                c = conn.cursor()
+                c.execute('SELECT p.zone_id, COUNT(*) FROM riders r JOIN live_points p ON p.rowid = (SELECT rowid FROM live_points WHERE name = r.name ORDER BY ts DESC LIMIT 1) '
+                          'WHERE p.ts > ? GROUP BY p.zone_id', ((now - 5*60)*1000,))
+                online = dict(c.fetchall())
+                # 服务端生成的告警 ts 为秒，上报的为毫秒，两种单位都按近 24 小时计
+                since = now - 24*3600
+                c.execute('SELECT zone_id, type, COUNT(*) FROM alerts WHERE ts >= ? AND (ts < 100000000000 OR ts >= ?) GROUP BY zone_id, type', (since, since*1000))
+                alerts = {}
+                for zone, type_, n in c.fetchall():
+                    alerts.setdefault(zone, {})[type_] = n
+            finally:
+                conn.close()
+            def item(zid, name):
+                return {'id': zid, 'name': name, 'orders': created.get(zid, 0), 'open': book.get(zid, (0, 0))[1],
+                        'onlineRiders': online.get(zid, 0), 'delays': alerts.get(zid, {}).get('延迟', 0), 'offRoute': alerts.get(zid, {}).get('偏航', 0)}
+            return self.json({'zones': [item(zid, name) for zid, name, _ in zone_index().zones], 'unzoned': item(None, '区域外')})
+        except Exception as e:
+            return self.json_status(500, {'ok': False, 'error': str(e)})
+
+    def get_heatmap(self, qs):
+        """密度热力图：?start=&end=&kind=pickup|dropoff|riders&res=&bbox=minLng,minLat,maxLng,maxLat，返回稀疏网格。"""
+        try:
+            kind = qs.get('kind', ['pickup'])[0] or 'pickup'
+            if kind not in HEATMAP_SOURCES:
+                return self.json_status(400, {'ok': False, 'error': 'kind must be pickup, dropoff or riders'})
+            res = min(max(int(qs.get('res', [0])[0] or heatmap_cfg['res']), 1), heatmap_cfg['max_res'])
+            start = int(qs['start'][0]) if qs.get('start') else 0
+            end = int(qs['end'][0]) if qs.get('end') else 0
+            if not (start and end):
+                # 缺省为截至当前分钟的近 24 小时，同一分钟内的重复请求可命中缓存
+                end = int(time.time()) // 60 * 60 + 59
+                start = end - 24*3600 + 1
+            bbox = None
+            if qs.get('bbox'):
+                bbox = tuple(float(v) for v in qs['bbox'][0].split(','))
+                if len(bbox) != 4 or not (bbox[0] < bbox[2] and bbox[1] < bbox[3]):
+                    return self.json_status(400, {'ok': False, 'error': 'bbox must be minLng,minLat,maxLng,maxLat'})
+            key = (kind, start, end, res, bbox)
+            version = heatmap_version(HEATMAP_SOURCES[kind][5])
+            data = heatmap_cache.get(key, version)
+            if data is not None:
+                return self.send_json_bytes(200, data, cache='hit')
+            data = json.dumps(build_heatmap(kind, start, end, res, bbox)).encode('utf-8')
+            heatmap_cache.put(key, version, data)
+            return self.send_json_bytes(200, data, cache='miss')
+        except ValueError as e:
+            return self.json_status(400, {'ok': False, 'error': str(e)})
+        except Exception as e:
+            return self.json_status(500, {'ok': False, 'error': str(e)})
+
+    def get_forecast(self, qs):
+        """未来 hours 小时（默认 24，最多 72）各品类与合计的预测下单量，low/high 为合计的 80% 区间。"""
+        try:
+            import numpy as np
+            n = min(max(int(qs.get('hours', [0])[0] or 24), 1), forecast_cfg['max_hours'])
+            model = forecast_model()
+            start = int(time.time())//3600*3600
+            hours = np.arange(n, dtype=np.int64)*3600 + start
+            cats, mean, sd = forecast_profile(model, hours)
+            total = mean.sum(axis=0)
+            spread = 1.2816*np.sqrt((sd*sd).sum(axis=0))
+            labels = []
+            for h in hours.tolist():
+                d, hr = local_bucket(h)
+                labels.append(f'{d[5:]} {hr:02d}:00')
+            return self.json({
+                'start': start, 'hours': n, 'labels': labels, 'ts': hours.tolist(),
+                'total': np.round(total, 2).tolist(),
+                'low': np.round(np.maximum(total - spread, 0), 2).tolist(),
+                'high': np.round(total + spread, 2).tolist(),
+                'categories': {cat: np.round(mean[i], 2).tolist() for i, cat in enumerate(cats)},
+                'model': {'trainedThrough': model['until'], 'historyHours': forecast_stats['hours'],
+                          'halfLifeWeeks': forecast_cfg['half_life_weeks'], 'fitMs': forecast_stats['fit_ms']},
+            })
+        except ValueError as e:
+            return self.json_status(400, {'ok': False, 'error': str(e)})
+        except Exception as e:
+            return self.json_status(500, {'ok': False, 'error': str(e)})
+
+    def get_orders(self, qs):
+        if 'since' in qs:
+            return self.delta('orders', qs, self.order_list, self.order_items)
+        if self.columnar_args(qs)[0]:
+            order_book.sync()
+            latest = order_book.latest(100)
+            return self.json({k: [getattr(o, k) for o in latest] for k in ('id', 'rider', 'status', 'eta', 'category')})
+        return self.json(self.order_list())
+
+    def order_item(self, row):
+        oid, rider, status, eta_ts, category = row
+        item = {'id': oid, 'rider': rider, 'status': status, 'eta': eta_label(eta_ts)}
+        if category is not None:
+            item['category'] = category
+        return item
+
+    def order_list(self, c=None):
+        """最新 100 单，取自内存订单簿（c 仅为与其他列表函数签名一致）。"""
+        order_book.sync()
         res = []
-        for oid, rider, status, eta_ts, category in rows:
-            if eta_ts:
-                import time
-                t = time.localtime(int(eta_ts))
-                eta = f"{t.tm_hour:02d}:{t.tm_min:02d}"
-            else:
-                eta = ''
-            item = {'id': oid, 'rider': rider, 'status': status, 'eta': eta}
-            if category is not None:
-                item['category'] = category
+        for o in order_book.latest(100):
+            item = {'id': o.id, 'rider': o.rider, 'status': o.status, 'eta': o.eta}
+            if o.category is not None:
+                item['category'] = o.category
             res.append(item)
-        return self.json(res)
+        return res
+
+    def order_items(self, c, ids):
+        res = []
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i+500]
+            c.execute(f'SELECT id, rider, status, eta_ts, category FROM orders WHERE id IN ({",".join("?"*len(chunk))})', chunk)
+            res += [self.order_item(r) for r in c.fetchall()]
+        return res, {x['id'] for x in res}
 
     def get_analytics(self):
         from time import time as _time
-        conn = db()
-        c = conn.cursor()
         start = 0
         end = 0
         try:
@@ -477,62 +3646,81 @@ class Handler(BaseHTTPRequestHandler):
         if not (start and end):
             end = int(_time())
             start = end - 7*24*3600
+        conn, age = analytics_db(start, end)
+        c = conn.cursor()
         try:
-            c.execute('SELECT strftime("%H:00", created_ts, "unixepoch", "localtime") as h, COUNT(*) FROM orders WHERE created_ts BETWEEN ? AND ? GROUP BY h ORDER BY h', (start, end))
-            time_rows = c.fetchall()
+            c.execute('SELECT local_hour, COUNT(*) FROM v_orders WHERE created_ts BETWEEN ? AND ? GROUP BY local_hour ORDER BY local_hour', (start, end))
+            time_rows = [(f'{h:02d}:00' if h is not None else None, n) for h, n in c.fetchall()]
         except Exception:
             time_rows = []
         labels = [r[0] for r in time_rows]
         orders_cnt = [int(r[1] or 0) for r in time_rows]
         try:
-            c.execute('SELECT COALESCE(category, "未分类") as cat, COUNT(*) FROM orders WHERE created_ts BETWEEN ? AND ? GROUP BY cat ORDER BY COUNT(*) DESC', (start, end))
+            c.execute('SELECT COALESCE(category, "未分类") as cat, COUNT(*) FROM v_orders WHERE created_ts BETWEEN ? AND ? GROUP BY cat ORDER BY COUNT(*) DESC', (start, end))
             cat_rows = c.fetchall()
         except Exception:
             cat_rows = []
         cat_labels = [r[0] for r in cat_rows]
         cat_counts = [int(r[1] or 0) for r in cat_rows]
-        try:
-            c.execute('SELECT status, COUNT(*) FROM orders WHERE created_ts BETWEEN ? AND ? GROUP BY status', (start, end))
-            status_rows = c.fetchall()
-        except Exception:
-            status_rows = []
         conn.close()
-        status_map = {r[0]: int(r[1] or 0) for r in status_rows}
-        steps = ['待取餐','配送中','延迟','已送达']
-        funnel = [{'name': s, 'value': status_map.get(s, 0)} for s in steps]
+        funnel, stages = lifecycle_summary(start, end)
         resp = {
             'time': {'labels': labels, 'orders': orders_cnt},
             'category': {'labels': cat_labels, 'counts': cat_counts},
-            'funnel': funnel
+            'funnel': funnel,
+            'stages': stages
         }
-        return self.json(resp)
+        return self.json(resp, snapshot_age=age)
+
+    def size_capped(self, n, limit):
+        if n <= limit:
+            return False
+        count_metric('capped')
+        self.json_status(413, {'ok': False, 'error': f'at most {limit} per request'})
+        return True
 
     def generate_orders(self, qs):
         count = int((qs.get('count',[0])[0]) or 0) or 100
         hours = int((qs.get('hours',[0])[0]) or 0) or 6
-        insert_random_orders(count, hours)
-        return self.json({'ok': True, 'inserted': count})
+        if self.size_capped(count, admission_cfg['max_generate']):
+            return
+        return self.job_accepted(submit_job('generate', {'count': count, 'hours': hours}), count=count)
 
     def sample_generate(self, qs):
         count = int((qs.get('count',[0])[0]) or 0) or 100
         hours = int((qs.get('hours',[0])[0]) or 0) or 6
-        insert_random_orders(count, hours)
-        return self.json({'ok': True, 'inserted': count})
+        if self.size_capped(count, admission_cfg['max_generate']):
+            return
+        return self.job_accepted(submit_job('generate', {'count': count, 'hours': hours}), count=count)
 
     def sample_clear(self):
         try:
-            conn = db()
-            c = conn.cursor()
-            c.execute('DELETE FROM alerts')
-            c.execute('DELETE FROM order_events')
-            c.execute('DELETE FROM settlements')
-            c.execute('DELETE FROM orders')
-            conn.commit()
-            conn.close()
-            return self.json({'ok': True})
+            return self.job_accepted(submit_job('clear'))
         except Exception as e:
             return self.json_status(500, {'ok': False, 'error': str(e)})
 
+    def job_accepted(self, job_id, **extra):
+        """任务已入队：返回 202 与任务 id，进度通过 /api/jobs/{id} 查询。"""
+        return self.json_status(202, {'ok': True, 'job': job_id, 'status': f'/api/jobs/{job_id}', **extra})
+
+    def get_job_status(self, job_id):
+        try:
+            job = get_job(job_id)
+        except ValueError:
+            job = None
+        if job is None:
+            return self.json_status(404, {'ok': False, 'error': 'no such job'})
+        return self.json({'ok': True, **job})
+
+    def post_job_cancel(self, job_id):
+        try:
+            job = cancel_job(job_id)
+        except ValueError:
+            job = None
+        if job is None:
+            return self.json_status(404, {'ok': False, 'error': 'no such job'})
+        return self.json({'ok': True, **job})
+
     def sample_status(self):
         try:
             conn = db()
@@ -548,14 +3736,36 @@ class Handler(BaseHTTPRequestHandler):
         except Exception as e:
             return self.json_status(500, {'ok': False, 'error': str(e)})
 
-    def get_alerts(self):
+    def get_alerts(self, qs):
         self.generate_alerts()
+        if 'since' in qs:
+            return self.delta('alerts', qs, self.alert_list, self.alert_items)
         conn = db()
         c = conn.cursor()
-        c.execute('SELECT order_id, rider, type, lng, lat FROM alerts ORDER BY ts DESC LIMIT 100')
-        rows = c.fetchall()
+        columnar, precision = self.columnar_args(qs)
+        if columnar:
+            c.execute('SELECT order_id, rider, type, lng, lat FROM alerts ORDER BY ts DESC LIMIT 100')
+            res = self.columns(c.fetchall(), ('orderId', 'rider', 'type', 'lng', 'lat'), precision)
+        else:
+            res = self.alert_list(c)
         conn.close()
-        return self.json([{'orderId': r[0], 'rider': r[1], 'type': r[2], 'lng': r[3], 'lat': r[4]} for r in rows])
+        return self.json(res)
+
+    def alert_list(self, c):
+        c.execute('SELECT order_id, rider, type, lng, lat FROM alerts ORDER BY ts DESC LIMIT 100')
+        return [{'orderId': r[0], 'rider': r[1], 'type': r[2], 'lng': r[3], 'lat': r[4]} for r in c.fetchall()]
+
+    def alert_items(self, c, keys):
+        """按主键 orderId|type 取每类告警的最新一条。"""
+        res, found = [], set()
+        for key in keys:
+            order_id, _, type_ = key.rpartition('|')
+            c.execute('SELECT order_id, rider, type, lng, lat FROM alerts WHERE order_id=? AND type=? ORDER BY ts DESC LIMIT 1', (order_id, type_))
+            r = c.fetchone()
+            if r:
+                res.append({'orderId': r[0], 'rider': r[1], 'type': r[2], 'lng': r[3], 'lat': r[4]})
+                found.add(key)
+        return res, found
 
     def haversine(self, a, b):
         from math import radians, sin, cos, asin, sqrt
@@ -567,48 +3777,50 @@ class Handler(BaseHTTPRequestHandler):
         h = sin(dlat/2)**2 + cos(lat1)*cos(lat2)*sin(dlon/2)**2
         return 2*R*asin(sqrt(h))
 
-    def point_segment_distance(self, p, a, b):
-        import math
-        def to_xy(lng, lat):
-            x = lng*math.pi/180*6378137
-            y = math.log(math.tan((90+lat)*math.pi/360))*6378137
-            return (x, y)
-        px, py = to_xy(p[0], p[1])
-        ax, ay = to_xy(a[0], a[1])
-        bx, by = to_xy(b[0], b[1])
-        vx, vy = bx-ax, by-ay
-        wx, wy = px-ax, py-ay
-        c1 = vx*wx + vy*wy
-        if c1 <= 0: return math.hypot(px-ax, py-ay)
-        c2 = vx*vx + vy*vy
-        if c2 <= c1: return math.hypot(px-bx, py-by)
-        t = c1/c2
-        cx, cy = ax + t*vx, ay + t*vy
-        return math.hypot(px-cx, py-cy)
-
     def generate_alerts(self):
         from time import time
         now = int(time())
+        # 只检查内存订单簿中的在途订单（已送达的历史订单不再参与偏航判断），骑手最新位置一次查询取回
+        order_book.sync()
+        orders = order_book.open_orders()
         conn = db()
         c = conn.cursor()
-        c.execute('SELECT id, rider, status, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat FROM orders')
-        orders = c.fetchall()
+        c.execute('SELECT name, lng, lat, ts FROM live_points WHERE rowid IN (SELECT (SELECT rowid FROM live_points WHERE name = n.value ORDER BY ts DESC LIMIT 1) FROM json_each(?) n)',
+                  (json.dumps(list({o.rider for o in orders if o.rider})),))
+        points = {r[0]: r[1:3] for r in c.fetchall() if r[1] is not None and r[2] is not None}
+        orders = [o for o in orders if o.rider in points]
+        # 预测送达晚于承诺时间的在途订单同样记为延迟
+        c.execute('SELECT id FROM orders WHERE eta_pred_ts > eta_ts')
+        late = {r[0] for r in c.fetchall()}
         alerts = []
-        for oid, rider, status, eta_ts, olng, olat, dlng, dlat in orders:
-            c.execute('SELECT lng, lat, ts FROM live_points WHERE name=? ORDER BY ts DESC LIMIT 1', (rider,))
-            rp = c.fetchone()
-            if rp:
-                rlng, rlat, rts = rp
-                if eta_ts and now > int(eta_ts) and status != '已送达':
-                    alerts.append((oid, rider, '延迟', now, rlng, rlat, 2))
-                if olng is not None and dlng is not None:
-                    d = self.point_segment_distance((rlng, rlat), (olng, olat), (dlng, dlat))
-                    if d > 500:
-                        alerts.append((oid, rider, '偏航', now, rlng, rlat, 3))
-        for order_id, rider, type_, ts, lng, lat, sev in alerts:
-            c.execute('DELETE FROM alerts WHERE order_id=? AND type=?', (order_id, type_))
-            c.execute('INSERT INTO alerts (order_id, rider, type, ts, lng, lat, severity) VALUES (?,?,?,?,?,?,?)', (order_id, rider, type_, ts, lng, lat, sev))
-        conn.commit()
+        for o in orders:
+            if (o.eta_ts and now > int(o.eta_ts)) or o.id in late:
+                alerts.append((o.id, o.rider, '延迟', now) + points[o.rider] + (2,))
+        routed = [o for o in orders if None not in (o.origin_lng, o.origin_lat, o.dest_lng, o.dest_lat)]
+        if routed:
+            import numpy as np
+            pos = np.array([points[o.rider] for o in routed], dtype=float)
+            seg = np.array([(o.origin_lng, o.origin_lat, o.dest_lng, o.dest_lat) for o in routed], dtype=float)
+            dist = point_segment_distance_np(pos[:, 0], pos[:, 1], seg[:, 0], seg[:, 1], seg[:, 2], seg[:, 3])
+            for k in np.nonzero(dist > 500)[0]:
+                o = routed[k]
+                alerts.append((o.id, o.rider, '偏航', now) + points[o.rider] + (3,))
+        # 位置与级别未变的告警不重写，保留首次发现时间，也不产生变更记录：
+        # 先与订单簿中上次写入的状态比对，剩余的再一次取回库中现有告警比对
+        known = order_book.alerts
+        alerts = [a for a in alerts if known.get((a[0], a[2])) != (a[4], a[5], a[6])]
+        if alerts:
+            c.execute('SELECT order_id, type, lng, lat, severity FROM alerts WHERE order_id IN (SELECT value FROM json_each(?)) ORDER BY ts',
+                      (json.dumps(list({a[0] for a in alerts})),))
+            existing = {(r[0], r[1]): r[2:] for r in c.fetchall()}
+            for a in alerts:
+                known[(a[0], a[2])] = (a[4], a[5], a[6])
+            alerts = [a for a in alerts if existing.get((a[0], a[2])) != (a[4], a[5], a[6])]
+        if alerts:
+            c.executemany('DELETE FROM alerts WHERE order_id=? AND type=?', [(a[0], a[2]) for a in alerts])
+            c.executemany(ALERT_INSERT_SQL, [alert_params(a) for a in alerts])
+            record_changes(c, 'alerts', [alert_key(a[0], a[2]) for a in alerts])
+            conn.commit()
         conn.close()
 
     def get_settlements(self, qs):
@@ -618,71 +3830,18 @@ class Handler(BaseHTTPRequestHandler):
             from time import time
             end = int(time())
             start = end - 7*24*3600
+        # 计算可走快照，结算结果始终写回主库
+        conn, age = analytics_db(start, end)
+        try:
+            rows = compute_settlements(conn.cursor(), start, end)
+        finally:
+            conn.close()
         conn = db()
-        c = conn.cursor()
-        c.execute('DELETE FROM settlements WHERE period_start_ts=? AND period_end_ts=?', (start, end))
-        
-        # 1. Fetch all orders CREATED in the period (Unified View)
-        c.execute('SELECT id, rider, fee, delivered_ts, eta_ts, status FROM orders WHERE created_ts BETWEEN ? AND ?', (start, end))
-        order_rows = c.fetchall()
-        
-        # 2. Fetch delays linked to these orders (Unified View)
-        # Using a join to ensure we only count alerts for the relevant orders
-        c.execute('''
-            SELECT t1.rider, COUNT(t2.id) 
-            FROM orders t1 
-            JOIN alerts t2 ON t1.id = t2.order_id 
-            WHERE t1.created_ts BETWEEN ? AND ? AND t2.type="延迟" 
-            GROUP BY t1.rider
-        ''', (start, end))
-        delay_map = {r[0]: r[1] for r in c.fetchall()}
-        
-        from collections import defaultdict
-        # {rider: {'count':0, 'income':0.0, 'on_time':0, 'delivered_count':0}}
-        agg = defaultdict(lambda: {'count':0, 'income':0.0, 'on_time':0, 'delivered_count':0})
-        
-        for oid, rider, fee, delivered_ts, eta_ts, status in order_rows:
-            if not rider: continue
-            agg[rider]['count'] += 1 # Total Created
-            
-            # Only count income and on-time for delivered orders
-            if status == '已送达' or delivered_ts:
-                agg[rider]['income'] += float(fee or 0)
-                agg[rider]['delivered_count'] += 1
-                try:
-                    if delivered_ts and eta_ts and int(delivered_ts) <= int(eta_ts):
-                        agg[rider]['on_time'] += 1
-                except Exception:
-                    pass
-        
-        for rider, stats in agg.items():
-            cnt = stats['count'] # Display Total Created Orders to match Monitoring
-            delivered_cnt = stats['delivered_count']
-            income = stats['income']
-            on_time = stats['on_time']
-            delays = delay_map.get(rider, 0)
-            
-            # Rates based on DELIVERED orders for fairness
-            on_time_rate = (on_time/delivered_cnt) if delivered_cnt else 0.0
-            
-            base_bonus = float(on_time)*1.2
-            tier_bonus = 0.0
-            # Tier bonus criteria based on DELIVERED volume
-            if delivered_cnt >= 100 and on_time_rate >= 0.95:
-                tier_bonus = 80.0
-            elif delivered_cnt >= 60 and on_time_rate >= 0.92:
-                tier_bonus = 40.0
-            
-            zero_delay_bonus = 50.0 if (delays == 0 and delivered_cnt > 0) else 0.0
-            subsidy = round(base_bonus + tier_bonus + zero_delay_bonus, 2)
-            penalties = float(delays)*2.0
-            net = float(income) + subsidy - penalties
-            c.execute('INSERT INTO settlements (rider, period_start_ts, period_end_ts, orders_count, total_income, subsidy, penalties, net_income, generated_ts) VALUES (?,?,?,?,?,?,?,?,?)', (rider, start, end, cnt, income, subsidy, penalties, net, end))
-        
+        save_settlements(conn.cursor(), start, end, rows)
         conn.commit()
-        c.execute('SELECT rider, orders_count, total_income, subsidy, penalties, net_income FROM settlements WHERE period_start_ts=? AND period_end_ts=? ORDER BY net_income DESC', (start, end))
-        res = [{'rider': r[0], 'orders': int(r[1] or 0), 'income': round(float(r[2] or 0),2), 'subsidy': round(float(r[3] or 0),2), 'penalties': round(float(r[4] or 0),2), 'net': round(float(r[5] or 0),2)} for r in c.fetchall()]
         conn.close()
+        rows.sort(key=lambda r: -r[7])
+        res = [{'rider': r[0], 'orders': int(r[3] or 0), 'income': round(float(r[4] or 0),2), 'subsidy': round(float(r[5] or 0),2), 'penalties': round(float(r[6] or 0),2), 'net': round(float(r[7] or 0),2)} for r in rows]
         
         # Merge with all registered riders
         try:
@@ -709,7 +3868,7 @@ class Handler(BaseHTTPRequestHandler):
                     'net': 0.0
                 })
 
-        return self.json(res)
+        return self.json(res, snapshot_age=age)
 
     def get_performance(self, qs):
         start = int((qs.get('start',[0])[0])) if qs.get('start') else 0
@@ -718,61 +3877,28 @@ class Handler(BaseHTTPRequestHandler):
             from time import time
             end = int(time())
             start = end - 7*24*3600
+        # 整日部分为 performance_daily 的区间求和，代价与骑手数×天数成正比，不再扫描原始订单
+        totals = performance_summary(start, end)
         conn = db()
         c = conn.cursor()
-        
-        # Unified View: Filter by CREATED_TS
-        c.execute('SELECT rider, delivered_ts, eta_ts, status FROM orders WHERE created_ts BETWEEN ? AND ?', (start, end))
-        
-        from collections import defaultdict
-        stats = defaultdict(lambda: {'delivered':0,'on_time':0, 'total':0})
-        
-        for rider, delivered_ts, eta_ts, status in c.fetchall():
-            stats[rider]['total'] += 1
-            if status == '已送达' or delivered_ts:
-                stats[rider]['delivered'] += 1
-                try:
-                    if eta_ts and int(delivered_ts) <= int(eta_ts):
-                        stats[rider]['on_time'] += 1
-                except Exception:
-                    pass
+        c.execute('SELECT name, phone FROM riders')
+        registered = {r[0]: r[1] for r in c.fetchall() if r[0]}
+        self.register_riders(c, [nm for nm in totals if nm not in registered])
+        c.executemany('UPDATE riders SET phone=? WHERE name=?', [(stable_phone(nm), nm) for nm, phone in registered.items() if not phone])
+        conn.commit()
         conn.close()
-        
-        # Merge with all registered riders
-        try:
-            conn_r = db()
-            c_r = conn_r.cursor()
-            c_r.execute('SELECT name FROM riders')
-            registered_riders = {r[0] for r in c_r.fetchall() if r[0]}
-            conn_r.close()
-        except Exception:
-            registered_riders = set()
-
         res = []
-        all_names = set(stats.keys()) | registered_riders
-
-        for rider in all_names:
-            if not rider: continue
-            s = stats[rider]
-            delivered = s['delivered']
-            total = s['total']
-            on_time_rate = (s['on_time']/delivered) if delivered else 0.0
-            accept_rate = 0.9
-            positive_rate = 0.95
-            res.append({'rider': rider, 'on_time_rate': on_time_rate, 'accept_rate': accept_rate, 'positive_rate': positive_rate, 'orders': total})
-        
-        try:
-            conn2 = db()
-            c2 = conn2.cursor()
-            for r in res:
-                nm = r['rider']
-                if nm:
-                    c2.execute('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', (nm, stable_phone(nm)))
-                    c2.execute("UPDATE riders SET phone=? WHERE name=? AND (phone IS NULL OR phone='')", (stable_phone(nm), nm))
-            conn2.commit()
-            conn2.close()
-        except Exception:
-            pass
+        for rider in set(totals) | set(registered):
+            if not rider:
+                continue
+            orders, delivered, on_time, accepted, rejected, ratings, positive = totals.get(rider) or [0]*len(PERF_COUNTS)
+            res.append({
+                'rider': rider,
+                'on_time_rate': (on_time/delivered) if delivered else 0.0,
+                'accept_rate': (accepted/(accepted+rejected)) if (accepted + rejected) else None,
+                'positive_rate': (positive/ratings) if ratings else None,
+                'orders': orders
+            })
         res.sort(key=lambda r: (-r['on_time_rate'], -r['orders'], r['rider']))
         return self.json(res)
 
@@ -784,17 +3910,19 @@ class Handler(BaseHTTPRequestHandler):
             end = int(time())
             start = end - 7*24*3600
         threshold = 80.0
-        conn = db()
+        conn, age = analytics_db(start, end)
         c = conn.cursor()
-        c.execute('SELECT date(end_ts/1000, "unixepoch") as d, COALESCE(SUM(distance)/1000.0,0) FROM tracks WHERE (end_ts/1000) BETWEEN ? AND ? GROUP BY d ORDER BY d', (start, end))
+        # end_ts 为毫秒：按毫秒区间比较以走 end_ts 索引，按存储的业务日期分组
+        span = (start*1000, end*1000 + 999)
+        c.execute('SELECT local_date, COALESCE(SUM(distance)/1000.0,0) FROM v_tracks WHERE end_ts BETWEEN ? AND ? GROUP BY local_date ORDER BY local_date', span)
         daily = c.fetchall()
         labels = [r[0] for r in daily]
         kms = [round(float(r[1] or 0), 2) for r in daily]
-        c.execute('SELECT name, COALESCE(SUM(distance)/1000.0,0) FROM tracks WHERE (end_ts/1000) BETWEEN ? AND ? GROUP BY name ORDER BY SUM(distance) DESC', (start, end))
+        c.execute('SELECT name, COALESCE(SUM(distance)/1000.0,0) FROM v_tracks WHERE end_ts BETWEEN ? AND ? GROUP BY name ORDER BY SUM(distance) DESC', span)
         ranking = [{'rider': r[0], 'km': round(float(r[1] or 0), 2)} for r in c.fetchall()]
-        c.execute('SELECT name, date(end_ts/1000, "unixepoch") as d, COALESCE(SUM(distance)/1000.0,0) as km FROM tracks WHERE (end_ts/1000) BETWEEN ? AND ? GROUP BY name, d HAVING km>? ORDER BY d DESC, km DESC', (start, end, threshold))
+        c.execute('SELECT name, local_date, COALESCE(SUM(distance)/1000.0,0) as km FROM v_tracks WHERE end_ts BETWEEN ? AND ? GROUP BY name, local_date HAVING km>? ORDER BY local_date DESC, km DESC', (*span, threshold))
         warnings = [{'rider': r[0], 'date': r[1], 'km': round(float(r[2] or 0), 2)} for r in c.fetchall()]
-        c.execute('SELECT COUNT(DISTINCT name) FROM tracks WHERE (end_ts/1000) BETWEEN ? AND ?', (start, end))
+        c.execute('SELECT COUNT(DISTINCT name) FROM v_tracks WHERE end_ts BETWEEN ? AND ?', span)
         riders = c.fetchone()[0] or 0
         totalKm = round(sum(kms), 2)
         conn.close()
@@ -804,7 +3932,7 @@ class Handler(BaseHTTPRequestHandler):
             'ranking': ranking,
             'warnings': warnings
         }
-        return self.json(resp)
+        return self.json(resp, snapshot_age=age)
 
     def get_tracks(self, qs):
         try:
@@ -819,6 +3947,12 @@ class Handler(BaseHTTPRequestHandler):
                     return int(ms)
                 except Exception:
                     return 0
+            if self.columnar_args(qs)[0]:
+                cols = self.columns(rows, ('name', 'phone', 'start_ts', 'end_ts', 'distance_km'))
+                cols['start_ts'] = [fmt_ts(v) for v in cols['start_ts']]
+                cols['end_ts'] = [fmt_ts(v) for v in cols['end_ts']]
+                cols['distance_km'] = [round(float(v or 0)/1000.0, 3) for v in cols['distance_km']]
+                return self.json(cols)
             res = [
                 {
                     'name': r[0],
@@ -833,12 +3967,36 @@ class Handler(BaseHTTPRequestHandler):
         except Exception as e:
             return self.json_status(500, {'ok': False, 'error': str(e)})
 
+    def bearer_token(self, payload):
+        """取骑手令牌：优先 Authorization: Bearer，其次请求体 token。"""
+        auth = self.headers.get('Authorization') or ''
+        if auth[:7].lower() == 'bearer ':
+            return auth[7:].strip()
+        return payload.get('token')
+
+    def token_rider(self, payload):
+        """仅由有效令牌得出的骑手名（用于限流分桶）；无令牌或令牌无效返回 None。"""
+        token = self.bearer_token(payload)
+        return verify_token(token) if token else None
+
+    def rider_identity(self, payload):
+        """上报者身份：带令牌（Authorization: Bearer 或请求体 token）时以令牌中的姓名为准，令牌无效返回 False；
+        未带令牌时沿用请求体 name（token_cfg['required'] 为真时拒绝）。"""
+        token = self.bearer_token(payload)
+        if not token:
+            return False if token_cfg['required'] else payload.get('name')
+        name = verify_token(token)
+        if not name or (payload.get('name') and payload.get('name') != name):
+            return False
+        return name
+
     def post_track_point(self, payload):
-        name = payload.get('name')
-        phone = payload.get('phone')
+        name = self.rider_identity(payload)
         lng = payload.get('lng')
         lat = payload.get('lat')
         ts = int(payload.get('ts') or 0)
+        if name is False:
+            return self.json_status(401, {"ok": False, "error": "invalid token"})
         if not (name and lng is not None and lat is not None and ts):
             self.send_response(400)
             cors_headers(self)
@@ -846,15 +4004,17 @@ class Handler(BaseHTTPRequestHandler):
             return
         conn = db()
         c = conn.cursor()
-        if phone:
-            c.execute('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', (name, phone))
-        c.execute('INSERT INTO live_points (name, lng, lat, ts) VALUES (?, ?, ?, ?)', (name, float(lng), float(lat), int(ts)))
+        c.execute(LIVE_POINT_SQL, point_params((name, float(lng), float(lat), int(ts))))
+        if point_change_due(name):
+            record_changes(c, 'riders', [name])
         conn.commit()
         conn.close()
         return self.json({"ok": True})
 
     def post_track_submit(self, payload):
-        name = payload.get('name')
+        name = self.rider_identity(payload)
+        if name is False:
+            return self.json_status(401, {"ok": False, "error": "invalid token"})
         phone = payload.get('phone')
         start_ts = int(payload.get('start_ts') or 0)
         end_ts = int(payload.get('end_ts') or 0)
@@ -875,8 +4035,6 @@ class Handler(BaseHTTPRequestHandler):
             return
         conn = db()
         c = conn.cursor()
-        if phone:
-            c.execute('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', (name, phone))
         if distance < 0:
             distance = 0.0
         if distance > 200000.0:
@@ -886,8 +4044,7 @@ class Handler(BaseHTTPRequestHandler):
         if row:
             c.execute('UPDATE tracks SET distance=?, points=? WHERE id=?', (distance, json.dumps(cleaned), int(row[0])))
         else:
-            c.execute('INSERT INTO tracks (name, phone, start_ts, end_ts, distance, points) VALUES (?, ?, ?, ?, ?, ?)',
-                      (name, phone, start_ts, end_ts, distance, json.dumps(cleaned)))
+            c.execute(TRACK_INSERT_SQL, track_params((name, phone, start_ts, end_ts, distance, json.dumps(cleaned))))
         conn.commit()
         conn.close()
         return self.json({"ok": True})
@@ -912,18 +4069,30 @@ class Handler(BaseHTTPRequestHandler):
             cors_headers(self)
             self.end_headers()
             return
+        if eta_ts is None:
+            # 未带承诺时间的订单按 ETA 模型补上
+            eta_ts = promise_eta(eta_model(update=False), category, created_ts, origin_lng, origin_lat, dest_lng, dest_lat)
         conn = db()
         c = conn.cursor()
-        try:
-            c.execute('INSERT OR REPLACE INTO orders (id, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance, category) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
-                      (oid, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance, category))
-        except Exception:
-            c.execute('INSERT OR REPLACE INTO orders (id, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)',
-                      (oid, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance))
+        row = (oid, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance, category)
+        events = lifecycle_event_rows(c, [row])
+        c.execute(ORDER_UPSERT_SQL, order_params(row))
+        c.executemany('INSERT INTO order_events (order_id, ts, type, meta) VALUES (?,?,?,?)', events)
+        record_changes(c, 'orders', [oid])
+        self.register_riders(c, [rider])
         conn.commit()
         conn.close()
+        order_book.apply([row])
         return self.json({"ok": True})
 
+    def register_riders(self, c, names):
+        """订单写入时登记尚未登记的骑手，使骑手列表的增量同步无需再扫描订单表。"""
+        names = [n for n in names if n]
+        for name in names:
+            c.execute('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', (name, stable_phone(name)))
+            if c.rowcount > 0:
+                record_changes(c, 'riders', [name])
+
     def post_order_event(self, payload):
         order_id = payload.get('order_id')
         ts = payload.get('ts')
@@ -956,7 +4125,8 @@ class Handler(BaseHTTPRequestHandler):
             return
         conn = db()
         c = conn.cursor()
-        c.execute('INSERT INTO alerts (order_id, rider, type, ts, lng, lat, severity) VALUES (?,?,?,?,?,?,?)', (order_id, rider, type_, ts, lng, lat, severity))
+        c.execute(ALERT_INSERT_SQL, alert_params((order_id, rider, type_, ts, lng, lat, severity)))
+        record_changes(c, 'alerts', [alert_key(order_id, type_)])
         conn.commit()
         conn.close()
         return self.json({"ok": True})
@@ -966,20 +4136,16 @@ class Handler(BaseHTTPRequestHandler):
             name = (payload.get('name') or '').strip()
             if not name:
                 return self.json_status(400, {"ok": False, "error": "missing name"})
-            conn = db()
-            c = conn.cursor()
-            c.execute('DELETE FROM alerts WHERE rider=?', (name,))
-            c.execute('DELETE FROM order_events WHERE order_id IN (SELECT id FROM orders WHERE rider=?)', (name,))
-            c.execute('DELETE FROM orders WHERE rider=?', (name,))
-            c.execute('DELETE FROM live_points WHERE name=?', (name,))
-            c.execute('DELETE FROM tracks WHERE name=?', (name,))
-            c.execute('DELETE FROM settlements WHERE rider=?', (name,))
-            c.execute('DELETE FROM mileage_daily WHERE rider=?', (name,))
-            c.execute('DELETE FROM performance_daily WHERE rider=?', (name,))
-            c.execute('DELETE FROM riders WHERE name=?', (name,))
-            conn.commit()
-            conn.close()
-            return self.json({"ok": True})
+            return self.job_accepted(submit_job('rider_delete', {'name': name}))
+        except Exception as e:
+            return self.json_status(500, {"ok": False, "error": str(e)})
+
+    def post_settlements_recompute(self, payload):
+        try:
+            start, end = int(payload.get('start') or 0), int(payload.get('end') or 0)
+            if not (start and end and start < end):
+                return self.json_status(400, {"ok": False, "error": "start/end required"})
+            return self.job_accepted(submit_job('settlements', {'start': start, 'end': end, 'days': int(payload.get('days') or 7)}))
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
 
@@ -994,9 +4160,21 @@ class Handler(BaseHTTPRequestHandler):
                 from time import time
                 end = int(time())
                 start = end - 7*24*3600
+            # 已归档的轨迹在对应月份的分区中一并删除
+            archived = 0
+            for path in partition_paths(start, end):
+                arc = sqlite3.connect(path, timeout=30)
+                try:
+                    archived += arc.execute('DELETE FROM tracks WHERE name=? AND (end_ts/1000) BETWEEN ? AND ?', (name, start, end)).rowcount
+                    arc.commit()
+                finally:
+                    arc.close()
             conn = db()
             c = conn.cursor()
             c.execute('DELETE FROM tracks WHERE name=? AND (end_ts/1000) BETWEEN ? AND ?', (name, start, end))
+            if archived:
+                # 分区不在主库的 data_version 内：记一条变更使里程缓存失效
+                record_changes(c, 'riders', [name])
             conn.commit()
             conn.close()
             return self.json({"ok": True})
@@ -1014,15 +4192,27 @@ class Handler(BaseHTTPRequestHandler):
                 km = 0.0
             if km > 200.0:
                 km = 200.0
-            import datetime
-            dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-            sec = int(dt.timestamp())
+            sec = local_midnight(date_str)
             end_ts = (sec + 12*3600) * 1000
             start_ts = (sec + 8*3600) * 1000
+            row = track_params((name, None, start_ts, end_ts, km*1000.0, json.dumps([])))
+            # 该日所在月份已归档时改写分区中的记录，否则写热库（过期后随归档搬移）
+            paths = partition_paths(end_ts//1000, end_ts//1000)
+            if paths:
+                arc = sqlite3.connect(paths[0], timeout=30)
+                try:
+                    arc.execute('DELETE FROM tracks WHERE local_date=? AND name=?', (date_str, name))
+                    arc.execute(TRACK_INSERT_SQL, row)
+                    arc.commit()
+                finally:
+                    arc.close()
             conn = db()
             c = conn.cursor()
-            c.execute('DELETE FROM tracks WHERE name=? AND date(end_ts/1000, "unixepoch")=?', (name, date_str))
-            c.execute('INSERT INTO tracks (name, phone, start_ts, end_ts, distance, points) VALUES (?, ?, ?, ?, ?, ?)', (name, None, start_ts, end_ts, km*1000.0, json.dumps([])))
+            c.execute('DELETE FROM tracks WHERE local_date=? AND name=?', (date_str, name))
+            if paths:
+                record_changes(c, 'riders', [name])
+            else:
+                c.execute(TRACK_INSERT_SQL, row)
             conn.commit()
             conn.close()
             return self.json({"ok": True})
@@ -1035,22 +4225,22 @@ class Handler(BaseHTTPRequestHandler):
             hours = int(payload.get('hours_window') or 1)
             interval = int(payload.get('interval_minutes') or 5)
             ai = bool(payload.get('ai_profile', True))
-            generator_cfg['rate'] = max(0, rate)
+            forecast = bool(payload.get('forecast_profile', generator_cfg.get('forecast', False)))
+            generator_cfg['rate'] = min(max(0, rate), admission_cfg['max_generate'])
             generator_cfg['hours'] = max(1, hours)
             generator_cfg['interval'] = max(1, interval)
             generator_cfg['ai'] = ai
+            generator_cfg['forecast'] = forecast
             generator_cfg['enabled'] = True
-            global generator_thread
-            if generator_thread is None or not generator_thread.is_alive():
-                generator_thread = threading.Thread(target=_generator_loop, daemon=True)
-                generator_thread.start()
-            return self.json({"ok": True, "status": {"enabled": True, "rate": generator_cfg['rate'], "hours": generator_cfg['hours'], "interval": generator_cfg['interval'], "ai": generator_cfg['ai']}})
+            save_generator_cfg()
+            return self.json({"ok": True, "status": {"enabled": True, "rate": generator_cfg['rate'], "hours": generator_cfg['hours'], "interval": generator_cfg['interval'], "ai": generator_cfg['ai'], "forecast": generator_cfg['forecast']}})
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
 
     def post_generator_stop(self, payload):
         try:
             generator_cfg['enabled'] = False
+            save_generator_cfg()
             return self.json({"ok": True, "status": {"enabled": False}})
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
@@ -1060,35 +4250,35 @@ class Handler(BaseHTTPRequestHandler):
             orders = payload.get('orders')
             if not isinstance(orders, list):
                 return self.json_status(400, {"ok": False, "error": "orders must be list"})
+            if self.size_capped(len(orders), admission_cfg['max_import']):
+                return
             conn = db()
             c = conn.cursor()
+            rows = []
             for o in orders:
-                oid = o.get('id')
-                rider = o.get('rider')
-                status = o.get('status')
-                created_ts = o.get('created_ts')
-                pickup_ts = o.get('pickup_ts')
-                delivered_ts = o.get('delivered_ts')
-                eta_ts = o.get('eta_ts')
-                origin_lng = o.get('origin_lng')
-                origin_lat = o.get('origin_lat')
-                dest_lng = o.get('dest_lng')
-                dest_lat = o.get('dest_lat')
-                fee = o.get('fee')
-                distance = o.get('distance')
-                category = o.get('category')
-                if not oid:
-                    oid = 'OD'+str(int(time.time()))+str(abs(hash(json.dumps(o)))%10000).zfill(4)
-                try:
-                    c.execute('INSERT OR REPLACE INTO orders (id, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance, category) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)', (oid, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance, category))
-                except Exception:
-                    c.execute('INSERT OR REPLACE INTO orders (id, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)', (oid, rider, status, created_ts, pickup_ts, delivered_ts, eta_ts, origin_lng, origin_lat, dest_lng, dest_lat, fee, distance))
+                row = tuple(o.get(k) for k in ORDER_COLUMNS)
+                if not row[0]:
+                    row = ('OD'+str(int(time.time()))+str(abs(hash(json.dumps(o)))%10000).zfill(4),) + row[1:]
+                rows.append(row)
+            events = lifecycle_event_rows(c, rows)
+            c.executemany(ORDER_UPSERT_SQL, [order_params(r) for r in rows])
+            c.executemany('INSERT INTO order_events (order_id, ts, type, meta) VALUES (?,?,?,?)', events)
+            record_changes(c, 'orders', [r[0] for r in rows])
+            self.register_riders(c, {r[1] for r in rows})
             conn.commit()
             conn.close()
+            order_book.apply(rows)
             return self.json({"ok": True, "imported": len(orders)})
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
 
+    def post_dispatch_run(self, payload):
+        try:
+            stats = dispatch_pending(batch_size=payload.get('batch_size'), max_km=payload.get('max_km'), capacity=payload.get('capacity'), hungarian_max=payload.get('hungarian_max'))
+            return self.json({"ok": True, **stats})
+        except Exception as e:
+            return self.json_status(500, {"ok": False, "error": str(e)})
+
     def post_rider_register(self, payload):
         try:
             name = (payload.get('name') or '').strip()
@@ -1097,15 +4287,22 @@ class Handler(BaseHTTPRequestHandler):
                 return self.json_status(400, {"ok": False, "error": "missing"})
             conn = db()
             c = conn.cursor()
-            c.execute('INSERT OR REPLACE INTO riders (name, phone) VALUES (?, ?)', (name, phone))
-            conn.commit()
+            # 已存在的姓名不覆盖：手机号一致视同登录，否则拒绝
+            c.execute('INSERT OR IGNORE INTO riders (name, phone) VALUES (?, ?)', (name, phone))
+            created = c.rowcount == 1
+            if created:
+                record_changes(c, 'riders', [name])
+                conn.commit()
+            else:
+                c.execute('SELECT phone FROM riders WHERE name=?', (name,))
+                row = c.fetchone()
             conn.close()
-            # Generate initial data for new rider
-            try:
-                insert_random_orders(20, 48, [name])
-            except Exception:
-                pass
-            return self.json({"ok": True})
+            if not created and (row[0] or '') != phone:
+                return self.json_status(409, {"ok": False, "error": "name already registered"})
+            # 新骑手的初始数据交给后台任务生成
+            job_id = submit_job('generate', {'count': 20, 'hours': 48, 'riders': [name]}) if created else None
+            token, exp = issue_token(name)
+            return self.json({"ok": True, "job": job_id, "token": token, "expires": exp})
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
 
@@ -1121,34 +4318,118 @@ class Handler(BaseHTTPRequestHandler):
             row = c.fetchone()
             conn.close()
             if row and (row[0] or '') == phone:
-                return self.json_status(200, {"ok": True})
+                token, exp = issue_token(name)
+                return self.json_status(200, {"ok": True, "token": token, "expires": exp})
             return self.json_status(401, {"ok": False})
         except Exception as e:
             return self.json_status(500, {"ok": False, "error": str(e)})
 
+def run_server(port, reuse_port=False):
+    class Server(ThreadingHTTPServer):
+        def server_bind(self):
+            if reuse_port:
+                import socket
+                self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+            super().server_bind()
+    server = Server(('0.0.0.0', port), Handler)
+    logging.info(f'worker {WORKER_ID} (pid {os.getpid()}) listening on {port}')
+    threading.Thread(target=warm_up, args=(is_leader(),), daemon=True).start()
+    server.serve_forever()
+
+def serve_prefork(port, workers):
+    """预派生 workers 个进程，以 SO_REUSEPORT 共享端口；子进程退出后自动拉起。"""
+    import signal
+    import socket
+    if not hasattr(os, 'fork') or not hasattr(socket, 'SO_REUSEPORT'):
+        raise SystemExit('--workers 需要支持 fork 与 SO_REUSEPORT 的系统（Linux/macOS）')
+    children = {}
+    stopping = []
+    sigs = {signal.SIGTERM, signal.SIGINT}
+    def spawn(i):
+        # fork 前后屏蔽信号：子进程恢复默认处理前不会执行父进程的 stop
+        signal.pthread_sigmask(signal.SIG_BLOCK, sigs)
+        pid = os.fork()
+        if pid == 0:
+            code = 1
+            try:
+                for s in sigs:
+                    signal.signal(s, signal.SIG_DFL)
+                signal.pthread_sigmask(signal.SIG_UNBLOCK, sigs)
+                global WORKER_ID
+                WORKER_ID = i
+                run_server(port, reuse_port=True)
+                code = 0
+            except KeyboardInterrupt:
+                code = 0
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else int(e.code is not None)
+            except Exception as e:
+                logging.exception(e)
+            finally:
+                # 任何异常（含 SystemExit）都不能回到父进程的循环里
+                os._exit(code)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, sigs)
+        children[pid] = i
+    def stop(signum, frame):
+        stopping.append(signum)
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except Exception:
+                pass
+        raise SystemExit(0)
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for i in range(workers):
+        spawn(i)
+    while True:
+        pid, status = os.wait()
+        i = children.pop(pid, None)
+        if i is not None and not stopping:
+            logging.warning(f'worker {i} (pid {pid}) exited with status {status}, restarting')
+            time.sleep(1)
+            spawn(i)
+
 def main():
+    import argparse
+    parser = argparse.ArgumentParser(description='外卖数智平台本地 API 服务')
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WORKERS', '1')), help='预派生的服务进程数（共享端口与 WAL 数据库）')
+    parser.add_argument('--backup', action='store_true', help='立即执行一次在线备份后退出')
+    parser.add_argument('--verify-backup', metavar='PATH', help='校验备份文件后退出')
+    parser.add_argument('--restore', metavar='PATH', help='从备份恢复 data.db 后退出（需先停止服务）')
+    parser.add_argument('--vacuum', action='store_true', help='整体 VACUUM 并启用增量 auto_vacuum 后退出（旧库转换用，需先停止服务）')
+    parser.add_argument('--archive', action='store_true', help='立即将过期数据滚动到按月归档文件后退出')
+    parser.add_argument('--capture', metavar='PATH', default=os.environ.get('CAPTURE'), help='将每个请求追加记录到 NDJSON 文件（供 replay.py 回放）')
+    args = parser.parse_args()
     logging.basicConfig(filename=os.path.join(os.path.dirname(__file__), 'server.log'), level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    if args.verify_backup:
+        print(json.dumps(verify_backup(args.verify_backup), ensure_ascii=False))
+        return
+    if args.restore:
+        print(json.dumps(restore_backup(args.restore), ensure_ascii=False))
+        return
+    if args.backup:
+        print(backup_db())
+        prune_backups()
+        return
+    if args.vacuum:
+        print(json.dumps(convert_auto_vacuum()))
+        return
+    if args.archive:
+        conn = db()
+        migrate(conn)
+        conn.close()
+        print(json.dumps(archive_old_data()))
+        return
     logging.info('server starting')
-    init_db()
-    try:
-        backups = os.path.join(os.path.dirname(__file__), 'backups')
-        os.makedirs(backups, exist_ok=True)
-        src = DB_PATH
-        import shutil
-        ts = time.strftime('%Y%m%d-%H%M%S')
-        dst = os.path.join(backups, f'data-{ts}.db')
-        shutil.copyfile(src, dst)
-        logging.info(f'backup created: {dst}')
-    except Exception as e:
-        try:
-            logging.warning(f'backup failed: {e}')
-        except Exception:
-            pass
+    if args.capture:
+        capture_cfg['path'] = os.path.abspath(args.capture)
+        logging.info(f"capturing requests to {capture_cfg['path']}")
     port = int(os.environ.get('PORT', '8001'))
-    server = ThreadingHTTPServer(('0.0.0.0', port), Handler)
     print(f'API server running on http://localhost:{port}/api')
-    logging.info(f'listening on {port}')
-    server.serve_forever()
+    if args.workers > 1:
+        return serve_prefork(port, args.workers)
+    run_server(port)
 
 if __name__ == '__main__':
     main()
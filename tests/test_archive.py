@@ -0,0 +1,159 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'DB_PATH', str(tmp_path / 'data.db'))
+    monkeypatch.setattr(server, 'ARCHIVE_DIR', str(tmp_path / 'archive'))
+    monkeypatch.setattr(server, 'SNAPSHOT_DIR', str(tmp_path / 'snapshot'))
+    server.init_db()
+    now = int(time.time())
+    old = now - 200*86400
+    conn = server.db()
+    rows = [(f'OLD{i}', '王明', '已送达', old + i*60, old + i*60 + 600, old + i*60 + 1800, old + i*60 + 2400,
+             116.39, 39.91, 116.405, 39.902, 10.0, 3.0, '快餐') for i in range(40)]
+    conn.executemany(server.ORDER_UPSERT_SQL, [server.order_params(r) for r in rows])
+    conn.executemany(server.TRACK_INSERT_SQL, [server.track_params(('王明', '13900000000', (old + i*60)*1000, (old + i*60 + 600)*1000, 1000.0, '[]')) for i in range(10)])
+    conn.commit()
+    conn.close()
+    return now
+
+
+def _counts(now):
+    conn, age = server.analytics_db(now - 365*86400, now)
+    try:
+        orders = conn.execute('SELECT COUNT(*) FROM v_orders WHERE created_ts BETWEEN ? AND ?', (now - 365*86400, now)).fetchone()[0]
+        tracks = conn.execute('SELECT COUNT(*) FROM v_tracks WHERE end_ts BETWEEN ? AND ?', ((now - 365*86400)*1000, now*1000)).fetchone()[0]
+    finally:
+        conn.close()
+    return orders, tracks, age
+
+
+def test_archive_after_snapshot_counts_once(tmp_path, monkeypatch):
+    now = _setup(tmp_path, monkeypatch)
+    server.refresh_snapshot()
+    before = _counts(now)
+    assert before[:2] == (43, 10) and before[2] is not None
+
+    moved = server.archive_old_data()
+    assert moved['orders'] == 40 and moved['tracks'] == 10
+    # 快照早于这次归档：不能与分区合并，回落主库
+    orders, tracks, age = _counts(now)
+    assert (orders, tracks, age) == (43, 10, None)
+
+    server.refresh_snapshot()
+    orders, tracks, age = _counts(now)
+    assert (orders, tracks) == (43, 10) and age is not None
+
+
+def test_archive_keeps_unprojected_events(tmp_path, monkeypatch):
+    now = _setup(tmp_path, monkeypatch)
+    conn = server.db()
+    events = []
+    for i in range(40):
+        base = now - 200*86400 + i*60
+        events += [(f'OLD{i}', base, 'created', '{}'), (f'OLD{i}', base + 600, 'pickup', '{}'), (f'OLD{i}', base + 1800, 'delivered', '{}')]
+    conn.executemany('INSERT INTO order_events (order_id, ts, type, meta) VALUES (?,?,?,?)', events)
+    conn.commit()
+    conn.close()
+    # 事件尚未被任何读接口投影就被归档
+    server.archive_old_data()
+    funnel, _ = server.lifecycle_summary(now - 365*86400, now - 100*86400)
+    assert [f['value'] for f in funnel] == [40, 40, 40]
+
+
+def test_clear_keeps_archived_tracks(tmp_path, monkeypatch):
+    now = _setup(tmp_path, monkeypatch)
+    server.archive_old_data()
+    steps = server._job_clear(server.db(), {})
+    try:
+        while True:
+            next(steps)
+    except StopIteration:
+        pass
+    conn = server.range_db(now - 365*86400, now)
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM v_orders').fetchone()[0] == 0
+        assert conn.execute('SELECT COUNT(*) FROM v_tracks').fetchone()[0] == 10
+    finally:
+        conn.close()
+
+
+def test_range_over_attach_limit(tmp_path, monkeypatch):
+    now = _setup(tmp_path, monkeypatch)
+    conn = server.db()
+    # 14 个月各一单：归档后分区数超过可挂载上限
+    rows = [(f'M{i}', '李伟', '已送达', now - (120 + 31*i)*86400, None, None, None, 116.39, 39.91, 116.405, 39.902, 5.0, 1.0, '奶茶') for i in range(14)]
+    conn.executemany(server.ORDER_UPSERT_SQL, [server.order_params(r) for r in rows])
+    conn.commit()
+    conn.close()
+    server.archive_old_data()
+    assert len(server.list_partitions()) > 11
+    start = now - 600*86400
+    conn = server.range_db(start, now)
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM v_orders WHERE created_ts BETWEEN ? AND ?', (start, now)).fetchone()[0] == 57
+        assert conn.execute('SELECT COUNT(*) FROM v_tracks').fetchone()[0] == 10
+    finally:
+        conn.close()
+    # 只读快照上同样可用
+    server.refresh_snapshot()
+    conn, age = server.analytics_db(start, now)
+    try:
+        assert age is not None
+        assert conn.execute('SELECT COUNT(*) FROM v_orders WHERE created_ts BETWEEN ? AND ?', (start, now)).fetchone()[0] == 57
+    finally:
+        conn.close()
+
+
+class _Handler(server.Handler):
+    def __init__(self):
+        self.headers = {}
+        self.sent = []
+
+    def json(self, obj, snapshot_age=None):
+        self.sent.append((200, obj))
+
+    def json_status(self, code, obj, headers=None):
+        self.sent.append((code, obj))
+
+
+def test_mileage_edits_reach_archived_tracks(tmp_path, monkeypatch):
+    now = _setup(tmp_path, monkeypatch)
+    server.archive_old_data()
+    old = now - 200*86400
+    date = server.local_bucket(old)[0]
+    h = _Handler()
+    h.post_mileage_update({'rider': '王明', 'date': date, 'km': 12.5})
+    conn = server.range_db(now - 365*86400, now)
+    try:
+        rows = conn.execute('SELECT distance FROM v_tracks WHERE name=? AND local_date=?', ('王明', date)).fetchall()
+    finally:
+        conn.close()
+    assert rows == [(12500.0,)]
+    assert server.db().execute('SELECT COUNT(*) FROM tracks').fetchone()[0] == 0
+    h.post_mileage_delete_by_rider({'rider': '王明', 'start': now - 365*86400, 'end': now})
+    conn = server.range_db(now - 365*86400, now)
+    try:
+        assert conn.execute('SELECT COUNT(*) FROM v_tracks').fetchone()[0] == 0
+    finally:
+        conn.close()
+    assert [s[0] for s in h.sent] == [200, 200]
+
+
+def test_month_start_uses_business_tz(monkeypatch):
+    monkeypatch.setattr(server, 'BUSINESS_TZ', 'Asia/Shanghai')
+    server._quarter_bucket.cache_clear()
+    try:
+        start = server._month_start(2026, 3)
+        assert start == 1772294400  # 2026-03-01 00:00 +08:00
+        assert server.local_bucket(start) == ('2026-03-01', 0)
+        assert server.local_bucket(start - 1)[0] == '2026-02-28'
+        assert server._month_start(2026, 13) == server.local_midnight('2027-01-01')
+    finally:
+        server._quarter_bucket.cache_clear()
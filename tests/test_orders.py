@@ -0,0 +1,86 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+
+
+class _Handler(server.Handler):
+    def __init__(self):
+        self.headers = {}
+        self.sent = []
+
+    def json(self, obj, snapshot_age=None):
+        self.sent.append((200, obj))
+
+    def json_status(self, code, obj, headers=None):
+        self.sent.append((code, obj))
+
+
+def _setup(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'DB_PATH', str(tmp_path / 'data.db'))
+    monkeypatch.setattr(server, 'ARCHIVE_DIR', str(tmp_path / 'archive'))
+    monkeypatch.setattr(server, 'SNAPSHOT_DIR', str(tmp_path / 'snapshot'))
+    server.init_db()
+    return int(time.time()) // 3600 * 3600 - 7200
+
+
+def _funnel(start):
+    server.project_events()
+    funnel, _ = server.lifecycle_summary(start, start + 3600)
+    return [f['value'] for f in funnel]
+
+
+def test_upsert_counts_in_funnel(tmp_path, monkeypatch):
+    base = _setup(tmp_path, monkeypatch)
+    h = _Handler()
+    order = {'id': 'UP1', 'rider': '王明', 'status': '配送中', 'created_ts': base + 60, 'pickup_ts': base + 600,
+             'origin_lng': 116.39, 'origin_lat': 39.91, 'dest_lng': 116.405, 'dest_lat': 39.902, 'category': '快餐'}
+    h.post_order_upsert(order)
+    assert _funnel(base) == [1, 1, 0]
+    # 重复上报不重复计数，新出现的送达时间补计一次
+    h.post_order_upsert(dict(order, status='已送达', delivered_ts=base + 1800))
+    h.post_order_upsert(dict(order, status='已送达', delivered_ts=base + 1800))
+    assert _funnel(base) == [1, 1, 1]
+    conn = server.db()
+    assert conn.execute("SELECT COUNT(*) FROM order_events WHERE order_id='UP1'").fetchone()[0] == 3
+    conn.close()
+
+
+def test_import_counts_in_funnel(tmp_path, monkeypatch):
+    base = _setup(tmp_path, monkeypatch)
+    h = _Handler()
+    orders = [{'id': f'IM{i}', 'rider': '李伟', 'status': '已送达', 'created_ts': base + i*60, 'pickup_ts': base + i*60 + 600,
+               'delivered_ts': base + i*60 + 1800, 'category': '奶茶'} for i in range(5)]
+    orders.append({'id': 'IM9', 'rider': '李伟', 'status': '待取餐', 'created_ts': str(base + 30), 'pickup_ts': 'n/a'})
+    h.post_orders_import({'orders': orders})
+    assert h.sent[-1][0] == 200
+    assert _funnel(base) == [6, 5, 5]
+
+
+def test_track_points_coalesce_changes(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    monkeypatch.setattr(server, '_point_logged', {})
+    h = _Handler()
+    token, _ = server.issue_token('赵敏')
+    conn = server.db()
+    before = server.change_cursor(conn.cursor())
+    now = int(time.time()*1000)
+    for i in range(5):
+        h.post_track_point({'name': '赵敏', 'lng': 116.4 + i*0.001, 'lat': 39.9, 'ts': now + i*1000, 'token': token})
+    assert [s[0] for s in h.sent] == [200]*5
+    # 5 个点只推进一次变更游标
+    assert server.change_cursor(conn.cursor()) == before + 1
+    conn.close()
+
+
+def test_track_point_requires_token(tmp_path, monkeypatch):
+    _setup(tmp_path, monkeypatch)
+    h = _Handler()
+    point = {'name': '陈刚', 'lng': 116.4, 'lat': 39.9, 'ts': int(time.time()*1000)}
+    h.post_track_point(point)
+    h.post_track_point(dict(point, token='bogus'))
+    h.post_track_point(dict(point, token=server.issue_token('陈刚')[0]))
+    assert [s[0] for s in h.sent] == [401, 401, 200]